@@ -1,5 +1,9 @@
-from smolagents import CodeAgent, LiteLLMModel
+from typing import Optional
+
+from smolagents import CodeAgent
 from eda_config.config import ConfigLoader
+from eda_ai_api.agents.models import get_agent_model
+from eda_ai_api.utils.request_accounting import RequestAccounting
 from eda_ai_api.agents.tools import (
     ConversationHistoryTool,
     GlobalKnowledgeSearchTool,
@@ -9,14 +13,14 @@ from eda_ai_api.agents.tools import (
 
 config = ConfigLoader.get_config()
 
-# Use a standard model for this specialized agent
-model = LiteLLMModel(
-    model_id=f"{config.ai_models['standard'].provider}/{config.ai_models['standard'].model}",
-    api_key=config.api_keys.google_ai_studio,
-    temperature=config.ai_models["standard"].temperature,
-)
+# Model tier for this specialized agent comes from agent_model_tiers
+model = get_agent_model("conversation_summary_agent")
 
-def get_conversation_summary_agent(session_id: str, platform: str = "whatsapp"):
+def get_conversation_summary_agent(
+    session_id: str,
+    platform: str = "whatsapp",
+    accounting: Optional[RequestAccounting] = None,
+):
     """
     Returns a specialized agent for generating short summaries of the user's conversation.
     The agent has access to:
@@ -27,6 +31,7 @@ def get_conversation_summary_agent(session_id: str, platform: str = "whatsapp"):
     Args:
         session_id: User's session/platform ID
         platform: Platform identifier (e.g., 'whatsapp')
+        accounting: Optional per-request accounting to record the agent's cost
     """
     tools = [
         ConversationHistoryTool(session_id=session_id),
@@ -43,4 +48,6 @@ def get_conversation_summary_agent(session_id: str, platform: str = "whatsapp"):
         model=model,
         max_steps=3,
     )
-    return agent
\ No newline at end of file
+    if accounting:
+        accounting.track_agent(agent)
+    return agent
@@ -1,24 +1,29 @@
-from smolagents import CodeAgent, LiteLLMModel
+from typing import Optional
+
+from smolagents import CodeAgent
 from eda_config.config import ConfigLoader
+from eda_ai_api.agents.models import get_agent_model
+from eda_ai_api.utils.request_accounting import RequestAccounting
 from eda_ai_api.agents.tools import DocumentSearchTool
 
 config = ConfigLoader.get_config()
 
-# Use a standard model for this specialized agent
-model = LiteLLMModel(
-    model_id=f"{config.ai_models['standard'].provider}/{config.ai_models['standard'].model}",
-    api_key=config.api_keys.google_ai_studio,
-    temperature=config.ai_models["standard"].temperature,
-)
+# Model tier for this specialized agent comes from agent_model_tiers
+model = get_agent_model("document_search_agent")
 
 
-def get_document_search_agent(session_id: str, platform: str = "whatsapp"):
+def get_document_search_agent(
+    session_id: str,
+    platform: str = "whatsapp",
+    accounting: Optional[RequestAccounting] = None,
+):
     """
     Returns a specialized agent for searching documents with user context.
 
     Args:
         session_id: User's session/platform ID
         platform: Platform identifier (e.g., 'whatsapp')
+        accounting: Optional per-request accounting to record the agent's cost
     """
     # Initialize tool with user context
     document_tool = DocumentSearchTool(session_id=session_id, platform=platform)
@@ -30,4 +35,6 @@ def get_document_search_agent(session_id: str, platform: str = "whatsapp"):
         model=model,
         max_steps=2,  # Limit steps as it's a focused task
     )
+    if accounting:
+        accounting.track_agent(agent)
     return agent
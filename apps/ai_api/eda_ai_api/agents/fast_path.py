@@ -0,0 +1,142 @@
+"""
+Fast-path routing for simple conversational messages.
+Greetings, thanks and small talk are answered with a single LLM call instead
+of a full multi-step manager agent run.
+"""
+
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+import numpy as np
+from loguru import logger
+
+from eda_config.config import ConfigLoader
+from eda_ai_api.agents.manager import build_prompt_context
+from eda_ai_api.agents.models import get_agent_model
+from eda_ai_api.utils.memory_manager import get_vector_memory
+
+config = ConfigLoader.get_config()
+
+ROUTE_FAST_PATH = "fast_path"
+ROUTE_AGENT = "agent"
+
+# Prototype messages for the conversational intent (pt, en, es)
+CONVERSATIONAL_PROTOTYPES = [
+    "oi",
+    "olá, tudo bem?",
+    "bom dia",
+    "boa tarde",
+    "boa noite",
+    "obrigado",
+    "obrigada, valeu!",
+    "muito obrigado pela ajuda",
+    "tchau, até mais",
+    "ok, entendi",
+    "hello",
+    "hi there",
+    "good morning",
+    "how are you?",
+    "thanks",
+    "thank you so much",
+    "bye, see you later",
+    "ok, got it",
+    "hola, ¿qué tal?",
+    "gracias",
+]
+
+FAST_PATH_SYSTEM_PROMPT = """You are {bot_name}, a friendly assistant.
+Reply to the user's message directly in one short message.
+Answer in the same language as the user.
+"""
+
+
+@dataclass
+class RouteDecision:
+    """Routing decision for an incoming message"""
+
+    route: str
+    similarity: float
+    reason: str
+
+
+_prototype_embeddings: Optional[np.ndarray] = None
+
+
+def _get_prototype_embeddings() -> np.ndarray:
+    """Embed the intent prototypes once and cache them"""
+    global _prototype_embeddings
+    if _prototype_embeddings is None:
+        embedding_model = get_vector_memory().embedding_model
+        _prototype_embeddings = np.asarray(
+            embedding_model.encode(
+                CONVERSATIONAL_PROTOTYPES, normalize_embeddings=True
+            )
+        )
+    return _prototype_embeddings
+
+
+def classify_message(message: str, has_attachments: bool = False) -> RouteDecision:
+    """
+    Decide whether a message can skip the manager agent.
+
+    Args:
+        message: The user's message
+        has_attachments: Whether images or other media came with the message
+
+    Returns:
+        RouteDecision with the chosen route and the best prototype similarity
+    """
+    ai_api_config = config.services.ai_api
+
+    if not ai_api_config.fast_path_enabled:
+        return RouteDecision(ROUTE_AGENT, 0.0, "fast path disabled")
+    if has_attachments:
+        return RouteDecision(ROUTE_AGENT, 0.0, "attachments present")
+    if len(message) > ai_api_config.fast_path_max_message_length:
+        return RouteDecision(ROUTE_AGENT, 0.0, "message too long")
+
+    embedding_model = get_vector_memory().embedding_model
+    query_embedding = np.asarray(
+        embedding_model.encode(message, normalize_embeddings=True)
+    )
+    similarity = float(np.max(_get_prototype_embeddings() @ query_embedding))
+
+    if similarity >= ai_api_config.fast_path_similarity_threshold:
+        return RouteDecision(ROUTE_FAST_PATH, similarity, "conversational")
+    return RouteDecision(ROUTE_AGENT, similarity, "below threshold")
+
+
+def run_fast_path(
+    message: str,
+    platform: str = "whatsapp",
+    conversation_history: Optional[List[Dict]] = None,
+) -> str:
+    """
+    Answer a simple message with a single LLM call.
+
+    Uses the same per-user context and formatting guidelines as the manager
+    agent so answers stay consistent across routes.
+
+    Args:
+        message: The formatted user message
+        platform: Platform identifier for formatting guidelines
+        conversation_history: List of previous conversation exchanges
+
+    Returns:
+        str: The model's answer
+    """
+    system_prompt = FAST_PATH_SYSTEM_PROMPT.format(
+        bot_name=config.services.whatsapp.bot_name
+    ) + build_prompt_context(platform, conversation_history)
+
+    response = get_agent_model("fast_path").generate(
+        [
+            {
+                "role": "system",
+                "content": [{"type": "text", "text": system_prompt}],
+            },
+            {"role": "user", "content": [{"type": "text", "text": message}]},
+        ]
+    )
+    logger.debug(f"Fast path response: '{(response.content or '')[:100]}...'")
+    return response.content or ""
@@ -1,21 +1,24 @@
-from smolagents import CodeAgent, LiteLLMModel
+from typing import Optional
+
+from smolagents import CodeAgent
 from eda_config.config import ConfigLoader
+from eda_ai_api.agents.models import get_agent_model
+from eda_ai_api.utils.request_accounting import RequestAccounting
 from eda_ai_api.agents.tools import GlobalKnowledgeSearchTool
 
 config = ConfigLoader.get_config()
 
-# Use a standard model for this specialized agent
-model = LiteLLMModel(
-    model_id=f"{config.ai_models['standard'].provider}/{config.ai_models['standard'].model}",
-    api_key=config.api_keys.google_ai_studio,
-    temperature=config.ai_models["standard"].temperature,
-)
+# Model tier for this specialized agent comes from agent_model_tiers
+model = get_agent_model("global_knowledge_agent")
 
 
-def get_global_knowledge_agent():
+def get_global_knowledge_agent(accounting: Optional[RequestAccounting] = None):
     """
     Returns a specialized agent for searching the global knowledge base.
     This agent doesn't need user context since it searches global knowledge.
+
+    Args:
+        accounting: Optional per-request accounting to record the agent's cost
     """
     # Initialize tool (no user context needed)
     knowledge_tool = GlobalKnowledgeSearchTool()
@@ -27,4 +30,6 @@ def get_global_knowledge_agent():
         model=model,
         max_steps=2,  # Limit steps as it's a focused task
     )
+    if accounting:
+        accounting.track_agent(agent)
     return agent
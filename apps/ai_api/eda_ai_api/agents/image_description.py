@@ -0,0 +1,111 @@
+"""
+Image descriptions for the vision path.
+When the image cache is enabled, each new image is described once by the
+vision model in the background, and the agent receives the stored
+description as text when an identical copy of the image is forwarded later,
+skipping vision input entirely.
+"""
+
+import asyncio
+from typing import List, Optional
+
+from loguru import logger
+from PIL import Image
+
+from eda_config.config import ConfigLoader
+from eda_ai_api.agents.models import get_agent_model
+from eda_ai_api.utils.image_cache import (
+    image_content_hash,
+    lookup_description,
+    store_description,
+)
+
+config = ConfigLoader.get_config()
+
+IMAGE_DESCRIPTION_PROMPT = """Describe this image for an assistant that cannot see it.
+First transcribe all visible text exactly as written, keeping its language.
+Then describe what the image shows: people, places, maps, charts, logos, \
+dates and any other details someone might ask about.
+Answer with the transcription and description only."""
+
+# Keeps background description tasks alive until they finish
+_background_tasks = set()
+
+
+def describe_image(image: Image.Image) -> str:
+    """
+    Describe an image and transcribe its text with a single vision call.
+
+    Args:
+        image: The preprocessed image
+
+    Returns:
+        str: The model's description
+    """
+    response = get_agent_model("image_description").generate(
+        [
+            {
+                "role": "user",
+                "content": [
+                    {"type": "text", "text": IMAGE_DESCRIPTION_PROMPT},
+                    {"type": "image", "image": image},
+                ],
+            }
+        ]
+    )
+    return (response.content or "").strip()
+
+
+def _lookup_description(image: Image.Image) -> Optional[str]:
+    """Find the stored description of an identical image"""
+    try:
+        return lookup_description(image_content_hash(image))
+    except Exception as e:
+        logger.warning(f"Image cache lookup failed: {str(e)}")
+        return None
+
+
+def _describe_and_store(image: Image.Image) -> None:
+    """Describe an image and cache its description"""
+    try:
+        description = describe_image(image)
+        if description:
+            store_description(image_content_hash(image), description)
+    except Exception as e:
+        logger.warning(f"Failed to cache image description: {str(e)}")
+
+
+async def cached_descriptions(images: List[Image.Image]) -> List[Optional[str]]:
+    """
+    Look up stored descriptions of uploaded images off the event loop.
+
+    Args:
+        images: The preprocessed images
+
+    Returns:
+        The description of each image in image order, None on a miss
+    """
+    return list(
+        await asyncio.gather(
+            *(asyncio.to_thread(_lookup_description, image) for image in images)
+        )
+    )
+
+
+def describe_in_background(images: List[Image.Image]) -> None:
+    """
+    Describe images and cache their descriptions without waiting, so later
+    copies of them are served as text.
+    """
+    for image in images:
+        task = asyncio.create_task(asyncio.to_thread(_describe_and_store, image))
+        _background_tasks.add(task)
+        task.add_done_callback(_background_tasks.discard)
+
+
+def format_image_descriptions(descriptions: List[str]) -> str:
+    """Format image descriptions to append to the user's message"""
+    return "\n\n".join(
+        f"[Image {index} attached by the user]\n{description}"
+        for index, description in enumerate(descriptions, 1)
+    )
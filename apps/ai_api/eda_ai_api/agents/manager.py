@@ -1,6 +1,7 @@
 from typing import Dict, List, Optional
-from smolagents import CodeAgent, LiteLLMModel
+from smolagents import CodeAgent
 from eda_config.config import ConfigLoader
+from eda_ai_api.agents.models import get_agent_model
 from eda_ai_api.agents.document_search_agent import get_document_search_agent
 from eda_ai_api.agents.memory_search_agent import get_memory_search_agent
 from eda_ai_api.agents.global_knowledge_agent import get_global_knowledge_agent
@@ -8,27 +9,90 @@ from eda_ai_api.agents.conversation_summary_agent import (
     get_conversation_summary_agent,
 )
 from eda_ai_api.agents.prompts.formatting import get_formatting_guidelines
+from eda_ai_api.agents.tools import (
+    ConversationMemoryTool,
+    DocumentSearchTool,
+    GlobalKnowledgeSearchTool,
+)
 from smolagents.local_python_executor import BASE_BUILTIN_MODULES
 from smolagents.agents import populate_template
+from eda_ai_api.utils.request_accounting import RequestAccounting
+from eda_ai_api.utils.prompt_cache import (
+    log_prompt_cache_usage,
+    log_prompt_layout,
+)
 import os
 
 config = ConfigLoader.get_config()
 
+TOOL_MODE_MANAGED_AGENTS = "managed_agents"
+TOOL_MODE_DIRECT_TOOLS = "direct_tools"
+
 # Use a vision-capable model for the manager (since it needs to process images)
-manager_model = LiteLLMModel(
-    model_id=f"{config.ai_models['standard'].provider}/{config.ai_models['standard'].model}",
-    api_key=config.api_keys.google_ai_studio,
-    temperature=config.ai_models["standard"].temperature,
-)
+manager_model = get_agent_model("manager")
+
+
+def load_prompt_template(name: str) -> str:
+    """Load a prompt template from the prompts directory."""
+    template_path = os.path.join(os.path.dirname(__file__), "prompts", name)
+    with open(template_path, "r", encoding="utf-8") as f:
+        return f.read()
 
 
 def load_manager_prompt_template():
     """Load the manager system prompt template."""
-    template_path = os.path.join(
-        os.path.dirname(__file__), "prompts", "manager.j2"
+    return load_prompt_template("manager.j2")
+
+
+# Templates are static, so read them once instead of on every request
+MANAGER_PROMPT_TEMPLATE = load_manager_prompt_template()
+MANAGER_CONTEXT_TEMPLATE = load_prompt_template("manager_context.j2")
+
+
+class ManagerAgent(CodeAgent):
+    """
+    CodeAgent whose system prompt is a static, cacheable prefix followed by
+    per-user context.
+
+    The prefix (instructions, examples, tools and team members) is
+    byte-identical across users and requests so providers with prompt caching
+    can reuse it. Per-user text is appended after the prefix, outside of the
+    jinja template, so it can never invalidate the prefix.
+    """
+
+    prompt_context: str = ""
+
+    def initialize_system_prompt(self) -> str:
+        prefix = super().initialize_system_prompt()
+        if not self.prompt_context:
+            return prefix
+        return f"{prefix}\n{self.prompt_context}"
+
+
+def build_prompt_context(
+    platform: str,
+    conversation_history: Optional[List[Dict]],
+    retrieved_context: str = "",
+) -> str:
+    """
+    Render the per-request part of the manager system prompt.
+
+    Args:
+        platform: The platform name used to select formatting guidelines
+        conversation_history: List of previous conversation exchanges
+        retrieved_context: Pre-retrieved search results for the current message
+
+    Returns:
+        str: Rendered context appended after the static prompt prefix
+    """
+    return populate_template(
+        MANAGER_CONTEXT_TEMPLATE,
+        variables={
+            "formatting_guidelines": get_formatting_guidelines(platform),
+            "conversation_history": conversation_history or [],
+            "retrieved_context": retrieved_context,
+        },
     )
-    with open(template_path, "r", encoding="utf-8") as f:
-        return f.read()
 
 
 def get_agent(
@@ -36,6 +100,9 @@ def get_agent(
     session_id: str = None,
     conversation_history: List[Dict] = None,
     variables: Optional[Dict] = None,
+    tool_mode: Optional[str] = None,
+    retrieved_context: str = "",
+    accounting: Optional[RequestAccounting] = None,
 ):
     """
     Returns the manager agent configured with specialized sub-agents.
@@ -45,6 +112,9 @@ def get_agent(
         session_id: User's session/platform ID for scoping tools
         conversation_history: List of previous conversation exchanges
         variables: Optional variables to pass to the agent
+        tool_mode: "managed_agents" or "direct_tools" (defaults to config)
+        retrieved_context: Pre-retrieved search results for the current message
+        accounting: Optional per-request accounting threaded to every agent
 
     Returns:
         CodeAgent: The configured manager agent
@@ -57,45 +127,73 @@ def get_agent(
             "session_id is required to initialize user-specific agents"
         )
 
-    # Initialize specialized agents with user context
-    doc_agent = get_document_search_agent(
-        session_id=session_id, platform=platform
-    )
-    mem_agent = get_memory_search_agent(
-        session_id=session_id, platform=platform
+    tool_mode = tool_mode or config.services.ai_api.agent_tool_mode
+
+    # The summary agent does genuinely multi-step work, so it stays an agent
+    summary_agent = get_conversation_summary_agent(
+        session_id=session_id, accounting=accounting
     )
-    summary_agent = get_conversation_summary_agent(session_id=session_id)
 
-    # Initialize global knowledge agent (no user context needed)
-    global_knowledge_agent = get_global_knowledge_agent()
+    if tool_mode == TOOL_MODE_DIRECT_TOOLS:
+        # Single-tool searches are called directly by the manager, saving
+        # the sub-agent LLM round-trips before the manager sees the result
+        tools = [
+            DocumentSearchTool(session_id=session_id, platform=platform),
+            ConversationMemoryTool(session_id=session_id, platform=platform),
+            GlobalKnowledgeSearchTool(),
+        ]
+        managed_agents = [summary_agent]
+    else:
+        # Initialize specialized agents with user context
+        doc_agent = get_document_search_agent(
+            session_id=session_id, platform=platform, accounting=accounting
+        )
+        mem_agent = get_memory_search_agent(
+            session_id=session_id, platform=platform, accounting=accounting
+        )
 
-    # Create the manager agent with vision capabilities
-    manager_agent = CodeAgent(
-        tools=[],
-        managed_agents=[
+        # Initialize global knowledge agent (no user context needed)
+        global_knowledge_agent = get_global_knowledge_agent(
+            accounting=accounting
+        )
+
+        tools = []
+        managed_agents = [
             doc_agent,
             mem_agent,
             summary_agent,
             global_knowledge_agent,
-        ],
+        ]
+
+    # Create the manager agent with vision capabilities
+    manager_agent = ManagerAgent(
+        tools=tools,
+        managed_agents=managed_agents,
         model=manager_model,
         max_steps=config.services.ai_api.max_agent_steps,
+        step_callbacks=[log_prompt_cache_usage],
     )
 
-    # Load and populate the custom prompt template with all required variables
-    prompt_template = load_manager_prompt_template()
-    populated_prompt = populate_template(
-        prompt_template,
+    # Populate the static prompt prefix: it must not contain per-user data
+    static_prompt = populate_template(
+        MANAGER_PROMPT_TEMPLATE,
         variables={
-            "conversation_history": conversation_history or [],
             "bot_name": config.services.whatsapp.bot_name,
-            "formatting_guidelines": get_formatting_guidelines(platform),
             "tools": manager_agent.tools,
             "authorized_imports": BASE_BUILTIN_MODULES,
             "managed_agents": manager_agent.managed_agents,
         },
     )
-    manager_agent.prompt_templates["system_prompt"] = populated_prompt
+    manager_agent.prompt_templates["system_prompt"] = static_prompt
+
+    # Per-user history and formatting go after the prefix
+    manager_agent.prompt_context = build_prompt_context(
+        platform, conversation_history, retrieved_context
+    )
+    log_prompt_layout(static_prompt, manager_agent.prompt_context)
+
+    if accounting:
+        accounting.track_agent(manager_agent, name="manager")
 
     # Apply conversation history limit from config (passed to prompt template)
     history_limit = config.services.ai_api.conversation_history_limit
@@ -0,0 +1,386 @@
+"""
+LLM models used by the agents.
+A central registry builds one model per config.ai_models tier, maps agents to
+tiers, limits concurrent calls per model and shares pooled HTTP clients.
+Calls go through per-call timeouts, jittered retries, optional hedged
+requests and a fallback chain through config.ai_models.
+"""
+
+import random
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from functools import partial
+from typing import Callable, Dict, List, Optional
+
+import httpx
+import litellm
+from loguru import logger
+from smolagents import LiteLLMModel
+from smolagents.models import ChatMessage, Model
+
+from eda_config.config import ConfigLoader
+from eda_ai_api.utils.metrics import get_metrics
+
+config = ConfigLoader.get_config()
+
+# API key attribute in config.api_keys for each LiteLLM provider prefix,
+# config.ai_models may only use these providers
+PROVIDER_API_KEYS = {
+    "gemini": "google_ai_studio",
+    "openrouter": "openrouter",
+    "groq": "groq",
+    "openai": "openai",
+    "deepseek": "deepseek",
+    "huggingface": "huggingface",
+}
+
+# Transient failures worth retrying on the same model
+RETRYABLE_ERRORS = (
+    litellm.RateLimitError,
+    litellm.Timeout,
+    litellm.APIConnectionError,
+    litellm.ServiceUnavailableError,
+    litellm.InternalServerError,
+)
+
+MAX_BACKOFF_SECONDS = 10.0
+
+DEFAULT_TIER = "standard"
+
+_hedge_executor: Optional[ThreadPoolExecutor] = None
+_hedge_executor_lock = threading.Lock()
+
+
+def _get_hedge_executor() -> ThreadPoolExecutor:
+    """Get the executor running hedged LLM requests"""
+    global _hedge_executor
+    if _hedge_executor is None:
+        with _hedge_executor_lock:
+            if _hedge_executor is None:
+                _hedge_executor = ThreadPoolExecutor(
+                    max_workers=config.services.ai_api.agent_max_concurrency * 2,
+                    thread_name_prefix="llm-hedge",
+                )
+    return _hedge_executor
+
+
+def _backoff_delay(attempt: int) -> float:
+    """Full-jitter exponential backoff for the given retry attempt"""
+    base = config.services.ai_api.retry_delay_seconds * (2**attempt)
+    return random.uniform(0, min(MAX_BACKOFF_SECONDS, base))
+
+
+def _api_key_name(tier: str) -> str:
+    """
+    Get the config.api_keys attribute holding the key of a tier's provider.
+
+    Raises:
+        ValueError: If config.api_keys has no key for the provider
+    """
+    provider = config.ai_models[tier].provider
+    if provider not in PROVIDER_API_KEYS:
+        raise ValueError(
+            f"Unsupported provider {provider} for ai_models.{tier}, "
+            f"expected one of {', '.join(sorted(PROVIDER_API_KEYS))}"
+        )
+    return PROVIDER_API_KEYS[provider]
+
+
+def create_litellm_model(tier: str) -> LiteLLMModel:
+    """
+    Create a plain LiteLLM model for an entry of config.ai_models.
+
+    Args:
+        tier: Key in config.ai_models (e.g. "standard")
+    """
+    model_config = config.ai_models[tier]
+    return LiteLLMModel(
+        model_id=f"{model_config.provider}/{model_config.model}",
+        api_key=getattr(config.api_keys, _api_key_name(tier)),
+        temperature=model_config.temperature,
+    )
+
+
+@dataclass
+class ModelSlot:
+    """A tier's model together with the semaphore limiting its concurrency"""
+
+    tier: str
+    model: LiteLLMModel
+    semaphore: threading.BoundedSemaphore
+    limit: int
+
+    @property
+    def provider(self) -> str:
+        return self.model.model_id.split("/", 1)[0]
+
+
+class ResilientModel(Model):
+    """
+    Model that tries an ordered chain of model slots.
+
+    Each model gets `max_retries` jittered retries on transient errors before
+    the next model in the chain is tried. A model whose concurrency limit
+    stays saturated for `llm_queue_timeout_seconds` is skipped as well. When
+    hedging is enabled and a call runs longer than the model's recent latency
+    percentile, a duplicate request is sent and the first success wins.
+    """
+
+    def __init__(self, slots: List[ModelSlot]):
+        super().__init__(model_id=slots[0].model.model_id)
+        self.slots = slots
+
+    def _timed_generate(self, slot: ModelSlot, call: Callable) -> ChatMessage:
+        """Run one LLM call within the model's concurrency limit"""
+        metrics = get_metrics()
+        model_id = slot.model.model_id
+
+        queued_at = time.perf_counter()
+        metrics.add_gauge("llm_queued", 1, model=model_id)
+        acquired = slot.semaphore.acquire(
+            timeout=config.services.ai_api.llm_queue_timeout_seconds
+        )
+        metrics.add_gauge("llm_queued", -1, model=model_id)
+        metrics.observe(
+            "llm_queue_seconds", time.perf_counter() - queued_at, model=model_id
+        )
+        if not acquired:
+            metrics.increment("llm_queue_timeouts", model=model_id)
+            raise TimeoutError(
+                f"No free slot for {model_id} "
+                f"(limit {slot.limit} concurrent calls)"
+            )
+
+        metrics.add_gauge("llm_in_flight", 1, model=model_id)
+        started_at = time.perf_counter()
+        try:
+            message = call()
+        except Exception as e:
+            metrics.increment(
+                "llm_errors", provider=slot.provider, error=type(e).__name__
+            )
+            raise
+        finally:
+            metrics.add_gauge("llm_in_flight", -1, model=model_id)
+            slot.semaphore.release()
+        metrics.observe(
+            "llm_latency_seconds",
+            time.perf_counter() - started_at,
+            provider=slot.provider,
+            model=model_id,
+        )
+        return message
+
+    def _hedged_generate(self, slot: ModelSlot, call: Callable) -> ChatMessage:
+        """Send a duplicate request when the first one is slower than usual"""
+        ai_api_config = config.services.ai_api
+        model_id = slot.model.model_id
+        timed_call = partial(self._timed_generate, slot, call)
+        if not ai_api_config.llm_hedge_enabled:
+            return timed_call()
+
+        threshold = get_metrics().percentile(
+            "llm_latency_seconds",
+            ai_api_config.llm_hedge_percentile,
+            min_count=ai_api_config.llm_hedge_min_samples,
+            provider=slot.provider,
+            model=model_id,
+        )
+        if threshold is None:
+            return timed_call()
+
+        executor = _get_hedge_executor()
+        primary = executor.submit(timed_call)
+        done, _ = wait([primary], timeout=threshold)
+        if done:
+            return primary.result()
+
+        logger.info(
+            f"LLM call to {model_id} exceeded p"
+            f"{ai_api_config.llm_hedge_percentile:g} ({threshold:.2f}s), hedging"
+        )
+        get_metrics().increment("llm_hedged_requests", model=model_id)
+        hedge = executor.submit(timed_call)
+
+        # The losing request cannot be cancelled, its result is dropped
+        pending = {primary, hedge}
+        error = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    if future is hedge:
+                        get_metrics().increment("llm_hedge_wins", model=model_id)
+                    return future.result()
+                error = future.exception()
+        raise error
+
+    def generate(
+        self,
+        messages,
+        stop_sequences=None,
+        response_format=None,
+        tools_to_call_from=None,
+        **kwargs,
+    ) -> ChatMessage:
+        ai_api_config = config.services.ai_api
+        kwargs.setdefault("timeout", ai_api_config.llm_timeout_seconds)
+
+        last_error = None
+        for index, slot in enumerate(self.slots):
+            model_id = slot.model.model_id
+            call = partial(
+                slot.model.generate,
+                messages,
+                stop_sequences=stop_sequences,
+                response_format=response_format,
+                tools_to_call_from=tools_to_call_from,
+                **kwargs,
+            )
+            for attempt in range(ai_api_config.max_retries + 1):
+                try:
+                    message = self._hedged_generate(slot, call)
+                except RETRYABLE_ERRORS as e:
+                    last_error = e
+                    if attempt == ai_api_config.max_retries:
+                        break
+                    delay = _backoff_delay(attempt)
+                    logger.warning(
+                        f"LLM call to {model_id} failed "
+                        f"({type(e).__name__}), retrying in {delay:.1f}s"
+                    )
+                    time.sleep(delay)
+                    continue
+                except Exception as e:
+                    # Not transient on this model, try the next one right away
+                    last_error = e
+                    logger.warning(f"LLM call to {model_id} failed: {str(e)}")
+                    break
+
+                if index > 0:
+                    get_metrics().increment("llm_fallbacks", model=model_id)
+                    logger.info(f"LLM call served by fallback {model_id}")
+                self._last_input_token_count = getattr(
+                    message.token_usage, "input_tokens", None
+                )
+                self._last_output_token_count = getattr(
+                    message.token_usage, "output_tokens", None
+                )
+                return message
+
+            if index + 1 < len(self.slots):
+                logger.warning(
+                    f"Giving up on {model_id}, falling back to "
+                    f"{self.slots[index + 1].model.model_id}"
+                )
+
+        raise last_error
+
+
+class ModelRegistry:
+    """
+    Process-wide registry of the models used by the agents.
+
+    Each config.ai_models tier is built once with its own concurrency
+    semaphore, so every agent using a tier shares its provider rate limit.
+    Agents are mapped to tiers through `agent_model_tiers`.
+
+    Raises:
+        ValueError: If a tier uses a provider without a key in config.api_keys
+    """
+
+    def __init__(self):
+        # Fail at startup rather than with an unauthenticated first call
+        for tier in config.ai_models:
+            _api_key_name(tier)
+        self._lock = threading.Lock()
+        self._slots: Dict[str, ModelSlot] = {}
+        self._models: Dict[str, ResilientModel] = {}
+        self._configure_http_pool()
+
+    @staticmethod
+    def _configure_http_pool() -> None:
+        """Share one pooled, keep-alive HTTP client across LiteLLM calls"""
+        ai_api_config = config.services.ai_api
+        if litellm.client_session is None:
+            litellm.client_session = httpx.Client(
+                limits=httpx.Limits(
+                    max_connections=ai_api_config.llm_http_pool_size,
+                    max_keepalive_connections=ai_api_config.llm_http_pool_size,
+                ),
+                timeout=ai_api_config.llm_timeout_seconds,
+            )
+
+    def slot(self, tier: str) -> ModelSlot:
+        """Get the model slot for a tier, creating it on first use"""
+        with self._lock:
+            if tier not in self._slots:
+                ai_api_config = config.services.ai_api
+                limit = ai_api_config.llm_concurrency_limits.get(
+                    tier, ai_api_config.llm_default_concurrency
+                )
+                self._slots[tier] = ModelSlot(
+                    tier=tier,
+                    model=create_litellm_model(tier),
+                    semaphore=threading.BoundedSemaphore(limit),
+                    limit=limit,
+                )
+                logger.debug(f"Registered model tier {tier} (limit {limit})")
+            return self._slots[tier]
+
+    def model(self, tier: str = DEFAULT_TIER) -> ResilientModel:
+        """
+        Get the model for a tier with the configured fallback chain.
+
+        Args:
+            tier: Key in config.ai_models used as the primary model
+
+        Returns:
+            ResilientModel: The tier followed by the fallbacks from
+            `llm_fallback_models` that exist in config.ai_models
+        """
+        if tier not in self._models:
+            chain = [tier] + [
+                fallback
+                for fallback in config.services.ai_api.llm_fallback_models
+                if fallback != tier and fallback in config.ai_models
+            ]
+            logger.debug(f"Model chain for {tier}: {chain}")
+            model = ResilientModel([self.slot(name) for name in chain])
+            with self._lock:
+                self._models.setdefault(tier, model)
+        return self._models[tier]
+
+    def model_for_agent(self, agent_name: str) -> ResilientModel:
+        """Get the model for an agent according to `agent_model_tiers`"""
+        tier = config.services.ai_api.agent_model_tiers.get(
+            agent_name, DEFAULT_TIER
+        )
+        if tier not in config.ai_models:
+            logger.warning(
+                f"Unknown model tier {tier} for {agent_name}, "
+                f"using {DEFAULT_TIER}"
+            )
+            tier = DEFAULT_TIER
+        return self.model(tier)
+
+
+_registry: Optional[ModelRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_model_registry() -> ModelRegistry:
+    """Get the process-wide model registry"""
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                _registry = ModelRegistry()
+    return _registry
+
+
+def get_agent_model(agent_name: str) -> ResilientModel:
+    """Get the shared model configured for an agent"""
+    return get_model_registry().model_for_agent(agent_name)
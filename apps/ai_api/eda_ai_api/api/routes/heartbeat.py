@@ -1,6 +1,11 @@
+from typing import Any, Dict
+
 from fastapi import APIRouter
+from fastapi.responses import JSONResponse
 
 from eda_ai_api.models.heartbeat import HeartbeatResult
+from eda_ai_api.utils.metrics import get_metrics
+from eda_ai_api.utils.tts_service import get_tts_service
 
 
 router = APIRouter()
@@ -10,3 +15,17 @@ router = APIRouter()
 def get_heartbeat() -> HeartbeatResult:
     heartbeat = HeartbeatResult(is_alive=True)
     return heartbeat
+
+
+@router.get("/metrics", name="metrics")
+def get_metrics_snapshot() -> Dict[str, Any]:
+    """In-process counters and latency histograms"""
+    return get_metrics().snapshot()
+
+
+@router.get("/tts", name="tts_health")
+async def get_tts_health() -> JSONResponse:
+    """Probe Google Cloud TTS, 503 when enabled but unreachable"""
+    health = await get_tts_service().check_health()
+    status_code = 503 if health["enabled"] and not health["healthy"] else 200
+    return JSONResponse(content=health, status_code=status_code)
@@ -1,21 +1,63 @@
+import asyncio
+import time
 import uuid
 from datetime import datetime
 import json
 from typing import Optional, List
 from pydantic import BaseModel
 from fastapi import APIRouter, UploadFile, File, Form
+from fastapi.responses import StreamingResponse
 from PIL import Image
-import io
 
 from loguru import logger
 
 from eda_config.config import ConfigLoader
 from eda_ai_api.agents.manager import get_agent
+from eda_ai_api.agents.image_description import (
+    cached_descriptions,
+    describe_in_background,
+    format_image_descriptions,
+)
+from eda_ai_api.agents.fast_path import (
+    ROUTE_AGENT,
+    ROUTE_FAST_PATH,
+    classify_message,
+    run_fast_path,
+)
 from eda_ai_api.agents.prompts.formatting import get_formatting_guidelines
 from eda_ai_api.models.message_handler import MessageHandlerResponse
 from eda_ai_api.utils.context_builder import build_enhanced_context
 from eda_ai_api.utils.memory_manager import get_vector_memory
 from eda_ai_api.utils.attachment_utils import process_attachment
+from eda_ai_api.utils.agent_executor import run_agent
+from eda_ai_api.utils.admission import get_admission_controller
+from eda_ai_api.utils.answer_cache import (
+    ROUTE_ANSWER_CACHE,
+    is_answer_cacheable_request,
+    is_cacheable_run,
+    lookup_answer,
+    store_answer,
+)
+from eda_ai_api.utils.agent_events import (
+    EVENT_ERROR,
+    EVENT_FINAL,
+    EVENT_RETRIEVAL,
+    EVENT_ROUTE,
+    EventEmitter,
+    format_sse,
+    install_event_hooks,
+)
+from eda_ai_api.utils.exceptions import AIAPIException
+from eda_ai_api.utils.image_cache import is_image_cache_enabled
+from eda_ai_api.utils.image_utils import preprocess_images
+from eda_ai_api.utils.message_coalescer import get_message_coalescer
+from eda_ai_api.utils.request_accounting import RequestAccounting
+from eda_ai_api.utils.pre_retrieval import (
+    estimate_steps_saved,
+    format_pre_retrieval,
+    is_pre_retrieval_enabled,
+    pre_retrieve,
+)
 
 config = ConfigLoader.get_config()
 
@@ -38,91 +80,188 @@ class GroupMessageRequest(BaseModel):
     timestamp: str
 
 
-@router.post("/handle", response_model=MessageHandlerResponse)
-async def message_handler_route(
-    message: Optional[str] = Form(None),
-    user_platform_id: Optional[str] = Form(None),
-    platform: str = Form("whatsapp"),
-    images: List[UploadFile] = File(None),
+async def _read_images(images: Optional[List[UploadFile]]) -> List[Image.Image]:
+    """Decode and downscale uploaded images, skipping any that fail to load"""
+    if not images:
+        return []
+    logger.info(f"Processing {len(images)} uploaded images")
+    uploads = [await img_file.read() for img_file in images]
+    # Decoding runs in worker threads so the event loop stays free
+    return await preprocess_images(
+        uploads, [img_file.filename for img_file in images]
+    )
+
+
+async def _process_message(
+    request: MessageRequest,
+    current_user_id: str,
+    processed_images: List[Image.Image],
+    emit: Optional[EventEmitter] = None,
 ) -> MessageHandlerResponse:
     """
-    Main route handler that processes messages using the manager agent.
-    Now supports image inputs for vision capabilities.
+    Build context, route the message, run the fast path or the agent and
+    store the exchange. Shared by the JSON and the streaming endpoints.
+
+    Args:
+        request: The incoming message request
+        current_user_id: User's platform ID (or a generated session ID)
+        processed_images: Decoded images sent with the message
+        emit: Optional callback receiving progress events
     """
+    if not request.message:
+        logger.warning("No message provided")
+        return MessageHandlerResponse(
+            result="Error: No message provided",
+            user_platform_id=current_user_id,
+        )
+
+    # Get conversation history from vector memory with RAG
+    context = {}
     try:
-        # Create MessageRequest from form fields
-        request = MessageRequest(
-            message=message,
-            user_platform_id=user_platform_id,
-            platform=platform,
+        context = await build_enhanced_context(
+            user_platform_id=current_user_id,
+            current_message=request.message,
+            platform=request.platform,
+            recent_history_limit=config.services.ai_api.conversation_history_limit,
+            relevant_history_limit=config.services.ai_api.relevant_history_limit,
+            cross_session=False,
+        )
+        conversation_history = context.get("merged_history", [])
+        logger.debug(
+            f"Enhanced conversation context built with "
+            f"{len(context.get('recent_history', []))} recent and "
+            f"{len(context.get('relevant_history', []))} relevant exchanges"
         )
+    except Exception as e:
+        logger.error(
+            f"Error retrieving enhanced conversation history: {str(e)}"
+        )
+        conversation_history = []
 
-        current_user_id = request.user_platform_id or str(uuid.uuid4())
-        logger.info(f"New request - User Platform ID: {current_user_id}")
-        logger.info(f"Platform received: {request.platform}")
-        logger.debug(f"Message payload: '{request.message}'")
+    # Get current time for message formatting
+    current_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    formatted_message = f"[{current_time}] User: {request.message}"
+    logger.debug(f"Formatted message for agent: '{formatted_message}'")
 
-        # Process uploaded images
-        processed_images = []
-        if images:
-            logger.info(f"Processing {len(images)} uploaded images")
-            for img_file in images:
-                try:
-                    # Read and convert image
-                    image_bytes = await img_file.read()
-                    pil_image = Image.open(io.BytesIO(image_bytes)).convert(
-                        "RGB"
-                    )
-                    processed_images.append(pil_image)
-                    logger.debug(f"Processed image: {img_file.filename}")
-                except Exception as e:
-                    logger.error(
-                        f"Error processing image {img_file.filename}: {str(e)}"
-                    )
+    # Route simple conversational messages around the multi-step agent
+    route_started_at = time.perf_counter()
+    response_content = None
+    try:
+        decision = await asyncio.to_thread(
+            classify_message, request.message, bool(processed_images)
+        )
+    except Exception as e:
+        logger.warning(f"Message routing failed, using agent: {str(e)}")
+        decision = None
+    route = decision.route if decision else ROUTE_AGENT
+    if decision:
+        logger.info(
+            f"Routing decision: {decision.route} "
+            f"(similarity={decision.similarity:.3f}, reason={decision.reason})"
+        )
+    if emit:
+        emit(
+            EVENT_ROUTE,
+            {
+                "route": route,
+                "similarity": decision.similarity if decision else None,
+            },
+        )
 
-        if not request.message:
-            logger.warning("No message provided")
-            return MessageHandlerResponse(
-                result="Error: No message provided",
-                user_platform_id=current_user_id,
+    if route == ROUTE_FAST_PATH:
+        try:
+            response_content = await asyncio.to_thread(
+                run_fast_path,
+                formatted_message,
+                request.platform,
+                conversation_history,
+            )
+        except Exception as e:
+            logger.warning(
+                f"Fast path failed, falling back to agent: {str(e)}"
             )
+        if not response_content:
+            route = ROUTE_AGENT
 
-        # Get conversation history from vector memory with RAG
-        context = {}
+    # Reuse answers to near-identical standalone global knowledge questions
+    use_answer_cache = is_answer_cacheable_request(
+        conversation_history, bool(processed_images)
+    )
+    if route == ROUTE_AGENT and use_answer_cache:
         try:
-            context = await build_enhanced_context(
-                user_platform_id=current_user_id,
-                current_message=request.message,
-                platform=request.platform,
-                recent_history_limit=config.services.ai_api.conversation_history_limit,
-                relevant_history_limit=config.services.ai_api.relevant_history_limit,
-                cross_session=False,
-            )
-            conversation_history = context.get("merged_history", [])
-            logger.debug(
-                f"Enhanced conversation context built with {len(context.get('recent_history', []))} recent "
-                f"and {len(context.get('relevant_history', []))} relevant exchanges"
+            cached = await asyncio.to_thread(
+                lookup_answer, request.message, request.platform
             )
         except Exception as e:
-            logger.error(
-                f"Error retrieving enhanced conversation history: {str(e)}"
+            logger.warning(f"Answer cache lookup failed: {str(e)}")
+            cached = None
+        if cached:
+            logger.info(
+                f"Serving cached answer (similarity={cached.similarity:.3f}, "
+                f"{cached.llm_calls} LLM calls saved)"
             )
-            conversation_history = []
+            response_content = cached.answer
+            route = ROUTE_ANSWER_CACHE
+            if emit:
+                emit(
+                    EVENT_ROUTE,
+                    {"route": route, "similarity": cached.similarity},
+                )
 
-        # Get current time for message formatting
-        current_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        formatted_message = f"[{current_time}] User: {request.message}"
-        logger.debug(f"Formatted message for agent: '{formatted_message}'")
+    if route == ROUTE_AGENT:
+        # Reuse the descriptions of forwarded copies so every agent step sees
+        # text instead of paying for vision input
+        agent_images = processed_images
+        if processed_images and is_image_cache_enabled():
+            descriptions = await cached_descriptions(processed_images)
+            if all(descriptions):
+                formatted_message = (
+                    f"{formatted_message}\n\n"
+                    f"{format_image_descriptions(descriptions)}"
+                )
+                agent_images = []
+            else:
+                # The agent sees new images as they are, their descriptions
+                # are cached for the next copy
+                describe_in_background(
+                    [
+                        image
+                        for image, description in zip(processed_images, descriptions)
+                        if description is None
+                    ]
+                )
+
+        # Speculatively run the searches the agent would delegate first
+        retrieved = {}
+        if is_pre_retrieval_enabled(request.platform):
+            try:
+                retrieved = await pre_retrieve(
+                    session_id=current_user_id,
+                    query=request.message,
+                    platform=request.platform,
+                )
+            except Exception as e:
+                logger.warning(f"Pre-retrieval failed: {str(e)}")
+            if emit:
+                emit(
+                    EVENT_RETRIEVAL,
+                    {source: len(results) for source, results in retrieved.items()},
+                )
 
         # Create and configure manager agent with user context
         logger.debug(f"Creating agent for platform: {request.platform}")
+        accounting = RequestAccounting(session_id=current_user_id)
         try:
             agent = get_agent(
                 platform=request.platform,
                 session_id=current_user_id,  # Pass the user session
                 conversation_history=conversation_history,  # Pass conversation history
+                retrieved_context=format_pre_retrieval(retrieved),
+                accounting=accounting,
             )
             logger.debug(f"Agent created with {len(agent.tools)} tools")
+            if emit:
+                install_event_hooks(agent, emit)
         except Exception as e:
             logger.error(f"Error creating agent: {str(e)}", exc_info=True)
             return MessageHandlerResponse(
@@ -133,47 +272,128 @@ async def message_handler_route(
         # Run the agent with the formatted message and images
         logger.info("Running agent with formatted message and images")
         try:
-            response_content = agent.run(
+            # Runs on the agent executor so the event loop stays free
+            response_content = await run_agent(
+                agent,
                 formatted_message,
                 images=(
-                    processed_images if processed_images else None
+                    agent_images if agent_images else None
                 ),  # Pass images to agent
             )
             logger.info(
                 f"Agent response received - length: {len(response_content)}"
             )
             logger.debug(f"Agent response: '{response_content[:100]}...'")
+            if retrieved:
+                logger.info(
+                    f"Pre-retrieval saved an estimated "
+                    f"{estimate_steps_saved(retrieved, agent)} agent steps "
+                    f"(sources: {', '.join(retrieved)})"
+                )
+            if use_answer_cache and is_cacheable_run(retrieved, agent):
+                try:
+                    await asyncio.to_thread(
+                        store_answer,
+                        request.message,
+                        response_content,
+                        len(accounting.llm_calls),
+                        request.platform,
+                    )
+                except Exception as e:
+                    logger.warning(f"Failed to cache answer: {str(e)}")
         except Exception as e:
             logger.error(f"Error running agent: {str(e)}", exc_info=True)
             return MessageHandlerResponse(
                 result=f"Error: Agent execution failed - {str(e)}",
                 user_platform_id=current_user_id,
             )
+        finally:
+            accounting.finish()
 
-        # Store conversation in vector memory
-        try:
-            await memory.add_message_to_history(
-                session_id=current_user_id,
-                user_message=request.message,
-                assistant_response=response_content,
-                platform=request.platform,
-                metadata=None,
-            )
-            logger.info(f"Conversation stored for user {current_user_id}")
-        except Exception as db_error:
-            logger.error(f"Failed to store conversation: {str(db_error)}")
+    logger.info(
+        f"Route {route} completed in "
+        f"{time.perf_counter() - route_started_at:.2f}s"
+    )
 
-        # Return the agent's response
-        logger.info(f"Returning response for user: {current_user_id}")
-        return MessageHandlerResponse(
-            result=(
-                response_content[:2499]
-                if response_content
-                else "Error: No response generated"
-            ),
-            user_platform_id=current_user_id,
+    # Store conversation in vector memory
+    try:
+        await memory.add_message_to_history(
+            session_id=current_user_id,
+            user_message=request.message,
+            assistant_response=response_content,
+            platform=request.platform,
+            metadata=None,
+        )
+        logger.info(f"Conversation stored for user {current_user_id}")
+    except Exception as db_error:
+        logger.error(f"Failed to store conversation: {str(db_error)}")
+
+    # Return the agent's response
+    logger.info(f"Returning response for user: {current_user_id}")
+    return MessageHandlerResponse(
+        result=(
+            response_content[:2499]
+            if response_content
+            else "Error: No response generated"
+        ),
+        user_platform_id=current_user_id,
+    )
+
+
+@router.post("/handle", response_model=MessageHandlerResponse)
+async def message_handler_route(
+    message: Optional[str] = Form(None),
+    user_platform_id: Optional[str] = Form(None),
+    platform: str = Form("whatsapp"),
+    images: List[UploadFile] = File(None),
+) -> MessageHandlerResponse:
+    """
+    Main route handler that processes messages using the manager agent.
+    Now supports image inputs for vision capabilities.
+    """
+    try:
+        # Create MessageRequest from form fields
+        request = MessageRequest(
+            message=message,
+            user_platform_id=user_platform_id,
+            platform=platform,
+        )
+
+        current_user_id = request.user_platform_id or str(uuid.uuid4())
+        logger.info(f"New request - User Platform ID: {current_user_id}")
+        logger.info(f"Platform received: {request.platform}")
+        logger.debug(f"Message payload: '{request.message}'")
+
+        # Reject over-limit users and a full queue before doing any work
+        admission = get_admission_controller()
+        admission.check_rate_limit(current_user_id)
+        admission.check_capacity()
+
+        processed_images = await _read_images(images)
+
+        async def process_batch(
+            merged_message: Optional[str], merged_images: List[Image.Image]
+        ) -> MessageHandlerResponse:
+            batch_request = request.model_copy(update={"message": merged_message})
+            async with admission.admit():
+                return await _process_message(
+                    batch_request, current_user_id, merged_images
+                )
+
+        # Quick successive messages from the user are answered by one run
+        coalesced = await get_message_coalescer().submit(
+            current_user_id, request.message, processed_images, process_batch
+        )
+        return coalesced.result.model_copy(
+            update={
+                "coalesced_messages": coalesced.message_count,
+                "is_primary": coalesced.is_primary,
+            }
         )
 
+    except AIAPIException:
+        # Rendered by the exception handlers, e.g. 429 with Retry-After
+        raise
     except Exception as e:
         logger.error(f"Error in message handler route: {str(e)}", exc_info=True)
         return MessageHandlerResponse(
@@ -182,6 +402,97 @@ async def message_handler_route(
         )
 
 
+# Streamed runs keep going after a client disconnects so the exchange is
+# still stored; hold references so the tasks are not garbage collected
+_stream_tasks = set()
+
+
+@router.post("/handle/stream")
+async def message_handler_stream_route(
+    message: Optional[str] = Form(None),
+    user_platform_id: Optional[str] = Form(None),
+    platform: str = Form("whatsapp"),
+    images: List[UploadFile] = File(None),
+) -> StreamingResponse:
+    """
+    Streaming variant of /handle.
+    Emits routing, retrieval, step, tool and sub-agent events while the
+    message is processed, then a `final` event with the same payload as
+    /handle (or an `error` event), as server-sent events.
+    """
+    request = MessageRequest(
+        message=message,
+        user_platform_id=user_platform_id,
+        platform=platform,
+    )
+    current_user_id = request.user_platform_id or str(uuid.uuid4())
+    logger.info(f"New streaming request - User Platform ID: {current_user_id}")
+    logger.info(f"Platform received: {request.platform}")
+
+    # Rejections are plain 429 responses since no stream has started yet
+    admission = get_admission_controller()
+    admission.check_rate_limit(current_user_id)
+    admission.check_capacity()
+
+    # Uploads are closed once the route returns, so read them up front
+    processed_images = await _read_images(images)
+
+    loop = asyncio.get_running_loop()
+    events: asyncio.Queue = asyncio.Queue()
+
+    def emit(event: str, data: dict) -> None:
+        # Agent hooks call this from executor threads
+        loop.call_soon_threadsafe(events.put_nowait, (event, data))
+
+    async def process() -> None:
+        try:
+            # Streams are not merged but still wait for the user's last run
+            async with get_message_coalescer().serialized(current_user_id):
+                async with admission.admit():
+                    response = await _process_message(
+                        request, current_user_id, processed_images, emit=emit
+                    )
+            emit(EVENT_FINAL, response.model_dump())
+        except AIAPIException as e:
+            logger.warning(f"Streaming request rejected: {e.message}")
+            emit(
+                EVENT_ERROR,
+                {
+                    "error": e.message,
+                    "code": e.error_code,
+                    "details": e.details,
+                    "user_platform_id": current_user_id,
+                },
+            )
+        except Exception as e:
+            logger.error(
+                f"Error in streaming message handler: {str(e)}", exc_info=True
+            )
+            emit(
+                EVENT_ERROR,
+                {"error": str(e), "user_platform_id": current_user_id},
+            )
+        finally:
+            emit(None, {})
+
+    async def event_stream():
+        task = asyncio.create_task(process())
+        _stream_tasks.add(task)
+        task.add_done_callback(_stream_tasks.discard)
+
+        while True:
+            event, data = await events.get()
+            if event is None:
+                break
+            yield format_sse(event, data)
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @router.post("/store-group-message")
 async def store_group_message_route(request: GroupMessageRequest):
     """
@@ -1,9 +1,19 @@
+import asyncio
+from dataclasses import asdict
+from typing import Optional
+
 from fastapi import APIRouter, UploadFile, File, Form, Request, HTTPException
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from loguru import logger
 
 from eda_config.config import ConfigLoader
-from eda_ai_api.utils.audio_utils import process_audio_file
+from eda_ai_api.utils.agent_events import EVENT_FINAL, format_sse
+from eda_ai_api.utils.audio_utils import detect_content_type, transcribe_content
+from eda_ai_api.utils.segmented_transcription import (
+    SegmentCallback,
+    SegmentTranscript,
+)
 from eda_ai_api.utils.validation import validate_audio_file
 from eda_ai_api.utils.error_handler import (
     log_request_info,
@@ -19,6 +29,12 @@ config = ConfigLoader.get_config()
 
 router = APIRouter()
 
+# Partial transcript of one segment of long audio
+EVENT_SEGMENT = "segment"
+
+# Keeps streamed transcriptions alive until they finish
+_stream_tasks = set()
+
 
 class TranscriptionResponse(BaseModel):
     """Response model for transcription endpoint"""
@@ -27,22 +43,18 @@ class TranscriptionResponse(BaseModel):
     transcription: str
     error: str = ""
     language: str = "en"
+    # True when the same audio was transcribed before
+    cached: bool = False
 
 
-@router.post("/transcribe", response_model=TranscriptionResponse)
-async def transcribe_audio(
-    request: Request, file: UploadFile = File(...), language: str = Form("en")
-) -> TranscriptionResponse:
+def _check_request(
+    request: Request, file: UploadFile, language: str
+) -> Optional[TranscriptionResponse]:
     """
-    Transcribe audio file to text
-
-    Args:
-        request: FastAPI request object for logging
-        file: Audio file to transcribe
-        language: Language code for transcription (default: "en")
+    Log and validate a transcription request.
 
     Returns:
-        TranscriptionResponse with transcription result
+        None when the request is valid, else the failed response
     """
     try:
         # Log request information
@@ -75,21 +87,53 @@ async def transcribe_audio(
                 "language": language,
             },
         )
+        return None
 
+    except ValidationError as e:
+        logger.warning(f"Transcription validation failed: {str(e)}")
+        return TranscriptionResponse(
+            success=False,
+            transcription="",
+            error=str(e),
+            language=language,
+        )
+    except Exception as e:
+        logger.error(f"Unexpected transcription error: {str(e)}", exc_info=True)
+        return TranscriptionResponse(
+            success=False,
+            transcription="",
+            error=config.services.ai_api.error_messages["PROCESSING_ERROR"],
+            language=language,
+        )
+
+
+async def _transcribe(
+    filename: Optional[str],
+    content: bytes,
+    content_type: Optional[str],
+    language: str,
+    on_segment: Optional[SegmentCallback] = None,
+) -> TranscriptionResponse:
+    """Transcribe uploaded audio into a response, reporting errors in it"""
+    try:
         # Process audio file
-        transcription = await process_audio_file(file, language=language)
+        result = await transcribe_content(
+            content, content_type, language=language, on_segment=on_segment
+        )
+        transcription = result.text
 
         if not transcription or not transcription.strip():
             raise TranscriptionError(
-                "No transcription generated from audio file", file.content_type
+                "No transcription generated from audio file", content_type
             )
 
         logger.info(
             f"Audio transcription completed successfully",
             extra={
-                "filename": file.filename,
+                "filename": filename,
                 "transcription_length": len(transcription),
                 "language": language,
+                "cached": result.cached,
             },
         )
 
@@ -97,16 +141,9 @@ async def transcribe_audio(
             success=True,
             transcription=transcription,
             language=language,
+            cached=result.cached,
         )
 
-    except ValidationError as e:
-        logger.warning(f"Transcription validation failed: {str(e)}")
-        return TranscriptionResponse(
-            success=False,
-            transcription="",
-            error=str(e),
-            language=language,
-        )
     except TranscriptionError as e:
         logger.error(f"Transcription failed: {str(e)}")
         return TranscriptionResponse(
@@ -123,3 +160,83 @@ async def transcribe_audio(
             error=config.services.ai_api.error_messages["PROCESSING_ERROR"],
             language=language,
         )
+
+
+@router.post("/transcribe", response_model=TranscriptionResponse)
+async def transcribe_audio(
+    request: Request, file: UploadFile = File(...), language: str = Form("en")
+) -> TranscriptionResponse:
+    """
+    Transcribe audio file to text
+
+    Args:
+        request: FastAPI request object for logging
+        file: Audio file to transcribe
+        language: Language code for transcription (default: "en")
+
+    Returns:
+        TranscriptionResponse with transcription result
+    """
+    failed = _check_request(request, file, language)
+    if failed:
+        return failed
+
+    content = await file.read()
+    return await _transcribe(
+        file.filename, content, detect_content_type(file), language
+    )
+
+
+@router.post("/transcribe/stream")
+async def transcribe_audio_stream(
+    request: Request, file: UploadFile = File(...), language: str = Form("en")
+) -> StreamingResponse:
+    """
+    Streaming variant of /transcribe.
+    Emits a `segment` event with each partial transcript as long audio is
+    transcribed in segments, then a `final` event with the same payload as
+    /transcribe, as server-sent events. Segments arrive in completion order,
+    their `index` gives their position.
+    """
+    failed = _check_request(request, file, language)
+    if failed:
+        return StreamingResponse(
+            iter([format_sse(EVENT_FINAL, failed.model_dump())]),
+            media_type="text/event-stream",
+        )
+
+    # Uploads are closed once the route returns, so read them up front
+    content = await file.read()
+    content_type = detect_content_type(file)
+    filename = file.filename
+
+    events: asyncio.Queue = asyncio.Queue()
+
+    def on_segment(segment: SegmentTranscript) -> None:
+        events.put_nowait((EVENT_SEGMENT, asdict(segment)))
+
+    async def process() -> None:
+        try:
+            response = await _transcribe(
+                filename, content, content_type, language, on_segment=on_segment
+            )
+            events.put_nowait((EVENT_FINAL, response.model_dump()))
+        finally:
+            events.put_nowait((None, {}))
+
+    async def event_stream():
+        task = asyncio.create_task(process())
+        _stream_tasks.add(task)
+        task.add_done_callback(_stream_tasks.discard)
+
+        while True:
+            event, data = await events.get()
+            if event is None:
+                break
+            yield format_sse(event, data)
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
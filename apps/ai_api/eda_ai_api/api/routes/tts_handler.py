@@ -1,8 +1,9 @@
+import base64
 import os
 import tempfile
 from typing import Optional
 from fastapi import APIRouter, HTTPException, Query, Request
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, StreamingResponse
 from loguru import logger
 
 from eda_config.config import ConfigLoader
@@ -13,7 +14,8 @@ from eda_ai_api.models.tts_handler import (
     FormatsResponse,
     AudioFormatInfo,
 )
-from eda_ai_api.utils.tts_service import TTSService
+from eda_ai_api.utils.agent_events import EVENT_ERROR, EVENT_FINAL, format_sse
+from eda_ai_api.utils.tts_service import get_tts_service
 from eda_ai_api.utils.validation import (
     validate_tts_parameters,
     validate_file_path,
@@ -34,10 +36,8 @@ config = ConfigLoader.get_config()
 
 router = APIRouter()
 
-
-def get_tts_service() -> TTSService:
-    """Get TTS service instance with lazy initialization"""
-    return TTSService()
+# Audio of one chunk of long text, base64 encoded
+EVENT_CHUNK = "chunk"
 
 
 @router.post(
@@ -282,6 +282,91 @@ async def generate_and_download(
         )
 
 
+@router.post(
+    "/generate/stream",
+    summary="Generate speech from long text chunk by chunk",
+    description=(
+        "Synthesize text sentence chunk by sentence chunk in parallel and "
+        "stream each chunk's audio, in order, as server-sent events"
+    ),
+    response_description="Server-sent chunk events followed by a final event",
+)
+async def generate_speech_stream(
+    request: Request, tts_request: TTSRequest
+) -> StreamingResponse:
+    """
+    Stream speech for long text chunk by chunk
+
+    Emits a `chunk` event per sentence chunk, in order, with its audio as
+    base64 so the first one can be played or sent while the rest are still
+    being synthesized, then a `final` event (or an `error` event).
+
+    Args:
+        request: FastAPI request object for logging
+        tts_request: TTS request containing text and optional voice parameters
+
+    Returns:
+        StreamingResponse of server-sent events
+    """
+    log_request_info(request, {"text_length": len(tts_request.text)})
+
+    try:
+        validate_tts_parameters(
+            text=tts_request.text,
+            language_code=tts_request.language_code,
+            voice_name=tts_request.voice_name,
+            pitch=tts_request.pitch,
+            speaking_rate=tts_request.speaking_rate,
+        )
+    except ValidationError as e:
+        logger.warning(f"TTS validation failed: {str(e)}")
+        raise HTTPException(status_code=400, detail=str(e))
+
+    tts_service = get_tts_service()
+
+    async def event_stream():
+        total = 0
+        try:
+            async for chunk in tts_service.synthesize_chunks(
+                tts_request.text,
+                language_code=tts_request.language_code,
+                voice_name=tts_request.voice_name,
+                audio_encoding=tts_request.audio_encoding,
+                pitch=tts_request.pitch,
+                speaking_rate=tts_request.speaking_rate,
+            ):
+                total = chunk.total
+                yield format_sse(
+                    EVENT_CHUNK,
+                    {
+                        "index": chunk.index,
+                        "total": chunk.total,
+                        "file_extension": chunk.file_extension,
+                        "audio": base64.b64encode(chunk.audio).decode("ascii"),
+                    },
+                )
+            yield format_sse(EVENT_FINAL, {"success": True, "chunks": total})
+        except (ValidationError, ServiceUnavailableError) as e:
+            logger.warning(f"TTS stream rejected: {str(e)}")
+            yield format_sse(EVENT_ERROR, {"error": str(e)})
+        except Exception as e:
+            logger.error(f"TTS stream failed: {str(e)}", exc_info=True)
+            yield format_sse(
+                EVENT_ERROR,
+                {
+                    "error": config.services.ai_api.error_messages[
+                        "PROCESSING_ERROR"
+                    ]
+                },
+            )
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @router.get(
     "/voices",
     response_model=VoicesResponse,
@@ -311,7 +396,7 @@ async def get_available_voices(
         log_request_info(request, {"language_code": language_code})
 
         tts_service = get_tts_service()
-        voices = tts_service.get_available_voices(language_code)
+        voices = await tts_service.get_available_voices(language_code)
 
         logger.info(
             f"Retrieved available voices",
@@ -1,9 +1,36 @@
+import asyncio
 from typing import Callable
+from eda_config.config import ConfigLoader
 from fastapi import FastAPI
 from loguru import logger
 
 # Import centralized memory manager
 from eda_ai_api.utils.memory_manager import get_vector_memory
+from eda_ai_api.utils.agent_executor import shutdown_agent_executor
+from eda_ai_api.utils.transcriber import close_transcriber
+from eda_ai_api.utils.tts_cache import is_tts_cache_enabled
+from eda_ai_api.utils.tts_service import get_tts_service, prewarm_tts_cache
+
+config = ConfigLoader.get_config()
+
+# Keeps startup work running in the background alive until it finishes
+_background_tasks = set()
+
+
+async def _start_tts() -> None:
+    """Warm the TTS client and its cache without delaying startup"""
+    tts_service = get_tts_service()
+    await tts_service.start()
+    if is_tts_cache_enabled() and config.services.ai_api.tts_cache_prewarm:
+        await prewarm_tts_cache(tts_service)
+
+
+def _start_tts_in_background() -> None:
+    if not config.services.whatsapp.enable_tts:
+        return
+    task = asyncio.create_task(_start_tts())
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
 
 
 async def _startup_message(app: FastAPI) -> None:
@@ -28,11 +55,14 @@ async def _startup_message(app: FastAPI) -> None:
             f"Error during startup document cleanup: {str(e)}", exc_info=True
         )
 
+    _start_tts_in_background()
+
 
 def _shutdown_message(app: FastAPI) -> None:
     logger.info(
         f"Application '{app.title}' version {app.version} shutting down..."
     )
+    shutdown_agent_executor()
 
 
 def start_app_handler(app: FastAPI) -> Callable:
@@ -43,7 +73,9 @@ def start_app_handler(app: FastAPI) -> Callable:
 
 
 def stop_app_handler(app: FastAPI) -> Callable:
-    def shutdown() -> None:
+    async def shutdown() -> None:
         _shutdown_message(app)
+        await close_transcriber()
+        await get_tts_service().close()
 
     return shutdown
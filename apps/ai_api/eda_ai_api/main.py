@@ -130,7 +130,8 @@ def run_server() -> None:
     if not config.services.ai_api.debug:
         uvicorn_config.update(
             {
-                "workers": 4,  # Multiple workers for production
+                # Admission limits are split between these workers
+                "workers": config.services.ai_api.workers,
                 "worker_class": "uvicorn.workers.UvicornWorker",
                 "limit_concurrency": 1000,
                 "limit_max_requests": 10000,
@@ -22,3 +22,7 @@ class MessageHandlerRequest(BaseModel):
 class MessageHandlerResponse(BaseModel):
     result: str
     user_platform_id: Optional[str] = None
+    # Number of messages merged into the run that produced this result
+    coalesced_messages: int = 1
+    # False when a later message of the same batch carries the answer
+    is_primary: bool = True
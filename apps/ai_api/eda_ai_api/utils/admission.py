@@ -0,0 +1,315 @@
+"""
+Admission control for agent work.
+Per-user token buckets enforce `rate_limit_requests` per
+`rate_limit_window_seconds`, and a bounded queue in front of the agent
+executor rejects work early with a 429 instead of letting it time out.
+
+The buckets live in a SQLite file shared by all workers, so the rate limit
+holds for the whole service. Agent slots and the queue are held in each
+worker, which gets its share of `agent_max_concurrency` and
+`admission_max_queue_size`.
+"""
+
+import asyncio
+import math
+import sqlite3
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import AsyncIterator, Iterator, List, Optional
+
+from loguru import logger
+
+from eda_config.config import ConfigLoader
+from eda_ai_api.utils.exceptions import RateLimitError
+from eda_ai_api.utils.metrics import get_metrics
+
+config = ConfigLoader.get_config()
+
+# Assumed run duration for Retry-After before any run has been measured
+DEFAULT_RUN_SECONDS = 30.0
+
+# Work still running on behalf of the request holding the current slot
+_pending_work: ContextVar[Optional[List[asyncio.Future]]] = ContextVar(
+    "admission_pending_work", default=None
+)
+
+
+def hold_slot_until(future: asyncio.Future) -> None:
+    """
+    Keep the current request's agent slot taken until future completes.
+
+    Used for executor threads that outlive the request, such as an agent run
+    abandoned at its deadline, so the slot count keeps matching the threads
+    actually busy.
+    """
+    pending = _pending_work.get()
+    if pending is not None:
+        pending.append(future)
+
+
+@dataclass
+class TokenBucket:
+    """Refills `capacity` tokens evenly over the rate limit window"""
+
+    capacity: float
+    refill_per_second: float
+    tokens: float = field(init=False)
+    updated_at: float = field(default_factory=time.monotonic)
+
+    def __post_init__(self) -> None:
+        self.tokens = self.capacity
+
+    def _refill(self, now: float) -> None:
+        elapsed = max(0.0, now - self.updated_at)
+        self.tokens = min(self.capacity, self.tokens + elapsed * self.refill_per_second)
+        self.updated_at = now
+
+    def take(self, now: Optional[float] = None) -> float:
+        """
+        Take one token.
+
+        Returns:
+            float: 0 when a token was taken, else seconds until one is free
+        """
+        self._refill(time.monotonic() if now is None else now)
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0.0
+        return (1 - self.tokens) / self.refill_per_second
+
+
+class RateLimitStore:
+    """Token buckets of all users, in a SQLite file shared by the workers"""
+
+    def __init__(self, path: str):
+        self.path = path
+        with self._transaction() as db:
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS rate_limits ("
+                "user_id TEXT PRIMARY KEY, tokens REAL NOT NULL, "
+                "updated_at REAL NOT NULL)"
+            )
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        """Run one transaction, locking the file up front so workers take turns"""
+        db = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+        try:
+            db.execute("BEGIN IMMEDIATE")
+            try:
+                yield db
+            except BaseException:
+                db.execute("ROLLBACK")
+                raise
+            db.execute("COMMIT")
+        finally:
+            db.close()
+
+    def take(
+        self,
+        user_id: str,
+        capacity: float,
+        refill_per_second: float,
+        now: Optional[float] = None,
+    ) -> float:
+        """
+        Take one token from the user's bucket.
+
+        Returns:
+            float: 0 when a token was taken, else seconds until one is free
+        """
+        # Wall clock, monotonic clocks are not comparable between processes
+        now = time.time() if now is None else now
+        bucket = TokenBucket(capacity, refill_per_second, updated_at=now)
+        with self._transaction() as db:
+            row = db.execute(
+                "SELECT tokens, updated_at FROM rate_limits WHERE user_id = ?",
+                (user_id,),
+            ).fetchone()
+            if row is None:
+                # Buckets untouched for a whole window are full again, a
+                # missing row means the same thing
+                db.execute(
+                    "DELETE FROM rate_limits WHERE updated_at < ?",
+                    (now - capacity / refill_per_second,),
+                )
+            else:
+                bucket.tokens, bucket.updated_at = row
+            wait = bucket.take(now)
+            db.execute(
+                "INSERT OR REPLACE INTO rate_limits (user_id, tokens, updated_at) "
+                "VALUES (?, ?, ?)",
+                (user_id, bucket.tokens, bucket.updated_at),
+            )
+        return wait
+
+
+def worker_count() -> int:
+    """Number of uvicorn workers the configured limits are shared by"""
+    ai_api_config = config.services.ai_api
+    return 1 if ai_api_config.debug else max(1, ai_api_config.workers)
+
+
+class AdmissionController:
+    """
+    Decides whether a request may start agent work.
+
+    At most this worker's share of `agent_max_concurrency` runs hold a slot
+    at once. Up to its share of `admission_max_queue_size` more wait for a
+    slot for at most `admission_queue_timeout_seconds`; anything beyond is
+    rejected right away with a Retry-After estimated from recent run
+    durations.
+    """
+
+    def __init__(self):
+        ai_api_config = config.services.ai_api
+        workers = worker_count()
+        self.max_concurrency = max(
+            1, math.ceil(ai_api_config.agent_max_concurrency / workers)
+        )
+        self.max_queue_size = math.ceil(
+            ai_api_config.admission_max_queue_size / workers
+        )
+        self.queue_timeout = ai_api_config.admission_queue_timeout_seconds
+        self._rate_limits: Optional[RateLimitStore] = None
+        self._rate_limits_lock = threading.Lock()
+        self._slots = asyncio.Semaphore(self.max_concurrency)
+        self._queued = 0
+        self._in_flight = 0
+
+    def _reject(self, reason: str, retry_after: float) -> RateLimitError:
+        get_metrics().increment("admission_rejected", reason=reason)
+        return RateLimitError(
+            retry_after=max(1, math.ceil(retry_after)),
+            message=f"Rate limit exceeded ({reason})",
+        )
+
+    def _get_rate_limits(self) -> RateLimitStore:
+        if self._rate_limits is None:
+            with self._rate_limits_lock:
+                if self._rate_limits is None:
+                    self._rate_limits = RateLimitStore(
+                        config.services.ai_api.rate_limit_path
+                    )
+        return self._rate_limits
+
+    def check_rate_limit(self, user_id: str) -> None:
+        """
+        Take one request from the user's token bucket.
+
+        Raises:
+            RateLimitError: When the user has no requests left in the window
+        """
+        ai_api_config = config.services.ai_api
+        if not ai_api_config.rate_limit_requests:
+            return
+
+        try:
+            wait = self._get_rate_limits().take(
+                user_id,
+                capacity=ai_api_config.rate_limit_requests,
+                refill_per_second=ai_api_config.rate_limit_requests
+                / ai_api_config.rate_limit_window_seconds,
+            )
+        except sqlite3.Error as e:
+            # Let the request through rather than fail it on the limiter
+            logger.warning(f"Rate limit check failed: {str(e)}")
+            return
+        if wait:
+            logger.warning(f"User {user_id} is rate limited for {wait:.0f}s")
+            raise self._reject("user_rate_limit", wait)
+
+    def _estimate_wait(self) -> float:
+        """Rough time until a new request would get a slot"""
+        run_seconds = get_metrics().percentile("admission_run_seconds", 50)
+        batches = self._queued // self.max_concurrency + 1
+        return batches * (run_seconds or DEFAULT_RUN_SECONDS)
+
+    def check_capacity(self) -> None:
+        """
+        Fail fast when the queue is already full.
+
+        Raises:
+            RateLimitError: When no more requests can be queued
+        """
+        if self._in_flight >= self.max_concurrency and (
+            self._queued >= self.max_queue_size
+        ):
+            logger.warning(
+                f"Admission queue full ({self._queued} waiting), rejecting request"
+            )
+            raise self._reject("queue_full", self._estimate_wait())
+
+    def _export_gauges(self) -> None:
+        metrics = get_metrics()
+        metrics.set_gauge("admission_queue_depth", self._queued)
+        metrics.set_gauge("admission_in_flight", self._in_flight)
+
+    @asynccontextmanager
+    async def admit(self) -> AsyncIterator[None]:
+        """
+        Hold an agent slot for the duration of the block.
+
+        Raises:
+            RateLimitError: When the queue is full or no slot frees up in time
+        """
+        self.check_capacity()
+        metrics = get_metrics()
+
+        self._queued += 1
+        self._export_gauges()
+        queued_at = time.monotonic()
+        try:
+            await asyncio.wait_for(self._slots.acquire(), timeout=self.queue_timeout)
+        except asyncio.TimeoutError:
+            logger.warning(
+                f"No agent slot freed up within {self.queue_timeout}s, "
+                "rejecting request"
+            )
+            raise self._reject("queue_timeout", self._estimate_wait())
+        finally:
+            self._queued -= 1
+            metrics.observe("admission_wait_seconds", time.monotonic() - queued_at)
+            self._export_gauges()
+
+        self._in_flight += 1
+        self._export_gauges()
+        started_at = time.monotonic()
+        pending: List[asyncio.Future] = []
+        token = _pending_work.set(pending)
+        try:
+            yield
+        finally:
+            _pending_work.reset(token)
+            unfinished = [future for future in pending if not future.done()]
+            if unfinished:
+                logger.debug(
+                    f"Holding agent slot for {len(unfinished)} unfinished threads"
+                )
+                asyncio.gather(*unfinished, return_exceptions=True).add_done_callback(
+                    lambda _: self._release(started_at)
+                )
+            else:
+                self._release(started_at)
+
+    def _release(self, started_at: float) -> None:
+        self._in_flight -= 1
+        self._slots.release()
+        get_metrics().observe(
+            "admission_run_seconds", time.monotonic() - started_at
+        )
+        self._export_gauges()
+
+
+_controller: Optional[AdmissionController] = None
+
+
+def get_admission_controller() -> AdmissionController:
+    """Get the process-wide admission controller"""
+    global _controller
+    if _controller is None:
+        _controller = AdmissionController()
+    return _controller
@@ -0,0 +1,142 @@
+"""
+Progress events for streamed agent runs.
+Hooks into the manager agent, its tools and its managed agents and reports
+what the agent is doing as server-sent events.
+"""
+
+import json
+import time
+from functools import wraps
+from typing import Any, Callable, Dict
+
+from loguru import logger
+from smolagents.memory import ActionStep
+
+EVENT_ROUTE = "route"
+EVENT_RETRIEVAL = "retrieval"
+EVENT_STEP = "step"
+EVENT_TOOL_STARTED = "tool_started"
+EVENT_TOOL_FINISHED = "tool_finished"
+EVENT_SUB_AGENT_STARTED = "sub_agent_started"
+EVENT_SUB_AGENT_FINISHED = "sub_agent_finished"
+EVENT_FINAL = "final"
+EVENT_ERROR = "error"
+
+# Receives an event name and its JSON serializable payload
+EventEmitter = Callable[[str, Dict[str, Any]], None]
+
+
+def format_sse(event: str, data: Dict[str, Any]) -> str:
+    """Format an event as a server-sent event frame"""
+    payload = json.dumps(data, ensure_ascii=False, default=str)
+    return f"event: {event}\ndata: {payload}\n\n"
+
+
+def _safe_emit(emit: EventEmitter, event: str, data: Dict[str, Any]) -> None:
+    """Emit an event without letting a broken listener fail the agent run"""
+    try:
+        emit(event, data)
+    except Exception as e:
+        logger.debug(f"Dropping {event} event: {str(e)}")
+
+
+def _wrap_tool(tool: Any, agent_name: str, emit: EventEmitter) -> None:
+    """Report the start and end of every call to a tool"""
+    forward = tool.forward
+
+    @wraps(forward)
+    def forward_with_events(*args, **kwargs):
+        _safe_emit(
+            emit, EVENT_TOOL_STARTED, {"agent": agent_name, "tool": tool.name}
+        )
+        started_at = time.perf_counter()
+        error = None
+        output = None
+        try:
+            output = forward(*args, **kwargs)
+            return output
+        except Exception as e:
+            error = str(e)
+            raise
+        finally:
+            _safe_emit(
+                emit,
+                EVENT_TOOL_FINISHED,
+                {
+                    "agent": agent_name,
+                    "tool": tool.name,
+                    "duration": round(time.perf_counter() - started_at, 3),
+                    "output_chars": len(str(output)) if output is not None else 0,
+                    "error": error,
+                },
+            )
+
+    tool.forward = forward_with_events
+
+
+def _wrap_sub_agent(sub_agent: Any, emit: EventEmitter) -> None:
+    """Report the start and end of every delegation to a managed agent"""
+    run = sub_agent.run
+
+    @wraps(run)
+    def run_with_events(*args, **kwargs):
+        _safe_emit(emit, EVENT_SUB_AGENT_STARTED, {"agent": sub_agent.name})
+        started_at = time.perf_counter()
+        error = None
+        try:
+            return run(*args, **kwargs)
+        except Exception as e:
+            error = str(e)
+            raise
+        finally:
+            _safe_emit(
+                emit,
+                EVENT_SUB_AGENT_FINISHED,
+                {
+                    "agent": sub_agent.name,
+                    "duration": round(time.perf_counter() - started_at, 3),
+                    "error": error,
+                },
+            )
+
+    # MultiStepAgent.__call__ delegates to self.run, so the instance
+    # attribute is picked up when the manager calls the sub-agent
+    sub_agent.run = run_with_events
+
+
+def install_event_hooks(
+    agent: Any, emit: EventEmitter, agent_name: str = "manager"
+) -> None:
+    """
+    Emit progress events for an agent, its tools and its managed agents.
+
+    Args:
+        agent: The agent about to run
+        emit: Callback receiving every event, called from the agent's thread
+        agent_name: Name reported for steps and tools of this agent
+    """
+
+    def report_step(memory_step: Any) -> None:
+        if not isinstance(memory_step, ActionStep):
+            return
+        duration = getattr(memory_step.timing, "duration", None)
+        _safe_emit(
+            emit,
+            EVENT_STEP,
+            {
+                "agent": agent_name,
+                "step": memory_step.step_number,
+                "duration": round(duration, 3) if duration else None,
+                "error": str(memory_step.error) if memory_step.error else None,
+            },
+        )
+
+    agent.step_callbacks.append(report_step)
+
+    for name, tool in agent.tools.items():
+        if name != "final_answer":
+            _wrap_tool(tool, agent_name, emit)
+
+    for name, managed_agent in getattr(agent, "managed_agents", {}).items():
+        _wrap_sub_agent(managed_agent, emit)
+        install_event_hooks(managed_agent, emit, agent_name=name)
@@ -0,0 +1,209 @@
+"""
+Agent execution off the event loop.
+Runs synchronous smolagents runs on a dedicated, bounded thread pool with a
+hard deadline and cooperative cancellation between steps. A run that misses
+its deadline keeps its admission slot until its thread has stopped.
+"""
+
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, List, Optional
+
+from loguru import logger
+from smolagents.memory import ActionStep
+from smolagents.utils import AgentError
+
+from eda_config.config import ConfigLoader
+from eda_ai_api.utils.admission import hold_slot_until
+
+config = ConfigLoader.get_config()
+
+_executor: Optional[ThreadPoolExecutor] = None
+
+
+def get_agent_executor() -> ThreadPoolExecutor:
+    """Get the process-wide executor used for agent runs"""
+    global _executor
+    if _executor is None:
+        max_workers = config.services.ai_api.agent_max_concurrency
+        logger.debug(f"Initializing agent executor with {max_workers} workers")
+        _executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="agent-run"
+        )
+    return _executor
+
+
+def shutdown_agent_executor() -> None:
+    """Stop accepting agent runs and release the worker threads"""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+
+
+def _install_deadline(agent: Any, deadline: float) -> None:
+    """
+    Interrupt the agent and its managed agents once the deadline has passed.
+
+    smolagents checks the interrupt switch before each step, so a running
+    step finishes but no new step starts after the deadline.
+    """
+
+    def check_deadline(memory_step: Any) -> None:
+        if time.monotonic() >= deadline:
+            agent.interrupt()
+
+    agent.step_callbacks.append(check_deadline)
+    for managed_agent in getattr(agent, "managed_agents", {}).values():
+        _install_deadline(managed_agent, deadline)
+
+
+def _interrupt_all(agent: Any) -> None:
+    """Interrupt an agent and every managed agent below it"""
+    agent.interrupt()
+    for managed_agent in getattr(agent, "managed_agents", {}).values():
+        _interrupt_all(managed_agent)
+
+
+def _log_late_result(future: "asyncio.Future") -> None:
+    """Consume the result of a run that finished after its deadline"""
+    if future.cancelled():
+        return
+    error = future.exception()
+    if error is not None:
+        logger.debug(f"Agent run stopped after deadline: {str(error)}")
+    else:
+        logger.debug("Agent run completed after its deadline, result dropped")
+
+
+async def _wait_for_stop(future: "asyncio.Future", timeout: float) -> bool:
+    """
+    Wait for an interrupted run to finish its current step.
+
+    Returns:
+        bool: True when the run thread has stopped within timeout
+    """
+    try:
+        await asyncio.wait_for(asyncio.shield(future), timeout=timeout)
+    except asyncio.TimeoutError:
+        return False
+    except Exception:
+        # Interrupted runs end with an AgentError
+        pass
+    return True
+
+
+async def _partial_answer(
+    agent: Any, task: str, images: Optional[List[Any]], grace_seconds: float
+) -> Optional[str]:
+    """
+    Summarize the steps the agent managed to complete before the deadline.
+    Only called once the run thread has stopped, so agent.memory is no
+    longer being written to.
+    """
+    completed_steps = [
+        step
+        for step in agent.memory.steps
+        if isinstance(step, ActionStep) and step.observations
+    ]
+    if not completed_steps:
+        return None
+
+    summary = asyncio.ensure_future(
+        asyncio.to_thread(agent.provide_final_answer, task, images)
+    )
+    hold_slot_until(summary)
+    try:
+        message = await asyncio.wait_for(
+            asyncio.shield(summary), timeout=max(0.0, grace_seconds)
+        )
+    except asyncio.TimeoutError:
+        logger.warning("Partial answer generation missed its grace period")
+        summary.add_done_callback(_log_late_result)
+        return None
+
+    content = getattr(message, "content", None)
+    return content if isinstance(content, str) and content.strip() else None
+
+
+async def run_agent(
+    agent: Any,
+    task: str,
+    images: Optional[List[Any]] = None,
+    timeout_seconds: Optional[int] = None,
+    fallback_message: Optional[str] = None,
+) -> str:
+    """
+    Run an agent on the agent executor with an enforced deadline.
+
+    When the deadline passes, or the agent is interrupted for another reason
+    such as an exhausted request budget, the user gets a summary of the work
+    done so far, or the fallback message when there is nothing to summarize.
+    After the deadline the run gets `agent_final_answer_grace_seconds` to
+    finish its current step and be summarized; a run still busy after that
+    gets the fallback message.
+
+    Args:
+        agent: The agent to run
+        task: Task passed to `agent.run`
+        images: Optional images passed to `agent.run`
+        timeout_seconds: Hard deadline (defaults to agent_timeout_seconds)
+        fallback_message: Answer used when no partial answer is available
+
+    Returns:
+        str: The agent's answer, a partial answer or the fallback message
+    """
+    ai_api_config = config.services.ai_api
+    timeout_seconds = timeout_seconds or ai_api_config.agent_timeout_seconds
+    fallback_message = (
+        fallback_message or config.services.whatsapp.error_messages["TIMEOUT"]
+    )
+
+    _install_deadline(agent, time.monotonic() + timeout_seconds)
+
+    loop = asyncio.get_running_loop()
+    future = loop.run_in_executor(
+        get_agent_executor(), partial(agent.run, task, images=images)
+    )
+
+    try:
+        result = await asyncio.wait_for(
+            asyncio.shield(future), timeout=timeout_seconds
+        )
+        return str(result) if result is not None else ""
+    except asyncio.TimeoutError:
+        logger.warning(
+            f"Agent run exceeded its {timeout_seconds}s deadline, interrupting"
+        )
+        _interrupt_all(agent)
+        hold_slot_until(future)
+    except AgentError:
+        if not agent.interrupt_switch:
+            raise
+        logger.warning("Agent run was interrupted before its final answer")
+
+    grace_deadline = (
+        time.monotonic() + ai_api_config.agent_final_answer_grace_seconds
+    )
+    # The run thread writes agent.memory until it stops
+    if not await _wait_for_stop(
+        future, ai_api_config.agent_final_answer_grace_seconds
+    ):
+        logger.warning("Agent run is still busy after its grace period")
+        future.add_done_callback(_log_late_result)
+        return fallback_message
+    if not future.cancelled() and future.exception() is None:
+        # The step running at the deadline produced the final answer
+        result = future.result()
+        if result is not None:
+            return str(result)
+
+    partial_answer = await _partial_answer(
+        agent, task, images, grace_deadline - time.monotonic()
+    )
+    if partial_answer:
+        logger.info("Returning partial answer after agent deadline")
+        return partial_answer
+    return fallback_message
@@ -0,0 +1,218 @@
+"""
+Semantic answer cache for global-knowledge-only questions.
+Answers the agent built only from the global knowledge base are reused for
+near-identical questions on the same platform until the knowledge base
+changes. Only messages sent without conversation history are cached or
+served, a follow-up question means something else in another conversation.
+"""
+
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+from loguru import logger
+from smolagents.memory import ActionStep
+
+from eda_config.config import ConfigLoader
+from eda_ai_api.utils.memory_manager import get_vector_memory
+from eda_ai_api.utils.metrics import get_metrics
+from eda_ai_api.utils.pre_retrieval import (
+    SOURCE_DOCUMENTS,
+    SOURCE_GLOBAL_KNOWLEDGE,
+    SOURCE_MEMORY,
+    count_search_calls,
+)
+
+config = ConfigLoader.get_config()
+
+ROUTE_ANSWER_CACHE = "answer_cache"
+
+ANSWER_CACHE_COLLECTION = "semantic_answer_cache"
+
+# Sub-agents whose answers depend on the user's own data
+USER_DATA_AGENTS = ["conversation_summary_agent"]
+
+
+@dataclass
+class CachedAnswer:
+    """An answer served from the semantic answer cache"""
+
+    answer: str
+    similarity: float
+    llm_calls: int
+
+
+def is_answer_cache_enabled() -> bool:
+    """Check whether the semantic answer cache is enabled"""
+    return config.services.ai_api.answer_cache_enabled
+
+
+def _get_collection():
+    """Get or create the ChromaDB collection holding cached answers"""
+    return get_vector_memory().chroma_client.get_or_create_collection(
+        name=ANSWER_CACHE_COLLECTION,
+        metadata={
+            "hnsw:space": "cosine",
+            "type": "answer_cache",
+            "description": "Answers built only from the global knowledge base",
+        },
+    )
+
+
+def _min_created_at() -> float:
+    """Oldest creation timestamp of a cache entry that is still valid"""
+    ttl = timedelta(hours=config.services.ai_api.answer_cache_ttl_hours)
+    return (datetime.now() - ttl).timestamp()
+
+
+def is_answer_cacheable_request(
+    conversation_history: List[Dict[str, Any]], has_images: bool
+) -> bool:
+    """
+    Check whether a message may be answered from, or stored in, the cache.
+
+    Args:
+        conversation_history: History given to the agent with the message
+        has_images: Whether images were sent with the message
+
+    Returns:
+        bool: True for standalone text questions when the cache is enabled
+    """
+    return is_answer_cache_enabled() and not conversation_history and not has_images
+
+
+def lookup_answer(query: str, platform: str) -> Optional[CachedAnswer]:
+    """
+    Find a cached answer for a near-identical question.
+
+    Only entries built on the same platform against the current global
+    knowledge version and younger than the TTL are considered.
+
+    Args:
+        query: The user's message
+        platform: Platform the answer is formatted for
+
+    Returns:
+        CachedAnswer when an entry is above the similarity threshold, else None
+    """
+    memory = get_vector_memory()
+    metrics = get_metrics()
+
+    version = memory.get_global_knowledge_version()
+    query_embedding = memory.embedding_model.encode(query).tolist()
+    results = _get_collection().query(
+        query_embeddings=[query_embedding],
+        n_results=1,
+        where={
+            "$and": [
+                {"gk_version": version},
+                {"platform": platform},
+                {"created_at": {"$gte": _min_created_at()}},
+            ]
+        },
+        include=["metadatas", "documents", "distances"],
+    )
+    metrics.increment("answer_cache_lookups")
+
+    cached = None
+    if results and results.get("ids") and results["ids"][0]:
+        similarity = 1 - results["distances"][0][0]
+        threshold = config.services.ai_api.answer_cache_similarity_threshold
+        if similarity >= threshold:
+            metadata = results["metadatas"][0][0]
+            cached = CachedAnswer(
+                answer=results["documents"][0][0],
+                similarity=similarity,
+                llm_calls=int(metadata.get("llm_calls", 0)),
+            )
+
+    if cached:
+        metrics.increment("answer_cache_hits")
+        metrics.increment("answer_cache_llm_calls_saved", cached.llm_calls)
+    logger.info(
+        f"Answer cache {'hit' if cached else 'miss'} "
+        f"(hit rate {metrics.ratio('answer_cache_hits', 'answer_cache_lookups'):.1%}, "
+        f"{metrics.counter('answer_cache_llm_calls_saved'):.0f} LLM calls saved)"
+    )
+    return cached
+
+
+def store_answer(query: str, answer: str, llm_calls: int, platform: str) -> None:
+    """
+    Cache an answer built only from the global knowledge base.
+
+    Stale entries from older knowledge versions or past the TTL are purged
+    on every write.
+
+    Args:
+        query: The user's message
+        answer: The agent's answer
+        llm_calls: LLM calls the agent spent on the answer
+        platform: Platform the answer is formatted for
+    """
+    memory = get_vector_memory()
+    collection = _get_collection()
+    version = memory.get_global_knowledge_version()
+
+    collection.delete(
+        where={
+            "$or": [
+                {"gk_version": {"$ne": version}},
+                {"created_at": {"$lt": _min_created_at()}},
+            ]
+        }
+    )
+
+    collection.add(
+        ids=[f"answer_{uuid.uuid4()}"],
+        embeddings=[memory.embedding_model.encode(query).tolist()],
+        documents=[answer],
+        metadatas=[
+            {
+                "query": query,
+                "gk_version": version,
+                "platform": platform,
+                "created_at": datetime.now().timestamp(),
+                "llm_calls": llm_calls,
+            }
+        ],
+    )
+    logger.info(f"Cached global knowledge answer ({llm_calls} LLM calls)")
+
+
+def is_cacheable_run(
+    retrieved: Dict[str, List[Dict[str, Any]]], agent: Any
+) -> bool:
+    """
+    Check whether an agent answer came from the global knowledge base only.
+
+    Args:
+        retrieved: Results injected by pre-retrieval
+        agent: The manager agent after `run` has finished
+
+    Returns:
+        bool: True when global knowledge was used and no user data was
+        retrieved, searched or summarized, and the run was not interrupted
+    """
+    if agent.interrupt_switch:
+        return False
+    if retrieved.get(SOURCE_DOCUMENTS) or retrieved.get(SOURCE_MEMORY):
+        return False
+
+    calls = count_search_calls(agent)
+    if calls[SOURCE_DOCUMENTS] or calls[SOURCE_MEMORY]:
+        return False
+
+    code = " ".join(
+        str(tool_call.arguments)
+        for step in agent.memory.steps
+        if isinstance(step, ActionStep) and step.tool_calls
+        for tool_call in step.tool_calls
+    )
+    if any(f"{name}(" in code for name in USER_DATA_AGENTS):
+        return False
+
+    return bool(
+        retrieved.get(SOURCE_GLOBAL_KNOWLEDGE) or calls[SOURCE_GLOBAL_KNOWLEDGE]
+    )
@@ -49,7 +49,7 @@ async def process_attachment(
         # Process based on file type
         if content_type.startswith("audio/"):
             # Reuse existing audio processing
-            transcription = await process_audio_file(attachment)
+            transcription = (await process_audio_file(attachment)).text
             description = f"Audio transcription: {transcription}"
             metadata["transcription"] = transcription
 
@@ -1,58 +1,288 @@
+import asyncio
 import os
+import re
 import tempfile
+import weakref
 from pathlib import Path
-from typing import Literal
+from typing import List, Literal, Optional, Tuple
 
 import ffmpeg
+from loguru import logger
 
-AudioFormat = Literal["mp3", "mp4", "mpeg", "mpga", "m4a", "wav", "webm"]
+from eda_config.config import ConfigLoader
 
+config = ConfigLoader.get_config()
 
-def convert_ogg(
+AudioFormat = Literal["mp3", "mp4", "mpeg", "mpga", "m4a", "wav", "webm", "ogg"]
+
+# ffmpeg muxer for each output format
+FFMPEG_FORMATS = {
+    "mp3": "mp3",
+    "mpeg": "mp3",
+    "mpga": "mp3",
+    "mp4": "mp4",
+    "m4a": "ipod",
+    "wav": "wav",
+    "webm": "webm",
+    "ogg": "ogg",
+    "pcm": "s16le",
+}
+
+# MP4 needs a fragmented layout to be written to a pipe, it cannot seek back
+PIPE_OUTPUT_OPTIONS = {
+    "mp4": {"movflags": "frag_keyframe+empty_moov"},
+    "ipod": {"movflags": "frag_keyframe+empty_moov"},
+}
+
+# libopus defaults to 10; at speech bitrates a low level encodes ~3x faster
+# for a couple of percent in size
+OPUS_COMPRESSION_LEVEL = 2
+
+# Raw audio handed between ffmpeg runs: 16 kHz mono signed 16-bit, what Whisper
+# works on anyway
+PCM_SAMPLE_RATE = 16000
+PCM_BYTES_PER_SECOND = PCM_SAMPLE_RATE * 2
+PCM_INPUT_OPTIONS = {"format": "s16le", "ar": PCM_SAMPLE_RATE, "ac": 1}
+
+SILENCE_START = re.compile(r"silence_start: (-?[\d.]+)")
+SILENCE_END = re.compile(r"silence_end: (-?[\d.]+)")
+
+# An asyncio.Semaphore binds to the first loop that waits on it, so each
+# event loop (one per asyncio.run) gets its own
+_semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]"
+_semaphores = weakref.WeakKeyDictionary()
+
+
+def _get_semaphore() -> asyncio.Semaphore:
+    """Limit the number of ffmpeg processes running at once on this loop"""
+    loop = asyncio.get_running_loop()
+    semaphore = _semaphores.get(loop)
+    if semaphore is None:
+        semaphore = asyncio.Semaphore(
+            config.services.ai_api.audio_conversion_max_concurrency
+        )
+        _semaphores[loop] = semaphore
+    return semaphore
+
+
+def build_ffmpeg_args(
+    output_format: str,
+    input_options: Optional[dict] = None,
+    source: str = "pipe:0",
+    **output_options,
+) -> list:
+    """
+    Build an ffmpeg command reading from stdin and writing to stdout.
+
+    Args:
+        output_format: Key of FFMPEG_FORMATS
+        input_options: ffmpeg input options, needed for raw input such as
+            PCM_INPUT_OPTIONS
+        source: Input to read instead of stdin, for formats that need a
+            seekable input
+        output_options: Extra ffmpeg output options (e.g. ac=1, ar=16000)
+    """
+    muxer = FFMPEG_FORMATS[output_format]
+    options = {
+        "loglevel": "error",
+        **PIPE_OUTPUT_OPTIONS.get(muxer, {}),
+        **output_options,
+    }
+    stream = ffmpeg.input(source, **(input_options or {})).output(
+        "pipe:1", format=muxer, **options
+    )
+    return ffmpeg.compile(stream, overwrite_output=True)
+
+
+async def _communicate(
+    data: Optional[bytes], args: list, timeout_seconds: Optional[float] = None
+) -> Tuple[bytes, bytes]:
+    """
+    Run ffmpeg on data, returning its stdout and stderr.
+    Pass data=None when the command reads its input from a file.
+    """
+    timeout_seconds = (
+        timeout_seconds or config.services.ai_api.audio_conversion_timeout_seconds
+    )
+    async with _get_semaphore():
+        process = await asyncio.create_subprocess_exec(
+            *args,
+            stdin=(
+                asyncio.subprocess.PIPE
+                if data is not None
+                else asyncio.subprocess.DEVNULL
+            ),
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+        )
+        try:
+            stdout, stderr = await asyncio.wait_for(
+                process.communicate(data), timeout=timeout_seconds
+            )
+        except asyncio.TimeoutError:
+            process.kill()
+            await process.wait()
+            raise RuntimeError(
+                f"FFmpeg timed out after {timeout_seconds}s"
+            ) from None
+
+    if process.returncode != 0:
+        raise RuntimeError(f"FFmpeg error: {stderr.decode(errors='replace')}")
+    return stdout, stderr
+
+
+async def run_ffmpeg(
+    data: bytes, args: list, timeout_seconds: Optional[float] = None
+) -> bytes:
+    """
+    Pipe bytes through an ffmpeg subprocess without touching the filesystem.
+
+    Args:
+        data: Input file content
+        args: ffmpeg command from build_ffmpeg_args
+        timeout_seconds: Defaults to audio_conversion_timeout_seconds
+
+    Returns:
+        bytes: ffmpeg's stdout
+    """
+    stdout, _ = await _communicate(data, args, timeout_seconds)
+    return stdout
+
+
+async def convert_ogg(
     input_file: str | Path | bytes,
     output_format: AudioFormat = "mp3",
-    output_path: str | Path | None = None,
-) -> str:
+) -> bytes:
     """
-    Convert OGG audio file to another format using ffmpeg.
+    Convert OGG audio to another format using ffmpeg.
+
+    Audio is piped through ffmpeg's stdin and stdout, so concurrent
+    conversions never share a file.
 
     Args:
         input_file: Path to input OGG file or bytes content
         output_format: Desired output format
-        output_path: Optional output path. If None, uses a temporary file
 
     Returns:
-        str: Path to the converted audio file
+        bytes: The converted audio
+    """
+    if not isinstance(input_file, bytes):
+        input_file = Path(input_file).read_bytes()
+
+    try:
+        output = await run_ffmpeg(input_file, build_ffmpeg_args(output_format))
+    except RuntimeError:
+        raise
+    except Exception as e:
+        raise RuntimeError(f"Error converting audio: {str(e)}") from e
+
+    logger.debug(
+        f"Converted {len(input_file)} bytes of OGG to "
+        f"{len(output)} bytes of {output_format}"
+    )
+    return output
+
+
+async def transcode_for_transcription(
+    data: bytes, input_options: Optional[dict] = None
+) -> bytes:
+    """
+    Transcode audio to 16 kHz mono Opus in an OGG container.
+
+    Whisper resamples everything to 16 kHz mono, so this keeps all the
+    information it uses at a fraction of the size of full-rate MP3.
+
+    Args:
+        data: Audio in any format ffmpeg can read
+        input_options: ffmpeg input options, PCM_INPUT_OPTIONS for raw PCM
+
+    Returns:
+        bytes: OGG Opus audio
+    """
+    args = build_ffmpeg_args(
+        "ogg",
+        input_options=input_options,
+        acodec="libopus",
+        ac=1,
+        ar=16000,
+        application="voip",
+        compression_level=OPUS_COMPRESSION_LEVEL,
+        **{"b:a": config.services.ai_api.transcription_opus_bitrate},
+    )
+    output = await run_ffmpeg(data, args)
+    logger.debug(
+        f"Transcoded {len(data)} bytes of audio to {len(output)} bytes of Opus"
+    )
+    return output
+
+
+async def decode_with_silences(
+    data: bytes, noise_db: float, min_silence_seconds: float
+) -> Tuple[bytes, List[Tuple[float, float]]]:
     """
+    Decode audio to PCM and find its silences in a single ffmpeg pass.
+
+    The input goes through a private temporary file rather than stdin: MP4
+    and M4A files from phone recorders keep their index (moov atom) at the
+    end, which ffmpeg can only reach on a seekable input.
+
+    Args:
+        data: Audio in any format ffmpeg can read
+        noise_db: Level below which audio counts as silence (e.g. -35)
+        min_silence_seconds: Shortest pause reported
+
+    Returns:
+        The audio as 16 kHz mono PCM and the (start, end) seconds of each
+        silence, in order
+
+    Raises:
+        RuntimeError: If ffmpeg fails or decodes no audio
+    """
+    # mkstemp creates the file readable by this user only
+    fd, path = tempfile.mkstemp(suffix=".audio")
     try:
-        # Handle bytes input by writing to temp file first
-        if isinstance(input_file, bytes):
-            with tempfile.NamedTemporaryFile(suffix=".ogg", delete=False) as temp_ogg:
-                temp_ogg.write(input_file)
-                input_file = temp_ogg.name
-
-        # If no output path specified, create temp file
-        if output_path is None:
-            temp_dir = tempfile.gettempdir()
-            output_path = os.path.join(temp_dir, f"converted_audio.{output_format}")
-
-        # Ensure output directory exists
-        os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
-
-        # Convert audio using ffmpeg
-        stream = ffmpeg.input(str(input_file))
-        stream = ffmpeg.output(stream, str(output_path))
-        ffmpeg.run(
-            stream, overwrite_output=True, capture_stdout=True, capture_stderr=True
+        with os.fdopen(fd, "wb") as file:
+            await asyncio.to_thread(file.write, data)
+        pcm, stderr = await _decode_file_with_silences(
+            path, noise_db, min_silence_seconds
         )
+    finally:
+        os.unlink(path)
 
-        # Clean up temp input file if we created one
-        if isinstance(input_file, str) and input_file.startswith(tempfile.gettempdir()):
-            os.unlink(input_file)
+    duration = len(pcm) / PCM_BYTES_PER_SECOND
+    if duration == 0:
+        raise RuntimeError("FFmpeg decoded no audio from the input")
 
-        return str(output_path)
+    silences = []
+    start = None
+    for line in stderr.decode(errors="replace").splitlines():
+        if match := SILENCE_START.search(line):
+            start = max(0.0, float(match.group(1)))
+        elif (match := SILENCE_END.search(line)) and start is not None:
+            silences.append((start, min(float(match.group(1)), duration)))
+            start = None
+    if start is not None:
+        # Trailing silence runs to the end of the audio
+        silences.append((start, duration))
 
-    except ffmpeg.Error as e:
-        raise RuntimeError(f"FFmpeg error: {e.stderr.decode()}") from e
-    except Exception as e:
-        raise RuntimeError(f"Error converting audio: {str(e)}") from e
+    logger.debug(
+        f"Decoded {duration:.1f}s of audio with {len(silences)} silences"
+    )
+    return pcm, silences
+
+
+async def _decode_file_with_silences(
+    path: str, noise_db: float, min_silence_seconds: float
+) -> Tuple[bytes, bytes]:
+    """Decode a file to PCM with silencedetect, returning stdout and stderr"""
+    args = build_ffmpeg_args(
+        "pcm",
+        source=path,
+        ac=1,
+        ar=PCM_SAMPLE_RATE,
+        af=f"silencedetect=noise={noise_db}dB:d={min_silence_seconds}",
+        # silencedetect reports at info level
+        loglevel="info",
+        nostats=None,
+    )
+    return await _communicate(None, args)
@@ -1,11 +1,27 @@
+import asyncio
 import os
-import tempfile
+from dataclasses import dataclass
 from typing import Optional
 
 from fastapi import UploadFile
+from loguru import logger
 
-from .audio_converter import convert_ogg
+from eda_config.config import ConfigLoader
+
+from .audio_converter import transcode_for_transcription
+from .segmented_transcription import (
+    SegmentCallback,
+    should_segment,
+    transcribe_segmented,
+)
 from .transcriber import transcribe_audio
+from .transcription_cache import (
+    get_transcription_cache,
+    is_transcription_cache_enabled,
+    transcription_cache_key,
+)
+
+config = ConfigLoader.get_config()
 
 ALLOWED_FORMATS = {
     "audio/mpeg": "mp3",
@@ -46,45 +62,99 @@ def detect_audio_format_from_content(content: bytes) -> str:
     # Check for common audio format signatures
     if content[:4] == b"RIFF" and content[8:12] == b"WAVE":
         return "wav"
-    elif content[:3] == b"ID3" or content[:2] == b"\xff\xfb":
+    elif content[:3] == b"ID3" or content[:2] in (b"\xff\xfb", b"\xff\xf3"):
         return "mp3"
     elif content[:4] == b"fLaC":
         return "flac"
     elif content[:4] == b"OggS":
         return "ogg"
-    elif content[:4] == b"ftyp":
+    elif content[4:8] == b"ftyp":
         return "mp4"
+    elif content[:4] == b"\x1a\x45\xdf\xa3":
+        return "webm"
     else:
-        # For WhatsApp audio, default to ogg since they typically send OGG Opus
-        return "ogg"
+        # Unknown containers (e.g. AMR or 3GP) are transcoded before upload
+        return "unknown"
+
+
+@dataclass
+class TranscriptionResult:
+    text: str
+    # True when served from the transcription cache
+    cached: bool = False
 
 
-async def process_audio_file(audio: UploadFile, language: str = "en") -> str:
+async def process_audio_file(
+    audio: UploadFile, language: str = "en"
+) -> TranscriptionResult:
     content_type = detect_content_type(audio)
     content = await audio.read()
+    return await transcribe_content(content, content_type, language)
+
+
+async def transcribe_content(
+    content: bytes,
+    content_type: Optional[str],
+    language: str = "en",
+    on_segment: Optional[SegmentCallback] = None,
+) -> TranscriptionResult:
+    """
+    Transcribe audio content read from an upload.
+
+    Args:
+        content: The audio file content
+        content_type: MIME type of the upload
+        language: Language code
+        on_segment: Called with partial transcripts while long audio is
+            transcribed in segments
+
+    Returns:
+        TranscriptionResult: The transcript and whether it was cached
+    """
+    # Forwarded voice notes arrive as identical bytes
+    cache_key = None
+    if is_transcription_cache_enabled():
+        cache_key = transcription_cache_key(content, language)
+        try:
+            cached = await asyncio.to_thread(get_transcription_cache().get, cache_key)
+        except Exception as e:
+            logger.warning(f"Transcription cache lookup failed: {str(e)}")
+            cached = None
+        if cached is not None:
+            logger.info("Serving transcription from cache")
+            return TranscriptionResult(text=cached, cached=True)
+
+    if should_segment(content):
+        # Long recordings are cut at pauses and transcribed in parallel
+        text = await transcribe_segmented(content, language, on_segment)
+        return await _cache_result(cache_key, text)
+
+    # Determine file format
+    if content_type in ALLOWED_FORMATS and content_type != "application/octet-stream":
+        file_format = ALLOWED_FORMATS[content_type]
+    else:
+        # WhatsApp sends audio as octet-stream, and types such as audio/x-m4a,
+        # audio/aac or audio/amr are not listed; detect from content
+        file_format = detect_audio_format_from_content(content)
+
+    # Whisper takes most containers as they are, including WhatsApp's OGG
+    # Opus; anything else becomes compact speech-grade Opus
+    if file_format not in config.services.ai_api.transcription_passthrough_formats:
+        content = await transcode_for_transcription(content)
+        file_format = "ogg"
+
+    text = await transcribe_audio(
+        content, language=language, filename=f"audio.{file_format}"
+    )
+
+    return await _cache_result(cache_key, text)
+
 
-    try:
-        # Determine file format
-        if content_type == "application/octet-stream":
-            # WhatsApp sends audio as octet-stream, detect from content
-            file_format = detect_audio_format_from_content(content)
-        elif content_type is not None:
-            file_format = ALLOWED_FORMATS.get(content_type, "ogg")
-        else:
-            # Fallback to content detection
-            file_format = detect_audio_format_from_content(content)
-
-        # Handle OGG format (common for WhatsApp)
-        if file_format == "ogg" or content_type == "audio/ogg":
-            audio_path = convert_ogg(content, output_format="mp3")
-        else:
-            with tempfile.NamedTemporaryFile(
-                suffix=f".{file_format}", delete=False
-            ) as temp_file:
-                temp_file.write(content)
-                audio_path = temp_file.name
-
-        return transcribe_audio(audio_path, language=language)
-    finally:
-        if "audio_path" in locals() and os.path.exists(audio_path):
-            os.unlink(audio_path)
+async def _cache_result(cache_key: Optional[str], text: str) -> TranscriptionResult:
+    """Store a fresh transcript in the transcription cache"""
+    if cache_key and text and text.strip():
+        try:
+            await asyncio.to_thread(get_transcription_cache().put, cache_key, text)
+        except Exception as e:
+            logger.warning(f"Failed to cache transcription: {str(e)}")
+    return TranscriptionResult(text=text)
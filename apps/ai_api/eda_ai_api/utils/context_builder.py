@@ -1,11 +1,145 @@
-from typing import Dict, List, Optional
+import asyncio
+import time
+from typing import Any, Awaitable, Dict, List, Optional, Tuple
 from loguru import logger
 
 from eda_ai_api.utils.memory_manager import get_vector_memory
+from eda_ai_api.utils.metrics import get_metrics
 from eda_config.config import ConfigLoader
 
 config = ConfigLoader.get_config()
 
+# Rough average for the multilingual text users send, avoids a tokenizer call
+CHARS_PER_TOKEN = 4
+
+# Budget left over below this is not worth an elided exchange
+MIN_EXCHANGE_TOKENS = 32
+
+ELISION_MARKER = " [...] "
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimate the number of prompt tokens of a text"""
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def exchange_tokens(exchange: Dict) -> int:
+    """Estimated prompt tokens of one exchange as rendered in the prompt"""
+    return estimate_tokens(
+        f"User: {exchange.get('user', '')}\n"
+        f"Assistant: {exchange.get('assistant', '')}\n"
+    )
+
+
+def _elide(text: str, max_tokens: int) -> str:
+    """Keep the start and end of a text within max_tokens"""
+    max_chars = max_tokens * CHARS_PER_TOKEN
+    if len(text) <= max_chars:
+        return text
+    keep = max(0, max_chars - len(ELISION_MARKER))
+    head = keep * 2 // 3
+    return text[:head] + ELISION_MARKER + text[len(text) - (keep - head) :]
+
+
+def fit_exchange(exchange: Dict, max_tokens: int) -> Optional[Dict]:
+    """
+    Shrink an exchange to at most max_tokens by eliding the middle of its
+    longest parts.
+
+    Returns:
+        The exchange (a copy when shrunk), or None if it cannot fit
+    """
+    if exchange_tokens(exchange) <= max_tokens:
+        return exchange
+    if max_tokens < MIN_EXCHANGE_TOKENS:
+        return None
+
+    user = exchange.get("user", "") or ""
+    assistant = exchange.get("assistant", "") or ""
+    # Room for the "User:"/"Assistant:" labels
+    available = max_tokens - exchange_tokens({"user": "", "assistant": ""})
+    user_tokens = estimate_tokens(user)
+    assistant_tokens = estimate_tokens(assistant)
+
+    # Short parts are kept whole and their unused share goes to the other
+    half = available // 2
+    if user_tokens <= half:
+        assistant_budget = available - user_tokens
+        user_budget = user_tokens
+    elif assistant_tokens <= half:
+        user_budget = available - assistant_tokens
+        assistant_budget = assistant_tokens
+    else:
+        user_budget = half
+        assistant_budget = available - half
+
+    return {
+        **exchange,
+        "user": _elide(user, user_budget),
+        "assistant": _elide(assistant, assistant_budget),
+        "elided": True,
+    }
+
+
+def pack_history(
+    recent_history: List[Dict],
+    relevant_history: List[Dict],
+    max_tokens: int,
+    max_exchange_tokens: int,
+) -> Tuple[List[Dict], List[Dict], int]:
+    """
+    Fill a token budget with conversation history by priority.
+
+    Recent exchanges are taken newest first, then relevant exchanges by
+    relevance. Each exchange is capped at max_exchange_tokens, and the last
+    one that fits is elided to the remaining budget.
+
+    Args:
+        recent_history: Recent exchanges, oldest first
+        relevant_history: Relevant exchanges, most relevant first
+        max_tokens: Token budget for the whole history
+        max_exchange_tokens: Token cap for a single exchange
+
+    Returns:
+        Packed recent history (oldest first), packed relevant history and
+        their estimated token count
+    """
+    remaining = max_tokens
+    packed_recent: List[Dict] = []
+    packed_relevant: List[Dict] = []
+
+    candidates = [(packed_recent, e) for e in reversed(recent_history)] + [
+        (packed_relevant, e) for e in relevant_history
+    ]
+    for packed, exchange in candidates:
+        fitted = fit_exchange(exchange, min(max_exchange_tokens, remaining))
+        if fitted is None:
+            continue
+        packed.append(fitted)
+        remaining -= exchange_tokens(fitted)
+
+    packed_recent.reverse()
+    return packed_recent, packed_relevant, max_tokens - remaining
+
+
+def _run_in_thread(coro: Awaitable[Any]) -> Awaitable[Any]:
+    """
+    Run a memory coroutine on its own event loop in a worker thread.
+    The memory lookups block on PocketBase and Chroma calls without ever
+    yielding, so awaiting them directly would stall the event loop.
+    """
+    return asyncio.to_thread(asyncio.run, coro)
+
+
+async def _timed(stage: str, coro: Awaitable[Any], timings: Dict[str, float]) -> Any:
+    """Await a context stage and record how long it took"""
+    started_at = time.perf_counter()
+    try:
+        return await coro
+    finally:
+        timings[stage] = time.perf_counter() - started_at
+        get_metrics().observe("context_stage_seconds", timings[stage], stage=stage)
+
 
 async def build_enhanced_context(
     user_platform_id: str,
@@ -32,11 +166,61 @@ async def build_enhanced_context(
     try:
         memory = get_vector_memory()
         context = {}
+        ai_api_config = config.services.ai_api
+        budget = ai_api_config.context_timeout_seconds
+        timings: Dict[str, float] = {}
+        started_at = time.perf_counter()
 
-        # Get recent sequential history
-        recent_history = await memory.get_conversation_history(
-            session_id=user_platform_id, limit=recent_history_limit
+        # Fetch recent (PocketBase) and relevant (Chroma) history concurrently
+        recent_task = asyncio.create_task(
+            _timed(
+                "recent_history",
+                _run_in_thread(
+                    memory.get_conversation_history(
+                        session_id=user_platform_id, limit=recent_history_limit
+                    )
+                ),
+                timings,
+            )
         )
+        relevant_task = asyncio.create_task(
+            _timed(
+                "relevant_history",
+                _run_in_thread(
+                    memory.get_relevant_history(
+                        session_id=user_platform_id,
+                        current_query=current_message,
+                        platform=platform,
+                        limit=relevant_history_limit,
+                        cross_session=cross_session,
+                    )
+                ),
+                timings,
+            )
+        )
+
+        try:
+            recent_history = await asyncio.wait_for(recent_task, timeout=budget)
+        except asyncio.TimeoutError:
+            logger.warning(
+                f"Recent history missed the {budget}s context budget, "
+                "continuing without it"
+            )
+            recent_history = []
+
+        # Relevant history only gets what is left of the budget
+        remaining = max(0.0, budget - (time.perf_counter() - started_at))
+        try:
+            relevant_history = await asyncio.wait_for(
+                relevant_task, timeout=remaining
+            )
+        except asyncio.TimeoutError:
+            logger.warning(
+                f"Relevant history missed the {budget}s context budget, "
+                "using recent history only"
+            )
+            get_metrics().increment("context_degraded")
+            relevant_history = []
 
         # Format recent history for context
         recent_formatted = await memory.format_history_for_context(
@@ -44,15 +228,6 @@ async def build_enhanced_context(
         )
         context["recent_history"] = recent_formatted
 
-        # Get semantically relevant history
-        relevant_history = await memory.get_relevant_history(
-            session_id=user_platform_id,
-            current_query=current_message,
-            platform=platform,
-            limit=relevant_history_limit,
-            cross_session=cross_session,
-        )
-
         # Remove duplicates from relevant history that are already in recent history
         recent_messages = set()
         for exchange in recent_formatted:
@@ -63,15 +238,35 @@ async def build_enhanced_context(
             if exchange.get("user", "") not in recent_messages:
                 unique_relevant.append(exchange)
 
-        context["relevant_history"] = unique_relevant
+        # Keep the prompt size predictable however long the exchanges are
+        pack_started_at = time.perf_counter()
+        packed_recent, packed_relevant, history_tokens = pack_history(
+            recent_formatted,
+            unique_relevant,
+            max_tokens=ai_api_config.context_max_tokens,
+            max_exchange_tokens=ai_api_config.context_max_exchange_tokens,
+        )
+        context["recent_history"] = packed_recent
+        context["relevant_history"] = packed_relevant
 
         # Add merged history for easy access
-        merged_history = recent_formatted + unique_relevant
+        merged_history = packed_recent + packed_relevant
         context["merged_history"] = merged_history
+        context["history_tokens"] = history_tokens
+        timings["pack"] = time.perf_counter() - pack_started_at
+        timings["total"] = time.perf_counter() - started_at
 
+        dropped = len(recent_formatted) + len(unique_relevant) - len(merged_history)
+        elided = sum(1 for exchange in merged_history if exchange.get("elided"))
+        logger.info(
+            f"Built enhanced context with {len(packed_recent)} recent and "
+            f"{len(packed_relevant)} relevant history items, "
+            f"~{history_tokens}/{ai_api_config.context_max_tokens} tokens "
+            f"({elided} elided, {dropped} dropped)"
+        )
         logger.info(
-            f"Built enhanced context with {len(recent_formatted)} recent and "
-            f"{len(unique_relevant)} relevant history items"
+            "Context stage timings: "
+            + ", ".join(f"{stage}={seconds:.3f}s" for stage, seconds in timings.items())
         )
         return context
 
@@ -81,4 +276,5 @@ async def build_enhanced_context(
             "recent_history": [],
             "relevant_history": [],
             "merged_history": [],
+            "history_tokens": 0,
         }
@@ -52,7 +52,15 @@ async def handle_aiapi_exception(
         },
     )
 
-    return JSONResponse(status_code=exc.status_code, content=error_response)
+    # Tell clients when to retry rate limited requests
+    headers = None
+    retry_after = exc.details.get("retry_after")
+    if exc.status_code == 429 and retry_after:
+        headers = {"Retry-After": str(retry_after)}
+
+    return JSONResponse(
+        status_code=exc.status_code, content=error_response, headers=headers
+    )
 
 
 async def handle_validation_error(
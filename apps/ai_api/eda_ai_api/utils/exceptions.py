@@ -127,9 +127,11 @@ class AgentError(AIAPIException):
 class RateLimitError(AIAPIException):
     """Raised when rate limit is exceeded"""
 
-    def __init__(self, retry_after: Optional[int] = None):
+    def __init__(
+        self, retry_after: Optional[int] = None, message: Optional[str] = None
+    ):
         super().__init__(
-            message="Rate limit exceeded",
+            message=message or "Rate limit exceeded",
             error_code="RATE_LIMIT_ERROR",
             details={"retry_after": retry_after} if retry_after else {},
             status_code=429,
@@ -0,0 +1,118 @@
+"""
+Content-hash cache of image descriptions.
+The same flyer or screenshot forwarded across chats is described by the
+vision model once, later copies reuse the stored description.
+
+Entries are keyed by a hash of the image's pixels. Perceptual hashes are
+not used for lookups: flyers that differ only in their text (a date, an
+address) hash to the same value, and would be answered with the wrong
+description.
+"""
+
+import hashlib
+from datetime import datetime, timedelta
+from typing import Optional
+
+from loguru import logger
+from PIL import Image
+
+from eda_config.config import ConfigLoader
+from eda_ai_api.utils.memory_manager import get_vector_memory
+from eda_ai_api.utils.metrics import get_metrics
+
+config = ConfigLoader.get_config()
+
+IMAGE_CACHE_COLLECTION = "image_descriptions"
+
+# Chroma requires a vector per entry. Lookups go by id (the content hash) and
+# never by similarity, so a one-dimensional constant is enough
+PLACEHOLDER_EMBEDDING = [0.0]
+
+
+def is_image_cache_enabled() -> bool:
+    """Check whether images are described once and cached"""
+    return config.services.ai_api.image_cache_enabled
+
+
+def image_content_hash(image: Image.Image) -> str:
+    """
+    Hash of an image's mode, size and pixels.
+
+    Images are hashed after preprocessing, so the same upload always hashes
+    to the same value whatever metadata its file carried.
+    """
+    digest = hashlib.sha256()
+    digest.update(f"{image.mode}:{image.width}x{image.height}:".encode())
+    digest.update(image.tobytes())
+    return digest.hexdigest()
+
+
+def _get_collection():
+    """Get or create the ChromaDB collection holding image descriptions"""
+    return get_vector_memory().chroma_client.get_or_create_collection(
+        name=IMAGE_CACHE_COLLECTION,
+        metadata={
+            "type": "image_cache",
+            "description": "Vision model descriptions keyed by content hash",
+        },
+    )
+
+
+def _entry_id(image_hash: str) -> str:
+    return f"image_{image_hash}"
+
+
+def _min_created_at() -> float:
+    """Oldest creation timestamp of a cache entry that is still valid"""
+    ttl = timedelta(hours=config.services.ai_api.image_cache_ttl_hours)
+    return (datetime.now() - ttl).timestamp()
+
+
+def lookup_description(image_hash: str) -> Optional[str]:
+    """
+    Find the stored description of an identical image.
+
+    Args:
+        image_hash: Content hash of the image
+
+    Returns:
+        The description when an entry younger than the TTL exists, else None
+    """
+    metrics = get_metrics()
+    results = _get_collection().get(
+        ids=[_entry_id(image_hash)],
+        where={"created_at": {"$gte": _min_created_at()}},
+        include=["documents"],
+    )
+    metrics.increment("image_cache_lookups")
+
+    description = None
+    if results and results.get("ids"):
+        description = results["documents"][0]
+
+    if description:
+        metrics.increment("image_cache_hits")
+    logger.info(
+        f"Image cache {'hit' if description else 'miss'} "
+        f"(hit rate {metrics.ratio('image_cache_hits', 'image_cache_lookups'):.1%})"
+    )
+    return description
+
+
+def store_description(image_hash: str, description: str) -> None:
+    """
+    Cache the description of an image, purging expired entries.
+
+    Args:
+        image_hash: Content hash of the image
+        description: The vision model's description of the image
+    """
+    collection = _get_collection()
+    collection.delete(where={"created_at": {"$lt": _min_created_at()}})
+    collection.upsert(
+        ids=[_entry_id(image_hash)],
+        embeddings=[PLACEHOLDER_EMBEDDING],
+        documents=[description],
+        metadatas=[{"created_at": datetime.now().timestamp()}],
+    )
+    logger.debug("Cached image description")
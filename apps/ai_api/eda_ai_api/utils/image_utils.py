@@ -0,0 +1,113 @@
+"""
+Image preprocessing for the vision path.
+Uploaded images are checked against the size limits before they are decoded,
+downscaled to `image_max_side`, stripped of metadata and re-encoded as JPEG.
+"""
+
+import asyncio
+import io
+import math
+from typing import List, Optional
+
+from loguru import logger
+from PIL import Image, ImageOps
+
+from eda_config.config import ConfigLoader
+from eda_ai_api.utils.exceptions import FileProcessingError, FileTooLargeError
+
+config = ConfigLoader.get_config()
+
+
+def preprocess_image(data: bytes, filename: Optional[str] = None) -> Image.Image:
+    """
+    Turn uploaded image bytes into a compact RGB image for the model.
+
+    Only the header is read before the pixel count is checked, so
+    decompression bombs are rejected without being decoded. JPEGs are
+    decoded directly at a reduced scale when possible.
+
+    Args:
+        data: The uploaded file content
+        filename: Name used in error messages
+
+    Returns:
+        Image.Image: A JPEG-backed image without EXIF data, no side longer
+        than `image_max_side`
+
+    Raises:
+        FileTooLargeError: When the upload exceeds `max_file_size_mb`
+        FileProcessingError: When the image cannot be read or has more than
+        `image_max_pixels` pixels
+    """
+    ai_api_config = config.services.ai_api
+    if len(data) > ai_api_config.max_file_size_mb * 1024 * 1024:
+        raise FileTooLargeError(ai_api_config.max_file_size_mb)
+
+    try:
+        image = Image.open(io.BytesIO(data))
+    except (Image.UnidentifiedImageError, Image.DecompressionBombError) as e:
+        raise FileProcessingError(
+            f"Cannot read image {filename}: {str(e)}", file_type="image"
+        )
+
+    width, height = image.size
+    if width * height > ai_api_config.image_max_pixels:
+        raise FileProcessingError(
+            f"Image {filename} has {width}x{height} pixels, above the limit of "
+            f"{ai_api_config.image_max_pixels}",
+            file_type="image",
+        )
+
+    max_side = ai_api_config.image_max_side
+    scale = min(1.0, max_side / max(width, height))
+    # No-op for formats other than JPEG
+    image.draft("RGB", (math.ceil(width * scale), math.ceil(height * scale)))
+
+    # Apply the EXIF orientation before the metadata is dropped
+    image = ImageOps.exif_transpose(image).convert("RGB")
+    image.thumbnail((max_side, max_side), Image.Resampling.LANCZOS)
+
+    # Saving without exif= drops EXIF, including GPS location
+    buffer = io.BytesIO()
+    image.save(
+        buffer,
+        format="JPEG",
+        quality=ai_api_config.image_jpeg_quality,
+        optimize=True,
+    )
+    logger.debug(
+        f"Preprocessed image {filename}: {width}x{height} ({len(data)} bytes) "
+        f"-> {image.width}x{image.height} ({buffer.tell()} bytes)"
+    )
+    # Decoded lazily, so waiting requests only hold the compressed bytes
+    return Image.open(buffer)
+
+
+async def preprocess_images(
+    uploads: List[bytes], filenames: List[Optional[str]]
+) -> List[Image.Image]:
+    """
+    Preprocess uploaded images in worker threads, skipping rejected ones.
+
+    Args:
+        uploads: Content of each uploaded image
+        filenames: Filename of each upload, for logging
+
+    Returns:
+        List of the images that passed preprocessing, in upload order
+    """
+    results = await asyncio.gather(
+        *(
+            asyncio.to_thread(preprocess_image, data, filename)
+            for data, filename in zip(uploads, filenames)
+        ),
+        return_exceptions=True,
+    )
+
+    images = []
+    for filename, result in zip(filenames, results):
+        if isinstance(result, Exception):
+            logger.error(f"Error processing image {filename}: {str(result)}")
+        else:
+            images.append(result)
+    return images
@@ -0,0 +1,224 @@
+"""
+Per-user message coalescing for the message handler.
+Messages a user sends in quick succession are merged into one agent run, and
+runs for the same user never overlap.
+
+Production runs several uvicorn workers, and a user's messages can land on
+different ones. Merging only happens between messages that reach the same
+worker, but runs are serialized across all workers on the host through a
+per-user lock file.
+"""
+
+import asyncio
+import fcntl
+import hashlib
+import os
+import tempfile
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional
+
+from loguru import logger
+
+from eda_config.config import ConfigLoader
+from eda_ai_api.utils.metrics import get_metrics
+
+config = ConfigLoader.get_config()
+
+# Processes the merged message and images of one batch
+ProcessBatch = Callable[[Optional[str], List[Any]], Awaitable[Any]]
+
+# Lock files shared by the workers of this host, one per user
+USER_LOCK_DIR = Path(tempfile.gettempdir()) / "eda_ai_api_user_locks"
+USER_LOCK_POLL_SECONDS = 0.05
+
+
+@asynccontextmanager
+async def _worker_lock(user_id: str) -> AsyncIterator[None]:
+    """
+    Hold the user's lock file, so that runs in other workers wait.
+    The lock is polled rather than blocked on, so waiting stays cancellable.
+    """
+    USER_LOCK_DIR.mkdir(parents=True, exist_ok=True)
+    name = hashlib.sha256(user_id.encode()).hexdigest()
+    fd = os.open(USER_LOCK_DIR / f"{name}.lock", os.O_RDWR | os.O_CREAT, 0o600)
+    try:
+        while True:
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                break
+            except BlockingIOError:
+                await asyncio.sleep(USER_LOCK_POLL_SECONDS)
+        yield
+    finally:
+        # Closing the descriptor releases the lock
+        os.close(fd)
+
+
+@dataclass
+class CoalescedResult:
+    """Result of a batch as seen by one of the requests that joined it"""
+
+    result: Any
+    message_count: int
+    # True for the latest message of the batch, which should carry the answer
+    is_primary: bool
+
+
+@dataclass
+class _PendingMessage:
+    message: Optional[str]
+    images: List[Any]
+    future: asyncio.Future
+
+
+@dataclass
+class _UserQueue:
+    run_lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+    pending: List[_PendingMessage] = field(default_factory=list)
+    last_arrival: float = 0.0
+    collecting: bool = False
+    # Runs holding or waiting for run_lock
+    holders: int = 0
+
+
+class MessageCoalescer:
+    """
+    Debounces messages per user within one worker.
+
+    The first message of a batch waits until the user has been quiet for the
+    coalescing window (at most `message_coalescing_max_wait_seconds`), and
+    until any run already in flight for that user has finished. Everything
+    that arrived by then is merged into one run whose answer goes back to
+    every request in the batch.
+    """
+
+    def __init__(self):
+        self._users: Dict[str, _UserQueue] = {}
+        self._tasks: set = set()
+
+    def _cleanup(self, user_id: str, queue: _UserQueue) -> None:
+        """Forget a user once nothing is pending, collecting or running"""
+        if (
+            not queue.pending
+            and not queue.collecting
+            and queue.holders == 0
+            and self._users.get(user_id) is queue
+        ):
+            del self._users[user_id]
+
+    @asynccontextmanager
+    async def serialized(self, user_id: str) -> AsyncIterator[None]:
+        """
+        Run a block after any in-flight run for the user has finished, in
+        this worker or another one.
+        Used directly by callers that cannot merge messages, e.g. streaming.
+        """
+        queue = self._users.setdefault(user_id, _UserQueue())
+        queue.holders += 1
+        queued_at = time.monotonic()
+        try:
+            async with queue.run_lock, _worker_lock(user_id):
+                get_metrics().observe(
+                    "coalescer_queue_seconds", time.monotonic() - queued_at
+                )
+                yield
+        finally:
+            queue.holders -= 1
+            self._cleanup(user_id, queue)
+
+    async def submit(
+        self,
+        user_id: str,
+        message: Optional[str],
+        images: List[Any],
+        process: ProcessBatch,
+    ) -> CoalescedResult:
+        """
+        Add a message to the user's next batch and wait for its answer.
+
+        Args:
+            user_id: User's platform ID
+            message: The message text
+            images: Decoded images sent with the message
+            process: Coroutine function running the merged batch
+
+        Returns:
+            CoalescedResult with the batch answer for this request
+        """
+        queue = self._users.setdefault(user_id, _UserQueue())
+        future = asyncio.get_running_loop().create_future()
+        queue.pending.append(_PendingMessage(message, images, future))
+        queue.last_arrival = time.monotonic()
+
+        if not queue.collecting:
+            queue.collecting = True
+            # Runs detached so the batch completes even if this client leaves
+            task = asyncio.create_task(self._run_batch(user_id, queue, process))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+        return await asyncio.shield(future)
+
+    async def _wait_for_quiet(self, queue: _UserQueue) -> None:
+        """Wait until no message arrived for the window, up to the max wait"""
+        ai_api_config = config.services.ai_api
+        window = ai_api_config.message_coalescing_window_seconds
+        max_wait = ai_api_config.message_coalescing_max_wait_seconds
+        deadline = time.monotonic() + max_wait
+        while True:
+            now = time.monotonic()
+            remaining = min(queue.last_arrival + window, deadline) - now
+            if remaining <= 0:
+                return
+            await asyncio.sleep(remaining)
+
+    async def _run_batch(
+        self, user_id: str, queue: _UserQueue, process: ProcessBatch
+    ) -> None:
+        metrics = get_metrics()
+        await self._wait_for_quiet(queue)
+
+        async with self.serialized(user_id):
+            # Messages that arrived while an earlier run was in flight join too
+            batch, queue.pending = queue.pending, []
+            queue.collecting = False
+
+            messages = [p.message for p in batch if p.message]
+            merged_message = "\n".join(messages) if messages else None
+            merged_images = [image for p in batch for image in p.images]
+            metrics.observe("coalescer_batch_size", len(batch))
+            if len(batch) > 1:
+                logger.info(
+                    f"Coalesced {len(batch)} messages from {user_id} into one run"
+                )
+
+            try:
+                result = await process(merged_message, merged_images)
+            except Exception as e:
+                for pending in batch:
+                    if not pending.future.done():
+                        pending.future.set_exception(e)
+            else:
+                for index, pending in enumerate(batch):
+                    if not pending.future.done():
+                        pending.future.set_result(
+                            CoalescedResult(
+                                result=result,
+                                message_count=len(batch),
+                                is_primary=index == len(batch) - 1,
+                            )
+                        )
+
+
+_coalescer: Optional[MessageCoalescer] = None
+
+
+def get_message_coalescer() -> MessageCoalescer:
+    """Get the process-wide message coalescer"""
+    global _coalescer
+    if _coalescer is None:
+        _coalescer = MessageCoalescer()
+    return _coalescer
@@ -0,0 +1,119 @@
+"""
+In-process metrics for the AI API.
+Thread-safe counters, gauges and latency histograms, exposed as a JSON
+snapshot on the health router.
+"""
+
+import threading
+from collections import defaultdict, deque
+from typing import Any, Deque, Dict, Optional
+
+# Observations kept per histogram, older ones are dropped
+HISTOGRAM_WINDOW = 1000
+
+
+def _key(name: str, labels: Dict[str, Any]) -> str:
+    """Build a metric key such as `llm_latency_seconds{model=groq/llama}`"""
+    if not labels:
+        return name
+    label_str = ",".join(f"{k}={v}" for k, v in sorted(labels.items()))
+    return f"{name}{{{label_str}}}"
+
+
+def _percentile(sorted_values: list, q: float) -> float:
+    """Nearest-rank percentile of already sorted values"""
+    index = min(len(sorted_values) - 1, int(q / 100 * len(sorted_values)))
+    return sorted_values[index]
+
+
+class MetricsRegistry:
+    """Counters, gauges and rolling-window histograms keyed by name and labels"""
+
+    def __init__(self, histogram_window: int = HISTOGRAM_WINDOW):
+        self._lock = threading.Lock()
+        self._counters: Dict[str, float] = defaultdict(float)
+        self._gauges: Dict[str, float] = defaultdict(float)
+        self._histograms: Dict[str, Deque[float]] = defaultdict(
+            lambda: deque(maxlen=histogram_window)
+        )
+
+    def increment(self, name: str, value: float = 1, **labels: Any) -> None:
+        """Add `value` to a counter"""
+        with self._lock:
+            self._counters[_key(name, labels)] += value
+
+    def set_gauge(self, name: str, value: float, **labels: Any) -> None:
+        """Set a gauge to its current value"""
+        with self._lock:
+            self._gauges[_key(name, labels)] = value
+
+    def add_gauge(self, name: str, delta: float, **labels: Any) -> None:
+        """Move a gauge up or down, e.g. for in-flight requests"""
+        with self._lock:
+            self._gauges[_key(name, labels)] += delta
+
+    def observe(self, name: str, value: float, **labels: Any) -> None:
+        """Record one observation in a histogram"""
+        with self._lock:
+            self._histograms[_key(name, labels)].append(value)
+
+    def counter(self, name: str, **labels: Any) -> float:
+        """Current value of a counter"""
+        with self._lock:
+            return self._counters.get(_key(name, labels), 0)
+
+    def percentile(
+        self, name: str, q: float, min_count: int = 1, **labels: Any
+    ) -> Optional[float]:
+        """
+        Percentile of a histogram's recent observations.
+
+        Returns None while the histogram has fewer than `min_count` values.
+        """
+        with self._lock:
+            values = sorted(self._histograms.get(_key(name, labels), ()))
+        if not values or len(values) < min_count:
+            return None
+        return _percentile(values, q)
+
+    def ratio(self, numerator: str, denominator: str) -> float:
+        """Ratio of two unlabelled counters, 0.0 when the denominator is 0"""
+        total = self.counter(denominator)
+        return self.counter(numerator) / total if total else 0.0
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Counters, gauges and count, mean and percentiles of every histogram"""
+        with self._lock:
+            counters = dict(self._counters)
+            gauges = dict(self._gauges)
+            histograms = {
+                key: sorted(values) for key, values in self._histograms.items()
+            }
+
+        summaries = {}
+        for key, values in histograms.items():
+            if not values:
+                continue
+            summaries[key] = {
+                "count": len(values),
+                "mean": sum(values) / len(values),
+                "p50": _percentile(values, 50),
+                "p95": _percentile(values, 95),
+                "p99": _percentile(values, 99),
+                "max": values[-1],
+            }
+        return {"counters": counters, "gauges": gauges, "histograms": summaries}
+
+
+_metrics: Optional[MetricsRegistry] = None
+_metrics_lock = threading.Lock()
+
+
+def get_metrics() -> MetricsRegistry:
+    """Get the process-wide metrics registry"""
+    global _metrics
+    if _metrics is None:
+        with _metrics_lock:
+            if _metrics is None:
+                _metrics = MetricsRegistry()
+    return _metrics
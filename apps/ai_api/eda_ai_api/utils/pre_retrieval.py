@@ -0,0 +1,198 @@
+"""
+Speculative pre-retrieval for the manager agent.
+Runs the document, memory and global knowledge searches concurrently before
+the agent starts, so it can answer without spending steps on delegation.
+"""
+
+import asyncio
+from typing import Any, Dict, List
+
+from loguru import logger
+from smolagents.memory import ActionStep
+
+from eda_config.config import ConfigLoader
+from eda_ai_api.utils.memory_manager import get_vector_memory
+
+config = ConfigLoader.get_config()
+
+SOURCE_DOCUMENTS = "documents"
+SOURCE_MEMORY = "memory"
+SOURCE_GLOBAL_KNOWLEDGE = "global_knowledge"
+
+# Tool and sub-agent names the manager would call for each source
+SOURCE_CALL_NAMES = {
+    SOURCE_DOCUMENTS: ["document_search", "document_search_agent"],
+    SOURCE_MEMORY: ["memory_search", "memory_search_agent"],
+    SOURCE_GLOBAL_KNOWLEDGE: [
+        "global_knowledge_search",
+        "global_knowledge_agent",
+    ],
+}
+
+MAX_SNIPPET_LENGTH = 500
+
+
+def is_pre_retrieval_enabled(platform: str) -> bool:
+    """Check whether pre-retrieval is enabled for the given platform"""
+    return platform.lower() in config.services.ai_api.pre_retrieval_platforms
+
+
+async def pre_retrieve(
+    session_id: str, query: str, platform: str = "whatsapp"
+) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Run all three searches concurrently and keep results above the threshold.
+
+    Args:
+        session_id: User's platform ID
+        query: The current user message
+        platform: Platform identifier
+
+    Returns:
+        Dict mapping each source to its filtered results
+    """
+    ai_api_config = config.services.ai_api
+    memory = get_vector_memory()
+    limit = ai_api_config.pre_retrieval_limit
+
+    searches = {
+        SOURCE_DOCUMENTS: asyncio.to_thread(
+            memory.search_documents,
+            session_id=session_id,
+            query=query,
+            platform=platform,
+            limit=limit,
+        ),
+        SOURCE_MEMORY: asyncio.to_thread(
+            memory.search_conversations,
+            session_id=session_id,
+            query=query,
+            platform=platform,
+            limit=limit,
+        ),
+        SOURCE_GLOBAL_KNOWLEDGE: asyncio.to_thread(
+            memory.search_global_knowledge, query=query, limit=limit
+        ),
+    }
+
+    try:
+        results = await asyncio.wait_for(
+            asyncio.gather(*searches.values(), return_exceptions=True),
+            timeout=ai_api_config.pre_retrieval_timeout_seconds,
+        )
+    except asyncio.TimeoutError:
+        logger.warning(
+            f"Pre-retrieval timed out after "
+            f"{ai_api_config.pre_retrieval_timeout_seconds}s"
+        )
+        return {}
+
+    threshold = ai_api_config.pre_retrieval_similarity_threshold
+    retrieved = {}
+    for source, result in zip(searches.keys(), results):
+        if isinstance(result, Exception):
+            logger.warning(f"Pre-retrieval of {source} failed: {str(result)}")
+            continue
+        relevant = [r for r in result if r.get("similarity", 0) >= threshold]
+        if relevant:
+            retrieved[source] = relevant
+
+    if retrieved:
+        summary = ", ".join(f"{len(v)} {k}" for k, v in retrieved.items())
+        logger.info(f"Pre-retrieval kept {summary} results")
+    else:
+        logger.info("Pre-retrieval found nothing above the similarity threshold")
+    return retrieved
+
+
+def _snippet(text: str) -> str:
+    """Collapse whitespace and trim a result for the prompt"""
+    text = " ".join((text or "").split())
+    if len(text) > MAX_SNIPPET_LENGTH:
+        return text[:MAX_SNIPPET_LENGTH] + "..."
+    return text
+
+
+def format_pre_retrieval(retrieved: Dict[str, List[Dict[str, Any]]]) -> str:
+    """
+    Format pre-retrieved results compactly for the agent prompt.
+
+    Args:
+        retrieved: Results returned by pre_retrieve
+
+    Returns:
+        str: Prompt section, or an empty string when nothing was retrieved
+    """
+    sections = []
+
+    if retrieved.get(SOURCE_DOCUMENTS):
+        lines = ["User documents:"]
+        for result in retrieved[SOURCE_DOCUMENTS]:
+            metadata = result.get("metadata", {})
+            lines.append(
+                f"- [{metadata.get('source', 'Unknown')}, page "
+                f"{metadata.get('page', '?')}] {_snippet(result.get('content'))}"
+            )
+        sections.append("\n".join(lines))
+
+    if retrieved.get(SOURCE_MEMORY):
+        lines = ["Past conversations:"]
+        for result in retrieved[SOURCE_MEMORY]:
+            metadata = result.get("metadata", {})
+            lines.append(
+                f"- User: {_snippet(metadata.get('user_message'))} | "
+                f"Assistant: {_snippet(metadata.get('assistant_response'))}"
+            )
+        sections.append("\n".join(lines))
+
+    if retrieved.get(SOURCE_GLOBAL_KNOWLEDGE):
+        lines = ["Knowledge base:"]
+        for result in retrieved[SOURCE_GLOBAL_KNOWLEDGE]:
+            metadata = result.get("metadata", {})
+            lines.append(
+                f"- [{metadata.get('source', 'Unknown')}] "
+                f"{_snippet(result.get('content'))}"
+            )
+        sections.append("\n".join(lines))
+
+    return "\n\n".join(sections)
+
+
+def count_search_calls(agent: Any) -> Dict[str, int]:
+    """
+    Count how often the manager still called each search after the run.
+
+    Args:
+        agent: The manager agent after `run` has finished
+
+    Returns:
+        Dict mapping each source to the number of calls made by the agent
+    """
+    calls = {source: 0 for source in SOURCE_CALL_NAMES}
+    for step in agent.memory.steps:
+        if not isinstance(step, ActionStep) or not step.tool_calls:
+            continue
+        code = " ".join(str(tool_call.arguments) for tool_call in step.tool_calls)
+        for source, names in SOURCE_CALL_NAMES.items():
+            calls[source] += sum(code.count(f"{name}(") for name in names)
+    return calls
+
+
+def estimate_steps_saved(
+    retrieved: Dict[str, List[Dict[str, Any]]], agent: Any
+) -> int:
+    """
+    Estimate the agent steps saved by pre-retrieval.
+
+    Every pre-retrieved source the agent did not search again is counted as
+    one delegation step the agent would otherwise have spent.
+
+    Args:
+        retrieved: Results returned by pre_retrieve
+        agent: The manager agent after `run` has finished
+
+    Returns:
+        int: Estimated number of saved agent steps
+    """
+    calls = count_search_calls(agent)
+    return sum(1 for source in retrieved if calls.get(source, 0) == 0)
@@ -0,0 +1,107 @@
+"""
+Prompt cache instrumentation for the AI API.
+Tracks the static system prompt prefix and reports provider prompt-cache usage.
+"""
+
+import hashlib
+from typing import Any, Dict, Optional
+
+from loguru import logger
+from smolagents.memory import ActionStep
+
+# Hash of the last static prefix seen, used to detect prefix drift between requests
+_last_prefix_hash: Optional[str] = None
+
+
+def prefix_fingerprint(prefix: str) -> str:
+    """Return a short, stable fingerprint of a prompt prefix"""
+    return hashlib.sha256(prefix.encode("utf-8")).hexdigest()[:16]
+
+
+def log_prompt_layout(prefix: str, context: str) -> None:
+    """
+    Log the size of the cacheable prefix and the per-request context.
+
+    Args:
+        prefix: Static system prompt prefix shared by all requests
+        context: Per-user context appended after the prefix
+    """
+    global _last_prefix_hash
+
+    fingerprint = prefix_fingerprint(prefix)
+    stable = _last_prefix_hash is None or _last_prefix_hash == fingerprint
+    if not stable:
+        logger.warning(
+            f"Static prompt prefix changed ({_last_prefix_hash} -> {fingerprint}), "
+            "provider prompt cache will miss"
+        )
+    _last_prefix_hash = fingerprint
+
+    logger.info(
+        f"Prompt layout: prefix {len(prefix)} chars ({fingerprint}), "
+        f"context {len(context)} chars"
+    )
+
+
+def extract_cache_usage(raw_response: Any) -> Dict[str, Any]:
+    """
+    Extract prompt-cache usage from a LiteLLM completion response.
+
+    Handles OpenAI/Gemini style `prompt_tokens_details.cached_tokens`,
+    Anthropic style `cache_read_input_tokens`/`cache_creation_input_tokens`
+    and any cache related response headers exposed by the provider.
+
+    Args:
+        raw_response: Raw LiteLLM response stored on the ChatMessage
+
+    Returns:
+        Dict with prompt, cached and cache-write token counts plus cache headers
+    """
+    usage = getattr(raw_response, "usage", None)
+    if usage is None:
+        return {}
+
+    details = getattr(usage, "prompt_tokens_details", None)
+    cached_tokens = getattr(details, "cached_tokens", None) or 0
+    cached_tokens = cached_tokens or getattr(usage, "cache_read_input_tokens", 0) or 0
+
+    hidden_params = getattr(raw_response, "_hidden_params", None) or {}
+    headers = hidden_params.get("additional_headers") or {}
+    cache_headers = {
+        key: value for key, value in headers.items() if "cache" in key.lower()
+    }
+
+    return {
+        "prompt_tokens": getattr(usage, "prompt_tokens", 0) or 0,
+        "cached_tokens": cached_tokens,
+        "cache_write_tokens": getattr(usage, "cache_creation_input_tokens", 0)
+        or 0,
+        "cache_headers": cache_headers,
+    }
+
+
+def log_prompt_cache_usage(memory_step: Any) -> None:
+    """
+    Agent step callback that logs provider prompt-cache usage for each LLM call.
+
+    Args:
+        memory_step: The memory step produced by the agent
+    """
+    if not isinstance(memory_step, ActionStep):
+        return
+    message = memory_step.model_output_message
+    if message is None or message.raw is None:
+        return
+
+    usage = extract_cache_usage(message.raw)
+    if not usage:
+        return
+
+    prompt_tokens = usage["prompt_tokens"]
+    hit_ratio = usage["cached_tokens"] / prompt_tokens if prompt_tokens else 0.0
+    logger.info(
+        f"Prompt cache step {memory_step.step_number}: "
+        f"{usage['cached_tokens']}/{prompt_tokens} prompt tokens cached "
+        f"({hit_ratio:.0%}), {usage['cache_write_tokens']} written",
+        extra=usage,
+    )
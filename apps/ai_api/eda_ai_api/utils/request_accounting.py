@@ -0,0 +1,275 @@
+"""
+Per-request accounting for agent runs.
+Records every LLM call, tool call and step made while answering one message,
+enforces the configured per-request budgets and reports a summary.
+"""
+
+import threading
+import time
+import uuid
+from collections import defaultdict
+from dataclasses import dataclass
+from functools import wraps
+from typing import Any, Dict, List, Optional
+
+from loguru import logger
+from smolagents.memory import ActionStep
+from smolagents.models import ChatMessage, Model
+
+from eda_config.config import ConfigLoader
+from eda_ai_api.utils.metrics import get_metrics
+
+config = ConfigLoader.get_config()
+
+BUDGET_TOKENS = "tokens"
+BUDGET_TOOL_CALLS = "tool_calls"
+
+
+@dataclass
+class LLMCallRecord:
+    """One LLM call made by an agent"""
+
+    agent: str
+    model_id: str
+    latency: float
+    input_tokens: int
+    output_tokens: int
+
+
+@dataclass
+class ToolCallRecord:
+    """One tool call made by an agent"""
+
+    agent: str
+    tool: str
+    latency: float
+    output_chars: int
+    error: Optional[str] = None
+
+
+class AccountedModel(Model):
+    """Model wrapper that records each call in the request accounting"""
+
+    def __init__(self, model: Model, accounting: "RequestAccounting", agent: str):
+        super().__init__(model_id=model.model_id)
+        self.model = model
+        self.accounting = accounting
+        self.agent = agent
+
+    def generate(
+        self,
+        messages,
+        stop_sequences=None,
+        response_format=None,
+        tools_to_call_from=None,
+        **kwargs,
+    ) -> ChatMessage:
+        started_at = time.perf_counter()
+        message = self.model.generate(
+            messages,
+            stop_sequences=stop_sequences,
+            response_format=response_format,
+            tools_to_call_from=tools_to_call_from,
+            **kwargs,
+        )
+        token_usage = message.token_usage
+        self.accounting.record_llm_call(
+            LLMCallRecord(
+                agent=self.agent,
+                model_id=self.model_id,
+                latency=time.perf_counter() - started_at,
+                input_tokens=getattr(token_usage, "input_tokens", 0) or 0,
+                output_tokens=getattr(token_usage, "output_tokens", 0) or 0,
+            )
+        )
+        return message
+
+
+class RequestAccounting:
+    """
+    Collects the cost of answering one message across the manager and its
+    sub-agents.
+
+    Once a budget is exceeded every tracked agent is interrupted before its
+    next step and further tool calls are refused.
+    """
+
+    def __init__(self, session_id: str, request_id: Optional[str] = None):
+        ai_api_config = config.services.ai_api
+        self.session_id = session_id
+        self.request_id = request_id or str(uuid.uuid4())
+        self.max_tokens = ai_api_config.agent_max_tokens_per_request
+        self.max_tool_calls = ai_api_config.agent_max_tool_calls_per_request
+
+        self.llm_calls: List[LLMCallRecord] = []
+        self.tool_calls: List[ToolCallRecord] = []
+        self.steps: Dict[str, int] = defaultdict(int)
+        self.budget_exceeded: Optional[str] = None
+
+        self._agents: List[Any] = []
+        self._lock = threading.Lock()
+        self._started_at = time.perf_counter()
+
+    @property
+    def total_tokens(self) -> int:
+        return sum(c.input_tokens + c.output_tokens for c in self.llm_calls)
+
+    def track_agent(self, agent: Any, name: Optional[str] = None) -> None:
+        """
+        Record the LLM calls, tool calls and steps of an agent.
+
+        Managed agents are tracked by their own getters, so this does not
+        recurse into them.
+
+        Args:
+            agent: The agent to track
+            name: Name used in the summary (defaults to the agent's name)
+        """
+        name = name or agent.name or "manager"
+        self._agents.append(agent)
+        agent.model = AccountedModel(agent.model, self, name)
+
+        for tool_name, tool in agent.tools.items():
+            if tool_name != "final_answer":
+                self._wrap_tool(tool, name)
+
+        def record_step(memory_step: Any) -> None:
+            if not isinstance(memory_step, ActionStep):
+                return
+            with self._lock:
+                self.steps[name] += 1
+            # A sub-agent started after the budget ran out resets its switch
+            if self.budget_exceeded:
+                agent.interrupt()
+
+        agent.step_callbacks.append(record_step)
+
+    def _wrap_tool(self, tool: Any, agent_name: str) -> None:
+        """Record latency and output size of every call to a tool"""
+        forward = tool.forward
+
+        @wraps(forward)
+        def forward_with_accounting(*args, **kwargs):
+            if self.budget_exceeded:
+                raise RuntimeError(
+                    f"Request {self.budget_exceeded} budget exceeded, "
+                    "answer with the information gathered so far"
+                )
+            started_at = time.perf_counter()
+            output = None
+            error = None
+            try:
+                output = forward(*args, **kwargs)
+                return output
+            except Exception as e:
+                error = str(e)
+                raise
+            finally:
+                self.record_tool_call(
+                    ToolCallRecord(
+                        agent=agent_name,
+                        tool=tool.name,
+                        latency=time.perf_counter() - started_at,
+                        output_chars=len(str(output)) if output is not None else 0,
+                        error=error,
+                    )
+                )
+
+        tool.forward = forward_with_accounting
+
+    def record_llm_call(self, record: LLMCallRecord) -> None:
+        with self._lock:
+            self.llm_calls.append(record)
+        if self.max_tokens and self.total_tokens > self.max_tokens:
+            self._exceed(BUDGET_TOKENS)
+
+    def record_tool_call(self, record: ToolCallRecord) -> None:
+        with self._lock:
+            self.tool_calls.append(record)
+        get_metrics().observe("tool_latency_seconds", record.latency, tool=record.tool)
+        if self.max_tool_calls and len(self.tool_calls) >= self.max_tool_calls:
+            self._exceed(BUDGET_TOOL_CALLS)
+
+    def _exceed(self, budget: str) -> None:
+        """Stop every tracked agent once a budget is used up"""
+        if self.budget_exceeded:
+            return
+        self.budget_exceeded = budget
+        logger.warning(
+            f"Request {self.request_id} exceeded its {budget} budget, "
+            "interrupting agents"
+        )
+        get_metrics().increment("request_budget_exceeded", budget=budget)
+        for agent in self._agents:
+            agent.interrupt()
+
+    def summary(self) -> Dict[str, Any]:
+        """Aggregate the recorded calls per agent and per tool"""
+        with self._lock:
+            llm_calls = list(self.llm_calls)
+            tool_calls = list(self.tool_calls)
+            steps = dict(self.steps)
+
+        llm_by_agent: Dict[str, Dict[str, float]] = defaultdict(
+            lambda: defaultdict(float)
+        )
+        for call in llm_calls:
+            agent = llm_by_agent[call.agent]
+            agent["calls"] += 1
+            agent["latency"] += call.latency
+            agent["input_tokens"] += call.input_tokens
+            agent["output_tokens"] += call.output_tokens
+
+        tools: Dict[str, Dict[str, float]] = defaultdict(lambda: defaultdict(float))
+        for call in tool_calls:
+            tool = tools[call.tool]
+            tool["calls"] += 1
+            tool["latency"] += call.latency
+            tool["output_chars"] += call.output_chars
+            tool["errors"] += 1 if call.error else 0
+
+        return {
+            "request_id": self.request_id,
+            "session_id": self.session_id,
+            "duration": time.perf_counter() - self._started_at,
+            "steps": steps,
+            "total_steps": sum(steps.values()),
+            "llm_calls": len(llm_calls),
+            "input_tokens": sum(c.input_tokens for c in llm_calls),
+            "output_tokens": sum(c.output_tokens for c in llm_calls),
+            "llm_latency": sum(c.latency for c in llm_calls),
+            "llm_by_agent": {k: dict(v) for k, v in llm_by_agent.items()},
+            "tool_calls": len(tool_calls),
+            "tool_latency": sum(c.latency for c in tool_calls),
+            "tools": {k: dict(v) for k, v in tools.items()},
+            "budget_exceeded": self.budget_exceeded,
+        }
+
+    def finish(self) -> Dict[str, Any]:
+        """Log the structured summary and export it to metrics"""
+        summary = self.summary()
+        metrics = get_metrics()
+        metrics.observe("request_duration_seconds", summary["duration"])
+        metrics.observe("request_steps", summary["total_steps"])
+        metrics.observe("request_llm_calls", summary["llm_calls"])
+        metrics.observe("request_input_tokens", summary["input_tokens"])
+        metrics.observe("request_output_tokens", summary["output_tokens"])
+        metrics.observe("request_tool_calls", summary["tool_calls"])
+        for agent, usage in summary["llm_by_agent"].items():
+            metrics.increment("agent_llm_calls", usage["calls"], agent=agent)
+            metrics.increment(
+                "agent_tokens",
+                usage["input_tokens"] + usage["output_tokens"],
+                agent=agent,
+            )
+
+        logger.info(
+            f"Request {self.request_id} accounting: "
+            f"{summary['duration']:.2f}s, {summary['total_steps']} steps "
+            f"({', '.join(f'{k}={v}' for k, v in summary['steps'].items())}), "
+            f"{summary['llm_calls']} LLM calls ({summary['llm_latency']:.2f}s, "
+            f"{summary['input_tokens']} in / {summary['output_tokens']} out tokens), "
+            f"{summary['tool_calls']} tool calls ({summary['tool_latency']:.2f}s)",
+            extra={"accounting": summary},
+        )
+        return summary
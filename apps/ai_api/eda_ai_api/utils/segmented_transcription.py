@@ -0,0 +1,198 @@
+"""
+Segmented transcription of long audio.
+Recordings are cut at pauses into segments of bounded length, the segments
+are transcribed concurrently and their text is stitched back in order, so
+latency no longer grows with the length of the recording and uploads stay
+under provider size limits.
+"""
+
+import asyncio
+import time
+import weakref
+from dataclasses import dataclass
+from typing import Callable, List, Optional, Tuple
+
+from loguru import logger
+
+from eda_config.config import ConfigLoader
+from eda_ai_api.utils.audio_converter import (
+    PCM_BYTES_PER_SECOND,
+    PCM_INPUT_OPTIONS,
+    PCM_SAMPLE_RATE,
+    decode_with_silences,
+    transcode_for_transcription,
+)
+from eda_ai_api.utils.transcriber import transcribe_audio
+
+config = ConfigLoader.get_config()
+
+
+@dataclass
+class SegmentTranscript:
+    """Transcript of one segment, reported as soon as it is ready"""
+
+    index: int
+    total: int
+    start: float
+    end: float
+    text: str
+
+
+# Receives each segment's transcript in completion order
+SegmentCallback = Callable[[SegmentTranscript], None]
+
+# One semaphore per event loop, an asyncio.Semaphore cannot be shared between
+# loops
+_semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]"
+_semaphores = weakref.WeakKeyDictionary()
+
+
+def _get_semaphore() -> asyncio.Semaphore:
+    """Limit the number of segments being transcribed at once on this loop"""
+    loop = asyncio.get_running_loop()
+    semaphore = _semaphores.get(loop)
+    if semaphore is None:
+        semaphore = asyncio.Semaphore(
+            config.services.ai_api.transcription_segment_max_concurrency
+        )
+        _semaphores[loop] = semaphore
+    return semaphore
+
+
+def should_segment(content: bytes) -> bool:
+    """Check whether audio is long enough to be transcribed in segments"""
+    ai_api_config = config.services.ai_api
+    return (
+        ai_api_config.transcription_segmentation_enabled
+        and len(content) >= ai_api_config.transcription_segment_threshold_bytes
+    )
+
+
+def plan_segments(
+    silences: List[Tuple[float, float]],
+    duration: float,
+    max_seconds: float,
+    min_seconds: float,
+) -> List[Tuple[float, float]]:
+    """
+    Choose where to cut audio into segments.
+
+    Each segment ends in the middle of the last pause that keeps it between
+    min_seconds and max_seconds long, or at max_seconds when there is no
+    such pause. Segments that are entirely silent are left out, Whisper
+    tends to invent text for them.
+
+    Args:
+        silences: (start, end) seconds of each pause, in order
+        duration: Length of the audio in seconds
+        max_seconds: Longest segment
+        min_seconds: Shortest segment cut at a pause
+
+    Returns:
+        (start, end) seconds of each segment, in order
+    """
+    midpoints = [(start + end) / 2 for start, end in silences]
+
+    cuts = []
+    start = 0.0
+    while duration - start > max_seconds:
+        candidates = [
+            point
+            for point in midpoints
+            if start + min_seconds < point <= start + max_seconds
+        ]
+        start = candidates[-1] if candidates else start + max_seconds
+        cuts.append(start)
+
+    bounds = [0.0, *cuts, duration]
+    return [
+        (start, end)
+        for start, end in zip(bounds, bounds[1:])
+        if end > start
+        and not any(
+            silence_start <= start and end <= silence_end
+            for silence_start, silence_end in silences
+        )
+    ]
+
+
+def _pcm_offset(seconds: float) -> int:
+    """Byte offset of a time in PCM audio, aligned to a sample"""
+    # Two bytes per 16-bit mono sample
+    return int(seconds * PCM_SAMPLE_RATE) * 2
+
+
+async def transcribe_segmented(
+    content: bytes,
+    language: str = "en",
+    on_segment: Optional[SegmentCallback] = None,
+) -> str:
+    """
+    Transcribe long audio as concurrently transcribed segments.
+
+    Args:
+        content: Audio in any format ffmpeg can read
+        language: Language code
+        on_segment: Called with each segment's transcript as it finishes,
+            to stream partial transcripts
+
+    Returns:
+        str: The segment transcripts joined in order
+    """
+    ai_api_config = config.services.ai_api
+    started_at = time.perf_counter()
+
+    pcm, silences = await decode_with_silences(
+        content,
+        noise_db=ai_api_config.transcription_silence_noise_db,
+        min_silence_seconds=ai_api_config.transcription_silence_min_seconds,
+    )
+    duration = len(pcm) / PCM_BYTES_PER_SECOND
+    segments = plan_segments(
+        silences,
+        duration,
+        max_seconds=ai_api_config.transcription_segment_max_seconds,
+        min_seconds=ai_api_config.transcription_segment_min_seconds,
+    )
+
+    async def transcribe_segment(index: int) -> SegmentTranscript:
+        start, end = segments[index]
+        async with _get_semaphore():
+            audio = await transcode_for_transcription(
+                pcm[_pcm_offset(start) : _pcm_offset(end)],
+                input_options=PCM_INPUT_OPTIONS,
+            )
+            text = await transcribe_audio(
+                audio, language=language, filename=f"segment_{index}.ogg"
+            )
+        return SegmentTranscript(
+            index=index,
+            total=len(segments),
+            start=start,
+            end=end,
+            text=(text or "").strip(),
+        )
+
+    tasks = [
+        asyncio.create_task(transcribe_segment(index))
+        for index in range(len(segments))
+    ]
+    transcripts: List[Optional[SegmentTranscript]] = [None] * len(segments)
+    try:
+        for finished in asyncio.as_completed(tasks):
+            transcript = await finished
+            transcripts[transcript.index] = transcript
+            if on_segment:
+                on_segment(transcript)
+    finally:
+        # One failed segment fails the transcription, stop the others
+        for task in tasks:
+            task.cancel()
+
+    logger.info(
+        f"Transcribed {duration:.1f}s of audio as {len(segments)} segments "
+        f"in {time.perf_counter() - started_at:.2f}s"
+    )
+    return " ".join(
+        transcript.text for transcript in transcripts if transcript.text
+    )
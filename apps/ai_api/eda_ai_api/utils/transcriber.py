@@ -1,36 +1,202 @@
-from groq import Groq
+"""
+Speech-to-text backends.
+`transcription_backend` selects Groq's hosted Whisper or a local CPU Whisper
+(faster-whisper, int8 quantized) per deployment.
+"""
+
+import asyncio
+import io
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Dict, Optional, Type
+
+from groq import AsyncGroq
 from loguru import logger
 from eda_config.config import ConfigLoader
+from eda_ai_api.utils.metrics import get_metrics
 
 config = ConfigLoader.get_config()
 
+BACKEND_GROQ = "groq"
+BACKEND_LOCAL = "local"
+
+
+class Transcriber(ABC):
+    """A speech-to-text backend"""
+
+    name: str
+
+    @abstractmethod
+    async def transcribe(self, audio: bytes, language: str, filename: str) -> str:
+        """
+        Transcribe audio content.
+
+        Args:
+            audio: Audio file content
+            language: Language code
+            filename: Name of the file, its extension tells the format
+
+        Returns:
+            str: Transcribed text
+        """
+
+    async def close(self) -> None:
+        """Release connections or models held by the backend"""
+
 
-def transcribe_audio(audio_path: str, language: str = "en") -> str:
+class GroqTranscriber(Transcriber):
     """
-    Transcribe audio file using Groq's Whisper API.
+    Groq's hosted Whisper API.
+
+    One async client is kept for the life of the process so its pooled
+    connections (and their TLS sessions) are reused across requests. Each
+    attempt is bounded by `transcription_timeout_seconds`; connection errors,
+    timeouts, 408, 409, 429 and 5xx responses are retried with exponential
+    backoff up to `transcription_max_retries` times, honouring Retry-After.
+    """
+
+    name = BACKEND_GROQ
+
+    def __init__(self):
+        ai_api_config = config.services.ai_api
+        self._client = AsyncGroq(
+            api_key=config.api_keys.groq,
+            timeout=ai_api_config.transcription_timeout_seconds,
+            max_retries=ai_api_config.transcription_max_retries,
+        )
+
+    async def transcribe(self, audio: bytes, language: str, filename: str) -> str:
+        transcription = await self._client.audio.transcriptions.create(
+            file=(filename, audio),
+            model=config.services.ai_api.transcription_groq_model,
+            response_format="json",
+            language=language,  # <--- enable language parameter
+        )
+        return transcription.text
+
+    async def close(self) -> None:
+        await self._client.close()
+
+
+class LocalWhisperTranscriber(Transcriber):
+    """
+    Whisper on the CPU through faster-whisper (CTranslate2).
+
+    The model is loaded on first use. Requires the `local-transcription`
+    extra (`pip install faster-whisper`).
+    """
+
+    name = BACKEND_LOCAL
+
+    def __init__(self):
+        self._model = None
+        self._lock = threading.Lock()
+
+    def _get_model(self):
+        if self._model is None:
+            with self._lock:
+                if self._model is None:
+                    try:
+                        from faster_whisper import WhisperModel
+                    except ImportError as e:
+                        raise RuntimeError(
+                            "The local transcription backend needs faster-whisper, "
+                            "install the local-transcription extra"
+                        ) from e
+
+                    ai_api_config = config.services.ai_api
+                    logger.info(
+                        f"Loading local Whisper model "
+                        f"{ai_api_config.transcription_local_model} "
+                        f"({ai_api_config.transcription_local_compute_type})"
+                    )
+                    self._model = WhisperModel(
+                        ai_api_config.transcription_local_model,
+                        device="cpu",
+                        compute_type=ai_api_config.transcription_local_compute_type,
+                        cpu_threads=ai_api_config.transcription_local_cpu_threads,
+                    )
+        return self._model
+
+    def _transcribe(self, audio: bytes, language: str) -> str:
+        segments, _ = self._get_model().transcribe(
+            io.BytesIO(audio),
+            language=language,
+            beam_size=config.services.ai_api.transcription_local_beam_size,
+            vad_filter=True,
+        )
+        # Segments are decoded lazily while iterating
+        return " ".join(segment.text.strip() for segment in segments).strip()
+
+    async def transcribe(self, audio: bytes, language: str, filename: str) -> str:
+        # CPU bound, keep it off the event loop
+        return await asyncio.to_thread(self._transcribe, audio, language)
+
+
+TRANSCRIBERS: Dict[str, Type[Transcriber]] = {
+    BACKEND_GROQ: GroqTranscriber,
+    BACKEND_LOCAL: LocalWhisperTranscriber,
+}
+
+_transcriber: Optional[Transcriber] = None
+
+
+def get_transcriber() -> Transcriber:
+    """Get the process-wide transcriber selected by `transcription_backend`"""
+    global _transcriber
+    if _transcriber is None:
+        backend = config.services.ai_api.transcription_backend
+        if backend not in TRANSCRIBERS:
+            raise ValueError(
+                f"Unknown transcription backend {backend}, "
+                f"expected one of {', '.join(TRANSCRIBERS)}"
+            )
+        _transcriber = TRANSCRIBERS[backend]()
+        logger.info(f"Using {backend} transcription backend")
+    return _transcriber
+
+
+async def close_transcriber() -> None:
+    """Close the process-wide transcriber on shutdown"""
+    global _transcriber
+    if _transcriber is not None:
+        await _transcriber.close()
+        _transcriber = None
+
+
+async def transcribe_audio(
+    audio: str | bytes, language: str = "en", filename: str = "audio.mp3"
+) -> str:
+    """
+    Transcribe audio with the configured backend.
 
     Args:
-        audio_path: Path to the audio file
+        audio: Path to the audio file or its content
         language: Language code (default: "en")
+        filename: Name sent with in-memory content, its extension tells the
+            backend the format
 
     Returns:
         str: Transcribed text
     """
+    metrics = get_metrics()
+    backend = config.services.ai_api.transcription_backend
     try:
-        # Create client with API key from config
-        client = Groq(api_key=config.api_keys.groq)
-
-        with open(audio_path, "rb") as file:
-            transcription = client.audio.transcriptions.create(
-                file=(audio_path, file.read()),
-                model="whisper-large-v3-turbo",
-                response_format="json",
-                language=language,  # <--- enable language parameter
-            )
+        if isinstance(audio, str):
+            with open(audio, "rb") as file:
+                audio, filename = file.read(), audio
 
-            logger.info(f"Transcription result: {transcription.text}")
-            return transcription.text
+        metrics.observe("transcription_upload_bytes", len(audio), backend=backend)
+        started_at = time.perf_counter()
+        text = await get_transcriber().transcribe(audio, language, filename)
+        metrics.observe(
+            "transcription_seconds", time.perf_counter() - started_at, backend=backend
+        )
+        logger.info(f"Transcription result: {text}")
+        return text
 
     except Exception as e:
+        metrics.increment("transcription_errors", backend=backend)
         logger.error(f"Error transcribing audio: {str(e)}")
         raise RuntimeError(f"Transcription failed: {str(e)}") from e
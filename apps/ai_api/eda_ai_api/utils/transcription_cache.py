@@ -0,0 +1,133 @@
+"""
+Transcription cache for forwarded voice notes.
+Transcripts are keyed by a hash of the audio content and the language, kept
+in an in-memory LRU in front of a small SQLite store shared by all workers.
+"""
+
+import hashlib
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+from loguru import logger
+
+from eda_config.config import ConfigLoader
+from eda_ai_api.utils.metrics import get_metrics
+
+config = ConfigLoader.get_config()
+
+TIER_MEMORY = "memory"
+TIER_DISK = "disk"
+
+
+def is_transcription_cache_enabled() -> bool:
+    """Check whether transcripts are cached"""
+    return config.services.ai_api.transcription_cache_enabled
+
+
+def transcription_cache_key(audio: bytes, language: str) -> str:
+    """
+    Cache key of a transcript.
+    Includes the backend so switching backends does not serve old transcripts.
+    """
+    digest = hashlib.sha256(audio).hexdigest()
+    return f"{digest}:{language}:{config.services.ai_api.transcription_backend}"
+
+
+class TranscriptionCache:
+    """Two-tier LRU cache of transcripts"""
+
+    def __init__(self, path: str, memory_entries: int, disk_entries: int):
+        self.path = path
+        self.memory_entries = memory_entries
+        self.disk_entries = disk_entries
+        self._memory: "OrderedDict[str, str]" = OrderedDict()
+        self._lock = threading.Lock()
+        with self._connect() as db:
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS transcriptions ("
+                "key TEXT PRIMARY KEY, text TEXT NOT NULL, accessed_at REAL NOT NULL)"
+            )
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """Open a connection for one transaction, calls come from any thread"""
+        db = sqlite3.connect(self.path, timeout=5)
+        try:
+            with db:
+                yield db
+        finally:
+            db.close()
+
+    def _remember(self, key: str, text: str) -> None:
+        with self._lock:
+            self._memory[key] = text
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.memory_entries:
+                self._memory.popitem(last=False)
+
+    def get(self, key: str) -> Optional[str]:
+        """Look a transcript up in memory, then on disk"""
+        metrics = get_metrics()
+        metrics.increment("transcription_cache_lookups")
+
+        with self._lock:
+            text = self._memory.get(key)
+            if text is not None:
+                self._memory.move_to_end(key)
+        if text is not None:
+            metrics.increment("transcription_cache_hits", tier=TIER_MEMORY)
+            return text
+
+        with self._connect() as db:
+            row = db.execute(
+                "SELECT text FROM transcriptions WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            db.execute(
+                "UPDATE transcriptions SET accessed_at = ? WHERE key = ?",
+                (time.time(), key),
+            )
+        metrics.increment("transcription_cache_hits", tier=TIER_DISK)
+        self._remember(key, row[0])
+        return row[0]
+
+    def put(self, key: str, text: str) -> None:
+        """Store a transcript in both tiers, evicting the least recently used"""
+        self._remember(key, text)
+        with self._connect() as db:
+            db.execute(
+                "INSERT OR REPLACE INTO transcriptions (key, text, accessed_at) "
+                "VALUES (?, ?, ?)",
+                (key, text, time.time()),
+            )
+            db.execute(
+                "DELETE FROM transcriptions WHERE key NOT IN ("
+                "SELECT key FROM transcriptions ORDER BY accessed_at DESC LIMIT ?)",
+                (self.disk_entries,),
+            )
+
+
+_cache: Optional[TranscriptionCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_transcription_cache() -> TranscriptionCache:
+    """Get the process-wide transcription cache"""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                ai_api_config = config.services.ai_api
+                _cache = TranscriptionCache(
+                    path=ai_api_config.transcription_cache_path,
+                    memory_entries=ai_api_config.transcription_cache_memory_entries,
+                    disk_entries=ai_api_config.transcription_cache_disk_entries,
+                )
+                logger.info(f"Transcription cache initialized at {_cache.path}")
+    return _cache
@@ -0,0 +1,148 @@
+"""
+Content-addressed cache of synthesized speech.
+Audio is stored on disk under a hash of the text and every voice parameter,
+so repeated phrases such as the bridge's status and error messages skip
+Google Cloud TTS. The least recently used audio is evicted once the cache
+outgrows `tts_cache_max_bytes`.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from typing import List, Optional
+
+from loguru import logger
+
+from eda_config.config import ConfigLoader
+from eda_ai_api.utils.metrics import get_metrics
+
+config = ConfigLoader.get_config()
+
+AUDIO_SUFFIX = ".audio"
+
+
+def is_tts_cache_enabled() -> bool:
+    """Check whether synthesized audio is cached"""
+    return config.services.ai_api.tts_cache_enabled
+
+
+def tts_cache_key(
+    text: str,
+    language_code: str,
+    voice_name: str,
+    audio_encoding: str,
+    pitch: float,
+    speaking_rate: float,
+    effects_profile_id: List[str],
+) -> str:
+    """Cache key of synthesized audio, every parameter changes the output"""
+    payload = json.dumps(
+        [
+            text,
+            language_code,
+            voice_name,
+            audio_encoding,
+            float(pitch),
+            float(speaking_rate),
+            list(effects_profile_id or []),
+        ],
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class TTSCache:
+    """
+    Size-capped on-disk LRU of synthesized audio.
+    File modification times record the last use, so the cache directory can
+    be shared by several workers.
+    """
+
+    def __init__(self, directory: str, max_bytes: int):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}{AUDIO_SUFFIX}")
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Read cached audio, marking it as recently used"""
+        metrics = get_metrics()
+        metrics.increment("tts_cache_lookups")
+
+        path = self._path(key)
+        try:
+            with open(path, "rb") as file:
+                audio = file.read()
+            os.utime(path)
+        except FileNotFoundError:
+            audio = None
+
+        if audio is not None:
+            metrics.increment("tts_cache_hits")
+            metrics.increment("tts_cache_bytes_saved", len(audio))
+        logger.debug(
+            f"TTS cache {'hit' if audio is not None else 'miss'} "
+            f"(hit rate {metrics.ratio('tts_cache_hits', 'tts_cache_lookups'):.1%}, "
+            f"{metrics.counter('tts_cache_bytes_saved'):.0f} bytes saved)"
+        )
+        return audio
+
+    def put(self, key: str, audio: bytes) -> None:
+        """Store audio, then evict the least recently used past the size cap"""
+        # Write then rename so readers never see a partial file
+        fd, temp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as file:
+                file.write(audio)
+            os.replace(temp_path, self._path(key))
+        except Exception:
+            os.unlink(temp_path)
+            raise
+        self._evict()
+
+    def _evict(self) -> None:
+        with self._lock:
+            entries = []
+            for entry in os.scandir(self.directory):
+                if not entry.name.endswith(AUDIO_SUFFIX):
+                    continue
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+
+            total = sum(size for _, size, _ in entries)
+            for _, size, path in sorted(entries):
+                if total <= self.max_bytes:
+                    break
+                try:
+                    os.unlink(path)
+                except FileNotFoundError:
+                    # Already evicted by another worker
+                    pass
+                total -= size
+
+
+_cache: Optional[TTSCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_tts_cache() -> TTSCache:
+    """Get the process-wide TTS cache"""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                ai_api_config = config.services.ai_api
+                _cache = TTSCache(
+                    directory=ai_api_config.tts_cache_dir,
+                    max_bytes=ai_api_config.tts_cache_max_bytes,
+                )
+                logger.info(f"TTS cache initialized at {_cache.directory}")
+    return _cache
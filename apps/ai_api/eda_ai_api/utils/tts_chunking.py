@@ -0,0 +1,123 @@
+"""
+Long-form text-to-speech helpers.
+Text is split on sentence boundaries into chunks under the provider limit,
+and the audio synthesized for each chunk is joined back into one file of
+the requested encoding.
+"""
+
+import re
+import struct
+from typing import List, Optional
+
+from eda_ai_api.utils.audio_converter import build_ffmpeg_args, run_ffmpeg
+
+# End of a sentence followed by whitespace, or a line break
+SENTENCE_BOUNDARY = re.compile(r"(?<=[.!?…;:])\s+|\n+")
+
+# Google Cloud TTS wraps these encodings in a WAV header
+WAV_ENCODINGS = {"LINEAR16", "MULAW", "ALAW"}
+
+
+def _split_long_sentence(sentence: str, max_chars: int) -> List[str]:
+    """Split a sentence longer than max_chars at word boundaries"""
+    parts = []
+    while len(sentence) > max_chars:
+        cut = sentence.rfind(" ", 0, max_chars + 1)
+        if cut <= 0:
+            cut = max_chars
+        parts.append(sentence[:cut].strip())
+        sentence = sentence[cut:].strip()
+    if sentence:
+        parts.append(sentence)
+    return parts
+
+
+def split_text(
+    text: str, max_chars: int, first_chunk_max_chars: Optional[int] = None
+) -> List[str]:
+    """
+    Split text into chunks of whole sentences.
+
+    Args:
+        text: Text to synthesize
+        max_chars: Longest chunk, below the provider's request limit
+        first_chunk_max_chars: Longest first chunk; a short first chunk is
+            synthesized sooner, lowering time to first audio
+
+    Returns:
+        Chunks in order, sentences longer than max_chars are split at words
+    """
+    sentences = []
+    for sentence in SENTENCE_BOUNDARY.split(text.strip()):
+        sentences.extend(_split_long_sentence(sentence.strip(), max_chars))
+
+    chunks: List[str] = []
+    current = ""
+    for sentence in sentences:
+        limit = max_chars
+        if not chunks and first_chunk_max_chars:
+            limit = min(first_chunk_max_chars, max_chars)
+        candidate = f"{current} {sentence}" if current else sentence
+        if current and len(candidate) > limit:
+            chunks.append(current)
+            current = sentence
+        else:
+            current = candidate
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def _wav_chunks(data: bytes) -> dict:
+    """Map the ids of a WAV file's RIFF chunks to their payloads"""
+    if data[:4] != b"RIFF" or data[8:12] != b"WAVE":
+        raise ValueError("Audio is not a WAV file")
+    chunks = {}
+    offset = 12
+    while offset + 8 <= len(data):
+        chunk_id = data[offset : offset + 4]
+        size = struct.unpack("<I", data[offset + 4 : offset + 8])[0]
+        chunks.setdefault(chunk_id, data[offset + 8 : offset + 8 + size])
+        # Chunks are padded to an even size
+        offset += 8 + size + (size & 1)
+    return chunks
+
+
+def join_wav(parts: List[bytes]) -> bytes:
+    """Join WAV files with the same format into one"""
+    fmt = _wav_chunks(parts[0])[b"fmt "]
+    samples = b"".join(_wav_chunks(part)[b"data"] for part in parts)
+    body = (
+        b"WAVE"
+        + b"fmt "
+        + struct.pack("<I", len(fmt))
+        + fmt
+        + b"data"
+        + struct.pack("<I", len(samples))
+        + samples
+    )
+    return b"RIFF" + struct.pack("<I", len(body)) + body
+
+
+async def join_audio(parts: List[bytes], encoding_name: str) -> bytes:
+    """
+    Join audio synthesized chunk by chunk into one file.
+
+    Args:
+        parts: Audio of each chunk, in order
+        encoding_name: Google Cloud TTS encoding of the parts
+
+    Returns:
+        bytes: One file of the same encoding
+    """
+    if len(parts) == 1:
+        return parts[0]
+    if encoding_name in WAV_ENCODINGS:
+        return join_wav(parts)
+    if encoding_name == "OGG_OPUS":
+        # Concatenated Ogg files form a chained stream that many players
+        # stop after the first link of; remuxing makes it a single stream
+        args = build_ffmpeg_args("ogg", input_options={"format": "ogg"}, acodec="copy")
+        return await run_ffmpeg(b"".join(parts), args)
+    # MP3 frames are self-contained
+    return b"".join(parts)
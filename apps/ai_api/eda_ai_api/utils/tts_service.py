@@ -1,6 +1,20 @@
+import asyncio
 import tempfile
 import os
-from typing import Optional, List, Tuple
+import time
+import weakref
+from dataclasses import dataclass
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    Optional,
+    List,
+    Tuple,
+)
+from google.api_core import exceptions as google_exceptions
 from google.cloud import texttospeech
 from google.oauth2 import service_account
 from loguru import logger
@@ -11,12 +25,61 @@ from eda_ai_api.utils.exceptions import (
     ServiceUnavailableError,
     ValidationError,
 )
+from eda_ai_api.utils.tts_cache import (
+    get_tts_cache,
+    is_tts_cache_enabled,
+    tts_cache_key,
+)
+from eda_ai_api.utils.tts_chunking import join_audio, split_text
 
 config = ConfigLoader.get_config()
 
+# Errors after which the gRPC channel is rebuilt and the call retried once
+RECONNECT_ERRORS = (
+    google_exceptions.ServiceUnavailable,
+    google_exceptions.DeadlineExceeded,
+)
+
+# How long a health probe result is reused, so frequent polling does not
+# turn into one voice listing per poll
+HEALTH_CACHE_SECONDS = 5.0
+
+
+@dataclass
+class SynthesizedChunk:
+    """Audio of one chunk of long text"""
+
+    index: int
+    total: int
+    audio: bytes
+    file_extension: str
+
+
+# One semaphore per event loop, an asyncio.Semaphore cannot be shared between
+# loops
+_chunk_semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]"
+_chunk_semaphores = weakref.WeakKeyDictionary()
+
+
+def _get_chunk_semaphore() -> asyncio.Semaphore:
+    """Limit the number of chunks being synthesized at once on this loop"""
+    loop = asyncio.get_running_loop()
+    semaphore = _chunk_semaphores.get(loop)
+    if semaphore is None:
+        semaphore = asyncio.Semaphore(
+            config.services.ai_api.tts_chunk_max_concurrency
+        )
+        _chunk_semaphores[loop] = semaphore
+    return semaphore
+
 
 class TTSService:
-    """Text-to-Speech service using Google Cloud TTS with improved error handling"""
+    """
+    Text-to-Speech service using Google Cloud TTS with improved error handling.
+
+    One instance lives for the whole process (see get_tts_service), so the
+    async client and its gRPC channel are built once and reused.
+    """
 
     def __init__(self):
         """Initialize TTS service with configuration"""
@@ -26,6 +89,8 @@ class TTSService:
         # Don't check credentials immediately - do it lazily when needed
         self._credentials_checked = False
         self._credentials_available = False
+        self._health: Optional[Dict[str, Any]] = None
+        self._health_checked_at = 0.0
 
     def _is_tts_enabled(self) -> bool:
         """
@@ -71,12 +136,12 @@ class TTSService:
             self._credentials_checked = True
             return False
 
-    def _get_client(self) -> texttospeech.TextToSpeechClient:
+    def _get_client(self) -> texttospeech.TextToSpeechAsyncClient:
         """
         Get or create TTS client with lazy initialization
 
         Returns:
-            TextToSpeechClient: Configured TTS client
+            TextToSpeechAsyncClient: Configured TTS client
 
         Raises:
             ServiceUnavailableError: If TTS service is not available
@@ -108,7 +173,7 @@ class TTSService:
                             service_account_path
                         )
                     )
-                    self.client = texttospeech.TextToSpeechClient(
+                    self.client = texttospeech.TextToSpeechAsyncClient(
                         credentials=credentials
                     )
                     logger.info(
@@ -116,7 +181,7 @@ class TTSService:
                     )
                 else:
                     # Fallback to default credentials
-                    self.client = texttospeech.TextToSpeechClient()
+                    self.client = texttospeech.TextToSpeechAsyncClient()
                     logger.info(
                         "Google Cloud TTS client initialized with default credentials"
                     )
@@ -129,6 +194,88 @@ class TTSService:
 
         return self.client
 
+    async def _reset_client(self) -> None:
+        """Drop the client so the next call opens a fresh channel"""
+        client, self.client = self.client, None
+        if client is not None:
+            try:
+                await client.transport.close()
+            except Exception as e:
+                logger.debug(f"Error closing TTS channel: {str(e)}")
+
+    async def _call(
+        self,
+        call: Callable[[texttospeech.TextToSpeechAsyncClient], Awaitable[Any]],
+    ) -> Any:
+        """Run a client call, reconnecting once if the channel has failed"""
+        try:
+            return await call(self._get_client())
+        except RECONNECT_ERRORS as e:
+            logger.warning(f"TTS call failed, reconnecting: {str(e)}")
+            await self._reset_client()
+            return await call(self._get_client())
+
+    async def start(self) -> None:
+        """Build the client and open its channel ahead of the first request"""
+        if not self._is_tts_enabled():
+            return
+        health = await self.check_health()
+        if health["healthy"]:
+            logger.info(f"TTS client ready in {health['latency_ms']:.0f}ms")
+        else:
+            logger.warning(f"TTS client not ready: {health['error']}")
+
+    async def check_health(self) -> Dict[str, Any]:
+        """
+        Probe Google Cloud TTS with a cheap voice listing
+
+        The probe only reports: it never closes the shared channel, which
+        requests in flight may still be using. Reconnecting is left to the
+        retry in _call. Results are reused for HEALTH_CACHE_SECONDS.
+
+        Returns:
+            Dict with enabled, healthy, latency_ms and error
+        """
+        if not self._is_tts_enabled():
+            return {
+                "enabled": False,
+                "healthy": False,
+                "latency_ms": None,
+                "error": None,
+            }
+
+        if (
+            self._health is not None
+            and time.monotonic() - self._health_checked_at < HEALTH_CACHE_SECONDS
+        ):
+            return self._health
+
+        started_at = time.perf_counter()
+        try:
+            await self._get_client().list_voices(
+                language_code=self.tts_config.language_code,
+                timeout=config.services.ai_api.tts_timeout_seconds,
+            )
+            health = {
+                "enabled": True,
+                "healthy": True,
+                "latency_ms": (time.perf_counter() - started_at) * 1000,
+                "error": None,
+            }
+        except Exception as e:
+            health = {
+                "enabled": True,
+                "healthy": False,
+                "latency_ms": None,
+                "error": str(e),
+            }
+        self._health, self._health_checked_at = health, time.monotonic()
+        return health
+
+    async def close(self) -> None:
+        """Close the client's channel on shutdown"""
+        await self._reset_client()
+
     def _get_encoding_and_extension(
         self, encoding_name: str
     ) -> Tuple[texttospeech.AudioEncoding, str]:
@@ -157,7 +304,7 @@ class TTSService:
 
         return encoding_map[encoding_name]
 
-    async def text_to_speech(
+    async def synthesize(
         self,
         text: str,
         language_code: Optional[str] = None,
@@ -166,9 +313,9 @@ class TTSService:
         pitch: Optional[float] = None,
         speaking_rate: Optional[float] = None,
         effects_profile_id: Optional[List[str]] = None,
-    ) -> str:
+    ) -> Tuple[bytes, str]:
         """
-        Convert text to speech and return path to audio file
+        Synthesize speech, serving repeated requests from the TTS cache
 
         Args:
             text: Text to convert to speech
@@ -180,97 +327,239 @@ class TTSService:
             effects_profile_id: Audio effects profile (defaults to config)
 
         Returns:
-            str: Path to generated audio file
+            Tuple of (audio content, file extension)
 
         Raises:
-            TTSGenerationError: If TTS generation fails
+            ServiceUnavailableError: If TTS is disabled or unavailable
             ValidationError: If input parameters are invalid
         """
-        try:
-            # Early return if TTS is disabled
-            if not self._is_tts_enabled():
-                logger.debug(
-                    "TTS is disabled in configuration, skipping generation"
-                )
-                raise ServiceUnavailableError(
-                    "Google Cloud TTS",
-                    "TTS is disabled in configuration. Set enable_tts: true to enable.",
-                )
+        # Early return if TTS is disabled
+        if not self._is_tts_enabled():
+            logger.debug("TTS is disabled in configuration, skipping generation")
+            raise ServiceUnavailableError(
+                "Google Cloud TTS",
+                "TTS is disabled in configuration. Set enable_tts: true to enable.",
+            )
 
-            # Validate input text
-            if not text or not text.strip():
-                raise ValidationError("Text cannot be empty", "text")
+        # Validate input text
+        if not text or not text.strip():
+            raise ValidationError("Text cannot be empty", "text")
+
+        if len(text) > 5000:
+            raise ValidationError("Text too long. Maximum 5000 characters", "text")
+
+        # Use config defaults if not specified
+        language_code = language_code or self.tts_config.language_code
+        voice_name = voice_name or self.tts_config.voice_name
+        pitch = pitch if pitch is not None else self.tts_config.pitch
+        speaking_rate = (
+            speaking_rate
+            if speaking_rate is not None
+            else self.tts_config.speaking_rate
+        )
+        effects_profile_id = effects_profile_id or self.tts_config.effects_profile_id
+
+        # Set audio encoding based on config or parameter
+        encoding_name = audio_encoding or self.tts_config.audio_encoding
+        audio_encoding_enum, file_extension = self._get_encoding_and_extension(
+            encoding_name
+        )
+
+        logger.debug(
+            f"TTS parameters configured",
+            extra={
+                "language_code": language_code,
+                "voice_name": voice_name,
+                "encoding": encoding_name,
+                "pitch": pitch,
+                "speaking_rate": speaking_rate,
+                "text_length": len(text),
+            },
+        )
+
+        # Identical requests produce identical audio, skip the network
+        cache_key = None
+        if is_tts_cache_enabled():
+            cache_key = tts_cache_key(
+                text,
+                language_code,
+                voice_name,
+                audio_encoding_enum.name,
+                pitch,
+                speaking_rate,
+                effects_profile_id,
+            )
+            try:
+                cached = await asyncio.to_thread(get_tts_cache().get, cache_key)
+            except Exception as e:
+                logger.warning(f"TTS cache lookup failed: {str(e)}")
+                cached = None
+            if cached is not None:
+                return cached, file_extension
+
+        # Construct the request
+        input_text = texttospeech.SynthesisInput(text=text)
+
+        voice = texttospeech.VoiceSelectionParams(
+            language_code=language_code, name=voice_name
+        )
+
+        audio_config = texttospeech.AudioConfig(
+            audio_encoding=audio_encoding_enum,
+            pitch=pitch,
+            speaking_rate=speaking_rate,
+            effects_profile_id=effects_profile_id,
+        )
+
+        # Perform the text-to-speech request
+        response = await self._call(
+            lambda client: client.synthesize_speech(
+                input=input_text,
+                voice=voice,
+                audio_config=audio_config,
+                timeout=config.services.ai_api.tts_timeout_seconds,
+            )
+        )
 
-            if len(text) > 5000:
-                raise ValidationError(
-                    "Text too long. Maximum 5000 characters", "text"
+        if cache_key:
+            try:
+                await asyncio.to_thread(
+                    get_tts_cache().put, cache_key, response.audio_content
                 )
+            except Exception as e:
+                logger.warning(f"Failed to cache TTS audio: {str(e)}")
 
-            client = self._get_client()
+        return response.audio_content, file_extension
 
-            # Use config defaults if not specified
-            language_code = language_code or self.tts_config.language_code
-            voice_name = voice_name or self.tts_config.voice_name
-            pitch = pitch if pitch is not None else self.tts_config.pitch
-            speaking_rate = (
-                speaking_rate
-                if speaking_rate is not None
-                else self.tts_config.speaking_rate
-            )
-            effects_profile_id = (
-                effects_profile_id or self.tts_config.effects_profile_id
-            )
+    async def _synthesize_chunk(self, chunk: str, **params) -> Tuple[bytes, str]:
+        async with _get_chunk_semaphore():
+            return await self.synthesize(chunk, **params)
 
-            # Set audio encoding based on config or parameter
-            encoding_name = audio_encoding or self.tts_config.audio_encoding
-            audio_encoding_enum, file_extension = (
-                self._get_encoding_and_extension(encoding_name)
-            )
+    async def synthesize_chunks(
+        self, text: str, **params
+    ) -> AsyncIterator[SynthesizedChunk]:
+        """
+        Synthesize text of any length chunk by chunk
 
-            logger.debug(
-                f"TTS parameters configured",
-                extra={
-                    "language_code": language_code,
-                    "voice_name": voice_name,
-                    "encoding": encoding_name,
-                    "pitch": pitch,
-                    "speaking_rate": speaking_rate,
-                    "text_length": len(text),
-                },
-            )
+        Text is split on sentence boundaries under the provider limit and
+        the chunks are synthesized concurrently. Each chunk is yielded in
+        order as soon as it is ready, so the first one can be sent while the
+        rest are still being synthesized.
 
-            # Construct the request
-            input_text = texttospeech.SynthesisInput(text=text)
+        Args:
+            text: Text to convert to speech
+            params: Voice parameters, as for synthesize
 
-            voice = texttospeech.VoiceSelectionParams(
-                language_code=language_code, name=voice_name
+        Raises:
+            ServiceUnavailableError: If TTS is disabled or unavailable
+            ValidationError: If input parameters are invalid
+        """
+        ai_api_config = config.services.ai_api
+        if len(text) > ai_api_config.tts_long_form_max_chars:
+            raise ValidationError(
+                f"Text too long. Maximum {ai_api_config.tts_long_form_max_chars} "
+                "characters",
+                "text",
             )
+        chunks = split_text(
+            text,
+            ai_api_config.tts_chunk_max_chars,
+            ai_api_config.tts_first_chunk_max_chars,
+        )
+        if not chunks:
+            raise ValidationError("Text cannot be empty", "text")
+
+        tasks = [
+            asyncio.create_task(self._synthesize_chunk(chunk, **params))
+            for chunk in chunks
+        ]
+        try:
+            for index, task in enumerate(tasks):
+                audio, file_extension = await task
+                yield SynthesizedChunk(
+                    index=index,
+                    total=len(tasks),
+                    audio=audio,
+                    file_extension=file_extension,
+                )
+        finally:
+            # Stop synthesizing when a chunk fails or the caller stops early
+            for task in tasks:
+                task.cancel()
+
+    async def synthesize_long(self, text: str, **params) -> Tuple[bytes, str]:
+        """
+        Synthesize text of any length into one audio file
+
+        Args:
+            text: Text to convert to speech
+            params: Voice parameters, as for synthesize
+
+        Returns:
+            Tuple of (audio content, file extension)
+        """
+        encoding_enum, file_extension = self._get_encoding_and_extension(
+            params.get("audio_encoding") or self.tts_config.audio_encoding
+        )
+        parts = [chunk.audio async for chunk in self.synthesize_chunks(text, **params)]
+        if len(parts) > 1:
+            logger.debug(f"Joining {len(parts)} synthesized chunks")
+        return await join_audio(parts, encoding_enum.name), file_extension
 
-            audio_config = texttospeech.AudioConfig(
-                audio_encoding=audio_encoding_enum,
+    async def text_to_speech(
+        self,
+        text: str,
+        language_code: Optional[str] = None,
+        voice_name: Optional[str] = None,
+        audio_encoding: Optional[str] = None,
+        pitch: Optional[float] = None,
+        speaking_rate: Optional[float] = None,
+        effects_profile_id: Optional[List[str]] = None,
+    ) -> str:
+        """
+        Convert text to speech and return path to audio file
+
+        Args:
+            text: Text to convert to speech
+            language_code: Language code (defaults to config)
+            voice_name: Specific voice to use (defaults to config)
+            audio_encoding: Output audio format string (defaults to config)
+            pitch: Voice pitch adjustment (defaults to config)
+            speaking_rate: Speech rate adjustment (defaults to config)
+            effects_profile_id: Audio effects profile (defaults to config)
+
+        Returns:
+            str: Path to generated audio file
+
+        Raises:
+            TTSGenerationError: If TTS generation fails
+            ValidationError: If input parameters are invalid
+        """
+        try:
+            # Long text is synthesized in parallel chunks and joined
+            audio_content, file_extension = await self.synthesize_long(
+                text,
+                language_code=language_code,
+                voice_name=voice_name,
+                audio_encoding=audio_encoding,
                 pitch=pitch,
                 speaking_rate=speaking_rate,
                 effects_profile_id=effects_profile_id,
             )
 
-            # Perform the text-to-speech request
-            response = client.synthesize_speech(
-                input=input_text, voice=voice, audio_config=audio_config
-            )
-
             # Save to temporary file with correct extension
             with tempfile.NamedTemporaryFile(
                 suffix=file_extension, delete=False
             ) as temp_file:
-                temp_file.write(response.audio_content)
+                temp_file.write(audio_content)
                 audio_path = temp_file.name
 
             logger.info(
                 f"TTS audio generated successfully",
                 extra={
                     "audio_path": audio_path,
-                    "format": encoding_name,
-                    "file_size": len(response.audio_content),
+                    "format": audio_encoding or self.tts_config.audio_encoding,
+                    "file_size": len(audio_content),
                     "text_length": len(text),
                 },
             )
@@ -287,7 +576,7 @@ class TTSService:
                 f"TTS generation failed: {str(e)}", len(text)
             )
 
-    def get_available_voices(
+    async def get_available_voices(
         self, language_code: Optional[str] = None
     ) -> List[Tuple[str, str]]:
         """
@@ -307,8 +596,12 @@ class TTSService:
                 )
                 return []
 
-            client = self._get_client()
-            voices = client.list_voices(language_code=language_code)
+            voices = await self._call(
+                lambda client: client.list_voices(
+                    language_code=language_code,
+                    timeout=config.services.ai_api.tts_timeout_seconds,
+                )
+            )
 
             voice_list = [
                 (voice.name, voice.ssml_gender.name) for voice in voices.voices
@@ -327,3 +620,43 @@ class TTSService:
         except Exception as e:
             logger.error(f"Failed to get voices: {str(e)}", exc_info=True)
             return []
+
+
+_tts_service: Optional[TTSService] = None
+
+
+def get_tts_service() -> TTSService:
+    """Get the process-wide TTS service"""
+    global _tts_service
+    if _tts_service is None:
+        _tts_service = TTSService()
+    return _tts_service
+
+
+def _prewarm_texts() -> List[str]:
+    """Fixed WhatsApp messages, templated ones are never spoken verbatim"""
+    whatsapp_config = config.services.whatsapp
+    messages = [
+        *whatsapp_config.error_messages.values(),
+        *whatsapp_config.status_messages.values(),
+    ]
+    return [message for message in messages if "{" not in message]
+
+
+async def prewarm_tts_cache(tts_service: TTSService) -> None:
+    """
+    Synthesize the bridge's fixed messages into the TTS cache.
+    Uses the default voice with the bridge's OGG_OPUS encoding and the
+    configured one, so later requests for them never reach Google.
+    """
+    encodings = {"OGG_OPUS", tts_service.tts_config.audio_encoding}
+    warmed = 0
+    for text in _prewarm_texts():
+        for encoding in encodings:
+            try:
+                await tts_service.synthesize_long(text, audio_encoding=encoding)
+                warmed += 1
+            except Exception as e:
+                logger.warning(f"Failed to pre-warm TTS cache: {str(e)}")
+                return
+    logger.info(f"TTS cache pre-warmed with {warmed} messages")
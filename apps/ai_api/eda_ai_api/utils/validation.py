@@ -324,7 +324,12 @@ def validate_tts_parameters(
         ValidationError: If parameters are invalid
     """
     # Validate text
-    validate_text_input(text, max_length=5000, field_name="text")
+    # Longer text than a single request takes is synthesized in chunks
+    validate_text_input(
+        text,
+        max_length=config.services.ai_api.tts_long_form_max_chars,
+        field_name="text",
+    )
 
     # Validate language code
     if language_code and len(language_code) != 5:
@@ -1,4 +1,6 @@
 import chromadb
+import hashlib
+import time
 import uuid
 import pandas as pd
 import io
@@ -14,6 +16,10 @@ from eda_ai_api.utils.memory import PocketBaseMemory
 
 config = ConfigLoader.get_config()
 
+# Seconds a computed global knowledge version is trusted before recomputing,
+# so changes made by other workers are picked up
+GLOBAL_KNOWLEDGE_VERSION_TTL_SECONDS = 60
+
 
 class VectorMemory(PocketBaseMemory):
     """Enhanced memory manager for conversations and documents with TTL - user-specific collections"""
@@ -71,6 +77,9 @@ class VectorMemory(PocketBaseMemory):
                 "VectorMemory initialized successfully with user-specific collection support and global knowledge base"
             )
 
+            self._global_knowledge_version: Optional[str] = None
+            self._global_knowledge_version_at = 0.0
+
             # Mark as initialized to prevent re-initialization
             self._initialized = True
 
@@ -216,6 +225,18 @@ class VectorMemory(PocketBaseMemory):
         filter_by_session: bool = True,
     ) -> List[Dict[str, Any]]:
         """Search conversation history using semantic similarity in user-specific collection"""
+        return self.search_conversations(
+            session_id=session_id, query=query, platform=platform, limit=limit
+        )
+
+    def search_conversations(
+        self,
+        session_id: str,
+        query: str,
+        platform: str = "whatsapp",
+        limit: int = 5,
+    ) -> List[Dict[str, Any]]:
+        """Blocking conversation search, safe to run in a worker thread"""
         try:
             # Get user-specific collections
             conversation_collection, _ = self._get_user_collections(
@@ -764,6 +785,7 @@ class VectorMemory(PocketBaseMemory):
                     documents=chunk_texts,
                 )
 
+                self._global_knowledge_version = None
                 logger.info(
                     f"Added {len(chunk_ids)} chunks to global knowledge base from {source_name or file_path}"
                 )
@@ -925,6 +947,7 @@ class VectorMemory(PocketBaseMemory):
 
             # Delete all chunks for this document
             self.global_knowledge_collection.delete(ids=chunk_ids)
+            self._global_knowledge_version = None
 
             deleted_count = len(chunk_ids)
             logger.info(
@@ -957,6 +980,7 @@ class VectorMemory(PocketBaseMemory):
 
             # Delete all chunks
             self.global_knowledge_collection.delete(ids=chunk_ids)
+            self._global_knowledge_version = None
 
             deleted_count = len(chunk_ids)
             logger.info(
@@ -967,3 +991,28 @@ class VectorMemory(PocketBaseMemory):
         except Exception as e:
             logger.error(f"Error clearing global knowledge: {str(e)}")
             return 0
+
+    def get_global_knowledge_version(self) -> str:
+        """
+        Get a fingerprint of the global knowledge base contents
+
+        The version changes whenever chunks are added or deleted. It is
+        cached and recomputed after local changes or once it gets older than
+        GLOBAL_KNOWLEDGE_VERSION_TTL_SECONDS.
+
+        Returns:
+            str: Short hash of the global knowledge chunk IDs
+        """
+        now = time.monotonic()
+        if (
+            self._global_knowledge_version is None
+            or now - self._global_knowledge_version_at
+            > GLOBAL_KNOWLEDGE_VERSION_TTL_SECONDS
+        ):
+            results = self.global_knowledge_collection.get(include=[])
+            chunk_ids = sorted(results.get("ids") or [])
+            self._global_knowledge_version = hashlib.sha256(
+                "\n".join(chunk_ids).encode("utf-8")
+            ).hexdigest()[:16]
+            self._global_knowledge_version_at = now
+        return self._global_knowledge_version
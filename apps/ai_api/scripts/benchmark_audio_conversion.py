@@ -0,0 +1,79 @@
+# Benchmark OGG voice note conversion throughput with in-memory ffmpeg pipes
+import argparse
+import asyncio
+import statistics
+import subprocess
+import time
+
+from loguru import logger
+
+from eda_ai_api.utils.audio_converter import convert_ogg
+
+
+def make_voice_note(seconds: float, frequency: int = 440) -> bytes:
+    """Generate an OGG Opus tone similar in size to a WhatsApp voice note"""
+    return subprocess.run(
+        [
+            "ffmpeg",
+            "-loglevel",
+            "error",
+            "-f",
+            "lavfi",
+            "-i",
+            f"sine=frequency={frequency}:duration={seconds}",
+            "-c:a",
+            "libopus",
+            "-b:a",
+            "24k",
+            "-f",
+            "ogg",
+            "pipe:1",
+        ],
+        check=True,
+        capture_output=True,
+    ).stdout
+
+
+async def run_batch(notes, output_format: str) -> list:
+    """Convert all notes concurrently, returning per-conversion latency"""
+
+    async def timed(note):
+        started_at = time.perf_counter()
+        await convert_ogg(note, output_format=output_format)
+        return time.perf_counter() - started_at
+
+    return await asyncio.gather(*(timed(note) for note in notes))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--notes", type=int, default=32, help="Voice notes per run")
+    parser.add_argument(
+        "--seconds", type=float, default=15, help="Length of each voice note"
+    )
+    parser.add_argument("--format", default="mp3", help="Output format")
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    notes = [
+        make_voice_note(args.seconds, 220 + i * 10) for i in range(args.notes)
+    ]
+    logger.info(
+        f"{args.notes} notes of {args.seconds}s, "
+        f"{statistics.mean(len(n) for n in notes) / 1024:.1f} KiB each"
+    )
+
+    for run in range(args.runs):
+        started_at = time.perf_counter()
+        latencies = asyncio.run(run_batch(notes, args.format))
+        elapsed = time.perf_counter() - started_at
+        logger.info(
+            f"Run {run + 1}: {args.notes / elapsed:.1f} conversions/s, "
+            f"{args.notes * args.seconds / elapsed:.0f}x realtime, "
+            f"latency p50 {statistics.median(latencies) * 1000:.0f}ms "
+            f"max {max(latencies) * 1000:.0f}ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+# Measure the real-time factor (processing time / audio duration) of the
+# transcription backends on a set of voice notes
+import argparse
+import asyncio
+import statistics
+import time
+from pathlib import Path
+
+import ffmpeg
+from loguru import logger
+
+from eda_ai_api.utils.transcriber import TRANSCRIBERS
+
+
+def audio_seconds(path: Path) -> float:
+    """Duration of an audio file according to ffprobe"""
+    return float(ffmpeg.probe(str(path))["format"]["duration"])
+
+
+async def benchmark(backend: str, files, language: str, runs: int) -> None:
+    transcriber = TRANSCRIBERS[backend]()
+
+    # The first call loads models and opens connections
+    warmup = files[0]
+    await transcriber.transcribe(warmup.read_bytes(), language, warmup.name)
+
+    factors = []
+    for path in files:
+        audio = path.read_bytes()
+        duration = audio_seconds(path)
+        for _ in range(runs):
+            started_at = time.perf_counter()
+            text = await transcriber.transcribe(audio, language, path.name)
+            elapsed = time.perf_counter() - started_at
+            factors.append(elapsed / duration)
+            logger.info(
+                f"[{backend}] {path.name}: {duration:.1f}s audio in "
+                f"{elapsed:.2f}s (RTF {elapsed / duration:.3f}), "
+                f"{len(text)} chars"
+            )
+
+    logger.info(
+        f"[{backend}] RTF mean {statistics.mean(factors):.3f}, "
+        f"p50 {statistics.median(factors):.3f}, max {max(factors):.3f} "
+        f"over {len(factors)} transcriptions"
+    )
+    await transcriber.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("files", nargs="+", type=Path, help="Voice notes to transcribe")
+    parser.add_argument(
+        "--backend",
+        action="append",
+        choices=list(TRANSCRIBERS),
+        help="Backend to measure, repeat for several (default: all)",
+    )
+    parser.add_argument("--language", default="pt")
+    parser.add_argument("--runs", type=int, default=1, help="Runs per file")
+    args = parser.parse_args()
+
+    for backend in args.backend or list(TRANSCRIBERS):
+        asyncio.run(benchmark(backend, args.files, args.language, args.runs))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+# Compare latency and token usage of the manager agent tool modes
+import argparse
+import statistics
+import time
+
+import litellm
+from loguru import logger
+
+from eda_ai_api.agents.manager import (
+    TOOL_MODE_DIRECT_TOOLS,
+    TOOL_MODE_MANAGED_AGENTS,
+    get_agent,
+)
+from smolagents.memory import ActionStep
+
+DEFAULT_QUERIES = [
+    "What did we talk about last time?",
+    "What does my uploaded document say about deadlines?",
+    "How do I apply for the grant?",
+    "Summarize the main points of the policy in the knowledge base",
+]
+
+# LLM calls made by the manager and every sub-agent during one run
+llm_calls = []
+
+
+def record_llm_call(kwargs, completion_response, start_time, end_time):
+    """LiteLLM success callback that records latency and tokens for every call"""
+    usage = getattr(completion_response, "usage", None)
+    llm_calls.append(
+        {
+            "latency": (end_time - start_time).total_seconds(),
+            "input_tokens": getattr(usage, "prompt_tokens", 0) or 0,
+            "output_tokens": getattr(usage, "completion_tokens", 0) or 0,
+        }
+    )
+
+
+def run_query(mode: str, session_id: str, query: str) -> dict:
+    """Run one query in the given mode and collect its cost"""
+    llm_calls.clear()
+    agent = get_agent(session_id=session_id, tool_mode=mode)
+
+    started_at = time.perf_counter()
+    try:
+        agent.run(query)
+        error = None
+    except Exception as e:
+        error = str(e)
+    elapsed = time.perf_counter() - started_at
+
+    return {
+        "latency": elapsed,
+        "manager_steps": sum(
+            1 for step in agent.memory.steps if isinstance(step, ActionStep)
+        ),
+        "llm_calls": len(llm_calls),
+        "input_tokens": sum(call["input_tokens"] for call in llm_calls),
+        "output_tokens": sum(call["output_tokens"] for call in llm_calls),
+        "error": error,
+    }
+
+
+def compare_modes(session_id: str, queries: list, repeats: int = 1) -> None:
+    """Run every query in both modes and print a summary per mode"""
+    litellm.success_callback = [record_llm_call]
+
+    for mode in [TOOL_MODE_MANAGED_AGENTS, TOOL_MODE_DIRECT_TOOLS]:
+        results = []
+        for _ in range(repeats):
+            for query in queries:
+                result = run_query(mode, session_id, query)
+                if result["error"]:
+                    logger.warning(f"[{mode}] '{query}' failed: {result['error']}")
+                results.append(result)
+
+        print("-" * 60)
+        print(f"Mode: {mode} ({len(results)} runs)")
+        print(
+            f"Latency  p50: {statistics.median(r['latency'] for r in results):.2f}s"
+            f"  max: {max(r['latency'] for r in results):.2f}s"
+        )
+        for key in ["manager_steps", "llm_calls", "input_tokens", "output_tokens"]:
+            print(f"{key:<14} mean: {statistics.mean(r[key] for r in results):.1f}")
+
+
+if __name__ == "__main__":
+    # Run from apps/ai_api with a valid config.yaml, e.g.:
+    # python scripts/compare_agent_modes.py --session-id 5511999999999 --repeats 3
+    parser = argparse.ArgumentParser(
+        description="Compare managed_agents and direct_tools agent modes"
+    )
+    parser.add_argument("--session-id", required=True)
+    parser.add_argument("--repeats", type=int, default=1)
+    parser.add_argument("queries", nargs="*", default=DEFAULT_QUERIES)
+    args = parser.parse_args()
+
+    compare_modes(args.session_id, args.queries, args.repeats)
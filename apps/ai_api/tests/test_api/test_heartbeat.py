@@ -14,3 +14,9 @@ def test_heartbeat(test_client) -> None:
 def test_default_route(test_client) -> None:
     response = test_client.get('/')
     assert response.status_code == 404
+
+
+def test_metrics(test_client) -> None:
+    response = test_client.get('/api/health/metrics')
+    assert response.status_code == 200
+    assert set(response.json()) == {"counters", "gauges", "histograms"}
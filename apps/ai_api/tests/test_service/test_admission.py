@@ -0,0 +1,76 @@
+import asyncio
+
+import pytest
+
+from eda_ai_api.utils.admission import AdmissionController, TokenBucket, config
+from eda_ai_api.utils.exceptions import RateLimitError
+
+
+def test_token_bucket_refills_over_window() -> None:
+    bucket = TokenBucket(capacity=2, refill_per_second=0.5, updated_at=0.0)
+    assert bucket.take(now=0.0) == 0
+    assert bucket.take(now=0.0) == 0
+    assert bucket.take(now=0.0) == pytest.approx(2.0)
+    assert bucket.take(now=2.0) == 0
+
+
+def test_full_queue_is_rejected_with_retry_after() -> None:
+    controller = AdmissionController()
+    controller.max_concurrency = 1
+    controller.max_queue_size = 1
+    controller._slots = asyncio.Semaphore(1)
+
+    async def main():
+        release = asyncio.Event()
+
+        async def hold():
+            async with controller.admit():
+                await release.wait()
+
+        running = asyncio.create_task(hold())
+        queued = asyncio.create_task(hold())
+        await asyncio.sleep(0.05)
+        with pytest.raises(RateLimitError) as exc_info:
+            async with controller.admit():
+                pass
+        release.set()
+        await asyncio.gather(running, queued)
+        return exc_info.value
+
+    error = asyncio.run(main())
+    assert error.status_code == 429
+    assert error.details["retry_after"] >= 1
+
+
+def test_rate_limit_is_shared_by_workers(monkeypatch, tmp_path) -> None:
+    ai_api_config = config.services.ai_api
+    monkeypatch.setattr(ai_api_config, "rate_limit_requests", 3)
+    monkeypatch.setattr(ai_api_config, "rate_limit_window_seconds", 3600)
+    monkeypatch.setattr(ai_api_config, "rate_limit_path", str(tmp_path / "limits.db"))
+    # Two controllers stand in for two uvicorn workers
+    workers = [AdmissionController(), AdmissionController()]
+
+    for index in range(3):
+        workers[index % 2].check_rate_limit("user")
+    with pytest.raises(RateLimitError) as exc_info:
+        workers[1].check_rate_limit("user")
+
+    # One token refills every 1200s, whichever worker answers
+    assert exc_info.value.details["retry_after"] == pytest.approx(1200, abs=2)
+    workers[0].check_rate_limit("other user")
+
+
+def test_slots_and_queue_are_split_between_workers(monkeypatch) -> None:
+    ai_api_config = config.services.ai_api
+    monkeypatch.setattr(ai_api_config, "debug", False)
+    monkeypatch.setattr(ai_api_config, "workers", 4)
+    monkeypatch.setattr(ai_api_config, "agent_max_concurrency", 8)
+    monkeypatch.setattr(ai_api_config, "admission_max_queue_size", 30)
+
+    controller = AdmissionController()
+
+    assert controller.max_concurrency == 2
+    assert controller.max_queue_size == 8
+
+    monkeypatch.setattr(ai_api_config, "debug", True)
+    assert AdmissionController().max_concurrency == 8
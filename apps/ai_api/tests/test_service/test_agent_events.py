@@ -0,0 +1,186 @@
+import asyncio
+import importlib
+import json
+from types import SimpleNamespace
+
+import pytest
+from smolagents.memory import ActionStep
+from smolagents.monitoring import Timing
+
+from eda_ai_api.models.message_handler import MessageHandlerResponse
+from eda_ai_api.utils.agent_events import (
+    EVENT_ERROR,
+    EVENT_FINAL,
+    EVENT_ROUTE,
+    EVENT_STEP,
+    EVENT_SUB_AGENT_FINISHED,
+    EVENT_SUB_AGENT_STARTED,
+    EVENT_TOOL_FINISHED,
+    EVENT_TOOL_STARTED,
+    format_sse,
+    install_event_hooks,
+)
+from eda_ai_api.utils.memory_manager import MemoryManager
+
+
+class _FakeTool:
+    def __init__(self, name: str, fails: bool = False):
+        self.name = name
+        self.fails = fails
+
+    def forward(self, query):
+        if self.fails:
+            raise RuntimeError("index unavailable")
+        return f"results for {query}"
+
+
+class _FakeAgent:
+    def __init__(self, name: str, tools, managed_agents=None):
+        self.name = name
+        self.tools = {tool.name: tool for tool in tools}
+        self.managed_agents = managed_agents or {}
+        self.step_callbacks = []
+
+    def finish_step(self, number: int) -> None:
+        step = ActionStep(step_number=number, timing=Timing(start_time=0.0))
+        for callback in self.step_callbacks:
+            callback(step)
+
+    def run(self, task):
+        result = self.tools["document_search"].forward(task)
+        self.finish_step(1)
+        return result
+
+
+def _hooked_manager(events):
+    sub_agent = _FakeAgent("document_search_agent", [_FakeTool("document_search")])
+    manager = _FakeAgent(
+        "manager",
+        [_FakeTool("global_knowledge_search", fails=True), _FakeTool("final_answer")],
+        managed_agents={"document_search_agent": sub_agent},
+    )
+    final_answer = manager.tools["final_answer"].forward
+    install_event_hooks(manager, lambda event, data: events.append((event, data)))
+    return manager, sub_agent, final_answer
+
+
+def test_delegation_events_are_nested_in_order() -> None:
+    events = []
+    manager, sub_agent, _ = _hooked_manager(events)
+
+    assert sub_agent.run("maps") == "results for maps"
+    manager.finish_step(1)
+
+    assert [(event, data.get("agent")) for event, data in events] == [
+        (EVENT_SUB_AGENT_STARTED, "document_search_agent"),
+        (EVENT_TOOL_STARTED, "document_search_agent"),
+        (EVENT_TOOL_FINISHED, "document_search_agent"),
+        (EVENT_STEP, "document_search_agent"),
+        (EVENT_SUB_AGENT_FINISHED, "document_search_agent"),
+        (EVENT_STEP, "manager"),
+    ]
+    assert events[2][1]["output_chars"] == len("results for maps")
+
+
+def test_tool_errors_are_reported_and_raised() -> None:
+    events = []
+    manager, _, final_answer = _hooked_manager(events)
+
+    with pytest.raises(RuntimeError):
+        manager.tools["global_knowledge_search"].forward("x")
+
+    assert events[-1][0] == EVENT_TOOL_FINISHED
+    assert events[-1][1]["error"] == "index unavailable"
+    # final_answer is not reported as a tool call
+    assert manager.tools["final_answer"].forward == final_answer
+
+
+def test_broken_listener_does_not_fail_the_run() -> None:
+    def emit(event, data):
+        raise RuntimeError("client went away")
+
+    tool = _FakeTool("document_search")
+    install_event_hooks(_FakeAgent("manager", [tool]), emit)
+
+    assert tool.forward("maps") == "results for maps"
+
+
+def test_format_sse() -> None:
+    assert format_sse(EVENT_ROUTE, {"route": "agent", "text": "olá"}) == (
+        'event: route\ndata: {"route": "agent", "text": "olá"}\n\n'
+    )
+
+
+@pytest.fixture
+def message_handler(monkeypatch):
+    # The route module opens the vector memory on import
+    monkeypatch.setattr(MemoryManager, "_vector_memory", SimpleNamespace())
+    module = importlib.import_module("eda_ai_api.api.routes.message_handler")
+    # Keep the shared rate limit file out of the working directory
+    monkeypatch.setattr(module.config.services.ai_api, "rate_limit_requests", 0)
+    return module
+
+
+def _parse_sse(frame: str):
+    event_line, data_line = frame.strip().split("\n")
+    return event_line.removeprefix("event: "), json.loads(
+        data_line.removeprefix("data: ")
+    )
+
+
+def _stream(message_handler) -> list:
+    async def main():
+        response = await message_handler.message_handler_stream_route(
+            message="oi", user_platform_id="user", platform="whatsapp", images=None
+        )
+        return [frame async for frame in response.body_iterator]
+
+    return [_parse_sse(frame) for frame in asyncio.run(main())]
+
+
+def test_events_from_agent_threads_reach_the_stream_in_order(
+    message_handler, monkeypatch
+) -> None:
+    async def process_message(request, user_id, images, emit):
+        emit(EVENT_ROUTE, {"route": "agent"})
+
+        def agent_run():
+            # Runs in a worker thread like the agent executor
+            for step in range(1, 4):
+                emit(EVENT_STEP, {"agent": "manager", "step": step})
+
+        await asyncio.to_thread(agent_run)
+        return MessageHandlerResponse(result="pronto", user_platform_id=user_id)
+
+    monkeypatch.setattr(message_handler, "_process_message", process_message)
+
+    events = _stream(message_handler)
+
+    assert [event for event, _ in events] == [
+        EVENT_ROUTE,
+        EVENT_STEP,
+        EVENT_STEP,
+        EVENT_STEP,
+        EVENT_FINAL,
+    ]
+    assert [data["step"] for event, data in events if event == EVENT_STEP] == [
+        1,
+        2,
+        3,
+    ]
+    assert events[-1][1]["result"] == "pronto"
+
+
+def test_failures_end_the_stream_with_an_error_event(
+    message_handler, monkeypatch
+) -> None:
+    async def process_message(request, user_id, images, emit):
+        emit(EVENT_ROUTE, {"route": "agent"})
+        raise RuntimeError("agent crashed")
+
+    monkeypatch.setattr(message_handler, "_process_message", process_message)
+
+    events = _stream(message_handler)
+
+    assert [event for event, _ in events] == [EVENT_ROUTE, EVENT_ERROR]
+    assert events[-1][1] == {"error": "agent crashed", "user_platform_id": "user"}
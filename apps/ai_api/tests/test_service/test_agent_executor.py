@@ -0,0 +1,127 @@
+import asyncio
+import time
+from types import SimpleNamespace
+
+import pytest
+from smolagents.memory import ActionStep
+from smolagents.models import ChatMessage
+from smolagents.monitoring import AgentLogger, LogLevel, Timing
+from smolagents.utils import AgentError
+
+from eda_ai_api.utils import agent_executor
+from eda_ai_api.utils.admission import AdmissionController
+from eda_ai_api.utils.agent_executor import run_agent
+
+FALLBACK = "Taking too long, please try again"
+
+
+class _FakeAgent:
+    """Runs fixed-length steps and honours interrupts like smolagents"""
+
+    def __init__(self, steps: int, step_seconds: float):
+        self.steps = steps
+        self.step_seconds = step_seconds
+        self.memory = SimpleNamespace(steps=[])
+        self.step_callbacks = []
+        self.managed_agents = {}
+        self.interrupt_switch = False
+        self.running = False
+        self.summarized_steps = None
+
+    def interrupt(self) -> None:
+        self.interrupt_switch = True
+
+    def run(self, task, images=None):
+        self.running = True
+        try:
+            for number in range(1, self.steps + 1):
+                if self.interrupt_switch:
+                    raise AgentError("Agent interrupted", AgentLogger(LogLevel.OFF))
+                time.sleep(self.step_seconds)
+                step = ActionStep(
+                    step_number=number,
+                    timing=Timing(start_time=0.0),
+                    observations=f"result {number}",
+                )
+                self.memory.steps.append(step)
+                for callback in self.step_callbacks:
+                    callback(step)
+            return "full answer"
+        finally:
+            self.running = False
+
+    def provide_final_answer(self, task, images=None):
+        # The run thread must have stopped before memory is read
+        assert not self.running
+        self.summarized_steps = len(self.memory.steps)
+        return ChatMessage(role="assistant", content="partial answer")
+
+
+@pytest.fixture(autouse=True)
+def grace(monkeypatch):
+    monkeypatch.setattr(
+        agent_executor.config.services.ai_api,
+        "agent_final_answer_grace_seconds",
+        2,
+    )
+
+
+def _run(agent, timeout_seconds):
+    return asyncio.run(
+        run_agent(
+            agent, "task", timeout_seconds=timeout_seconds, fallback_message=FALLBACK
+        )
+    )
+
+
+def test_answer_within_deadline() -> None:
+    assert _run(_FakeAgent(steps=2, step_seconds=0.01), 5) == "full answer"
+
+
+def test_deadline_summarizes_completed_steps() -> None:
+    agent = _FakeAgent(steps=10, step_seconds=0.2)
+
+    assert _run(agent, 0.3) == "partial answer"
+    # The step running at the deadline finished before the summary
+    assert agent.summarized_steps == 2
+
+
+def test_deadline_without_completed_steps_falls_back() -> None:
+    agent = _FakeAgent(steps=10, step_seconds=0.5)
+
+    def run(task, images=None):
+        time.sleep(0.5)
+        raise AgentError("Agent interrupted", AgentLogger(LogLevel.OFF))
+
+    agent.run = run
+    assert _run(agent, 0.1) == FALLBACK
+    assert agent.summarized_steps is None
+
+
+def test_busy_run_keeps_its_admission_slot(monkeypatch) -> None:
+    monkeypatch.setattr(
+        agent_executor.config.services.ai_api,
+        "agent_final_answer_grace_seconds",
+        0.2,
+    )
+    agent = _FakeAgent(steps=3, step_seconds=1.0)
+
+    async def main():
+        controller = AdmissionController()
+        async with controller.admit():
+            answer = await run_agent(
+                agent, "task", timeout_seconds=0.1, fallback_message=FALLBACK
+            )
+        in_flight_after_answer = controller._in_flight
+        while agent.running:
+            await asyncio.sleep(0.05)
+        await asyncio.sleep(0.05)
+        return answer, in_flight_after_answer, controller._in_flight
+
+    answer, in_flight_after_answer, in_flight_after_stop = asyncio.run(main())
+
+    # The step outlasts the grace period, so memory is never summarized
+    assert answer == FALLBACK
+    assert agent.summarized_steps is None
+    assert in_flight_after_answer == 1
+    assert in_flight_after_stop == 0
@@ -0,0 +1,70 @@
+import uuid
+from types import SimpleNamespace
+
+import chromadb
+import numpy as np
+import pytest
+
+from eda_ai_api.utils import answer_cache
+from eda_ai_api.utils.answer_cache import (
+    is_answer_cacheable_request,
+    lookup_answer,
+    store_answer,
+)
+
+
+class _FakeEmbeddingModel:
+    """Embeds text as letter counts, so equal questions embed the same"""
+
+    def encode(self, text: str) -> np.ndarray:
+        vector = np.zeros(26)
+        for char in text.lower():
+            if "a" <= char <= "z":
+                vector[ord(char) - ord("a")] += 1
+        return vector
+
+
+@pytest.fixture
+def memory(monkeypatch):
+    fake = SimpleNamespace(
+        chroma_client=chromadb.EphemeralClient(),
+        embedding_model=_FakeEmbeddingModel(),
+        get_global_knowledge_version=lambda: "v1",
+    )
+    monkeypatch.setattr(answer_cache, "get_vector_memory", lambda: fake)
+    # Ephemeral clients share one store, give each test its own collection
+    monkeypatch.setattr(
+        answer_cache, "ANSWER_CACHE_COLLECTION", f"answers_{uuid.uuid4().hex}"
+    )
+    monkeypatch.setattr(
+        answer_cache.config.services.ai_api, "answer_cache_enabled", True
+    )
+    return fake
+
+
+def test_answers_are_served_on_the_same_platform_only(memory) -> None:
+    question = "What is the land demarcation process?"
+    store_answer(question, "*Demarcation* has five steps", 4, "whatsapp")
+
+    cached = lookup_answer(question, "whatsapp")
+    assert cached is not None
+    assert cached.answer == "*Demarcation* has five steps"
+    assert cached.llm_calls == 4
+
+    assert lookup_answer(question, "telegram") is None
+
+
+def test_answers_expire_with_the_knowledge_version(memory) -> None:
+    question = "What is the land demarcation process?"
+    store_answer(question, "Five steps", 4, "whatsapp")
+
+    memory.get_global_knowledge_version = lambda: "v2"
+    assert lookup_answer(question, "whatsapp") is None
+
+
+def test_only_standalone_text_questions_are_cacheable(memory) -> None:
+    history = [{"user": "Tell me about our territory", "assistant": "..."}]
+
+    assert is_answer_cacheable_request([], has_images=False)
+    assert not is_answer_cacheable_request(history, has_images=False)
+    assert not is_answer_cacheable_request([], has_images=True)
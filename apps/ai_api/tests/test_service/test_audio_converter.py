@@ -0,0 +1,152 @@
+import asyncio
+import io
+import shutil
+import subprocess
+import threading
+import wave
+
+import pytest
+
+from eda_ai_api.utils.audio_converter import (
+    PCM_BYTES_PER_SECOND,
+    convert_ogg,
+    decode_with_silences,
+    config,
+    transcode_for_transcription,
+)
+
+pytestmark = pytest.mark.skipif(
+    shutil.which("ffmpeg") is None, reason="ffmpeg is not installed"
+)
+
+
+def _voice_note(frequency: int, seconds: float) -> bytes:
+    """Generate an OGG Opus tone like a WhatsApp voice note"""
+    return subprocess.run(
+        [
+            "ffmpeg",
+            "-loglevel",
+            "error",
+            "-f",
+            "lavfi",
+            "-i",
+            f"sine=frequency={frequency}:duration={seconds}",
+            "-c:a",
+            "libopus",
+            "-f",
+            "ogg",
+            "pipe:1",
+        ],
+        check=True,
+        capture_output=True,
+    ).stdout
+
+
+def _wav_seconds(data: bytes) -> float:
+    with wave.open(io.BytesIO(data)) as wav:
+        frame_size = wav.getnchannels() * wav.getsampwidth()
+        # Piped WAV headers carry no length, measure the payload instead
+        return len(data) / frame_size / wav.getframerate()
+
+
+def test_concurrent_conversions_are_isolated() -> None:
+    durations = [0.5 + i * 0.5 for i in range(8)]
+    notes = [_voice_note(220 + i * 110, d) for i, d in enumerate(durations)]
+
+    async def main():
+        return await asyncio.gather(
+            *(convert_ogg(note, output_format="wav") for note in notes)
+        )
+
+    outputs = asyncio.run(main())
+
+    # Each output matches its own input, not a neighbour's
+    for duration, output in zip(durations, outputs):
+        assert _wav_seconds(output) == pytest.approx(duration, abs=0.1)
+
+
+def _run_in_fresh_loop(main, timeout: float):
+    """asyncio.run main in a daemon thread, so a stuck loop fails the test"""
+    result = {}
+    thread = threading.Thread(
+        target=lambda: result.update(value=asyncio.run(main())), daemon=True
+    )
+    thread.start()
+    thread.join(timeout)
+    assert not thread.is_alive(), "event loop did not finish"
+    return result["value"]
+
+
+def test_contended_batches_on_separate_event_loops(monkeypatch) -> None:
+    monkeypatch.setattr(
+        config.services.ai_api, "audio_conversion_max_concurrency", 2
+    )
+    notes = [_voice_note(220 + i * 110, 0.5) for i in range(6)]
+
+    async def main():
+        return await asyncio.gather(
+            *(convert_ogg(note, output_format="wav") for note in notes)
+        )
+
+    # More calls than the limit make them wait on the semaphore, which must
+    # not stay bound to the first loop
+    for _ in range(2):
+        outputs = _run_in_fresh_loop(main, timeout=60)
+        assert len(outputs) == len(notes)
+
+
+def test_invalid_input_raises() -> None:
+    with pytest.raises(RuntimeError, match="FFmpeg error"):
+        asyncio.run(convert_ogg(b"not audio at all", output_format="mp3"))
+
+
+def test_transcode_for_transcription_is_16khz_mono_opus() -> None:
+    note = _voice_note(440, 2)
+    output = asyncio.run(transcode_for_transcription(note))
+
+    assert output[:4] == b"OggS"
+    head = output[output.index(b"OpusHead") :]
+    channels = head[9]
+    input_sample_rate = int.from_bytes(head[12:16], "little")
+    assert channels == 1
+    assert input_sample_rate == 16000
+
+
+def test_decodes_m4a_with_index_at_the_end(tmp_path) -> None:
+    # Without +faststart the moov atom is written after the audio, as phone
+    # recorders do; long enough to overflow ffmpeg's probe buffer
+    path = tmp_path / "recording.m4a"
+    subprocess.run(
+        [
+            "ffmpeg",
+            "-loglevel",
+            "error",
+            "-f",
+            "lavfi",
+            "-i",
+            "sine=frequency=440:duration=180",
+            "-c:a",
+            "aac",
+            "-b:a",
+            "64k",
+            str(path),
+        ],
+        check=True,
+    )
+    data = path.read_bytes()
+    assert data.index(b"moov") > data.index(b"mdat")
+
+    pcm, _ = asyncio.run(
+        decode_with_silences(data, noise_db=-35, min_silence_seconds=0.5)
+    )
+
+    assert len(pcm) / PCM_BYTES_PER_SECOND == pytest.approx(180, abs=0.5)
+
+
+def test_decoding_no_audio_raises() -> None:
+    with pytest.raises(RuntimeError):
+        asyncio.run(
+            decode_with_silences(
+                b"not audio at all", noise_db=-35, min_silence_seconds=0.5
+            )
+        )
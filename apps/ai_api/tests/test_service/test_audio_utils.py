@@ -0,0 +1,47 @@
+import asyncio
+
+import pytest
+
+from eda_ai_api.utils import audio_utils
+from eda_ai_api.utils.audio_utils import transcribe_content
+
+M4A_HEADER = b"\x00\x00\x00\x20ftypM4A \x00\x00\x00\x00"
+AMR_HEADER = b"#!AMR\n"
+
+
+@pytest.fixture
+def uploads(monkeypatch):
+    """Record what reaches the transcriber and what gets transcoded"""
+    calls = {"transcoded": [], "filenames": []}
+
+    async def fake_transcode(content):
+        calls["transcoded"].append(content)
+        return b"OggS transcoded"
+
+    async def fake_transcribe(content, language, filename):
+        calls["filenames"].append(filename)
+        return "olá"
+
+    monkeypatch.setattr(audio_utils, "transcode_for_transcription", fake_transcode)
+    monkeypatch.setattr(audio_utils, "transcribe_audio", fake_transcribe)
+    monkeypatch.setattr(
+        audio_utils.config.services.ai_api, "transcription_cache_enabled", False
+    )
+    return calls
+
+
+def test_unlisted_type_is_detected_from_content(uploads) -> None:
+    content = M4A_HEADER + b"\x00" * 64
+    asyncio.run(transcribe_content(content, "audio/x-m4a", "pt"))
+
+    assert uploads["transcoded"] == []
+    assert uploads["filenames"] == ["audio.mp4"]
+
+
+def test_unrecognized_audio_is_transcoded(uploads) -> None:
+    content = AMR_HEADER + b"\x00" * 64
+    result = asyncio.run(transcribe_content(content, "audio/amr", "pt"))
+
+    assert result.text == "olá"
+    assert uploads["transcoded"] == [content]
+    assert uploads["filenames"] == ["audio.ogg"]
@@ -0,0 +1,39 @@
+from eda_ai_api.utils.context_builder import (
+    ELISION_MARKER,
+    exchange_tokens,
+    pack_history,
+)
+
+
+def _exchange(user: str, assistant: str = "ok", **extra) -> dict:
+    return {"user": user, "assistant": assistant, **extra}
+
+
+def test_recent_history_takes_priority_over_relevant() -> None:
+    recent = [_exchange(f"recent {i}", "a" * 200) for i in range(3)]
+    relevant = [_exchange("relevant", "b" * 200, relevance=0.9)]
+
+    packed_recent, packed_relevant, tokens = pack_history(
+        recent, relevant, max_tokens=120, max_exchange_tokens=100
+    )
+
+    assert [e["user"] for e in packed_recent][-1] == "recent 2"
+    assert packed_relevant == []
+    assert tokens <= 120
+
+
+def test_oversized_exchange_is_elided() -> None:
+    pasted = "x" * 20000
+    packed_recent, _, tokens = pack_history(
+        [_exchange(pasted, "short answer")],
+        [],
+        max_tokens=1000,
+        max_exchange_tokens=200,
+    )
+
+    exchange = packed_recent[0]
+    assert exchange["elided"] is True
+    assert ELISION_MARKER in exchange["user"]
+    assert exchange["assistant"] == "short answer"
+    assert exchange_tokens(exchange) <= 200
+    assert tokens == exchange_tokens(exchange)
@@ -0,0 +1,174 @@
+import asyncio
+import importlib
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from eda_ai_api.agents import fast_path
+from eda_ai_api.agents.fast_path import (
+    CONVERSATIONAL_PROTOTYPES,
+    ROUTE_AGENT,
+    ROUTE_FAST_PATH,
+    RouteDecision,
+    classify_message,
+)
+from eda_ai_api.utils.memory_manager import MemoryManager
+
+DIMENSIONS = len(CONVERSATIONAL_PROTOTYPES) + 1
+
+
+def _axis(index: int) -> np.ndarray:
+    vector = np.zeros(DIMENSIONS)
+    vector[index] = 1.0
+    return vector
+
+
+# Unit vectors at a known cosine similarity to the "oi" prototype
+QUERY_EMBEDDINGS = {
+    "oi!": _axis(0),
+    "oi, tudo certo?": 0.8 * _axis(0) + 0.6 * _axis(-1),
+    "como demarcar o território?": _axis(-1),
+}
+
+
+class _FakeEmbeddingModel:
+    def encode(self, texts, normalize_embeddings=False):
+        if isinstance(texts, list):
+            return np.stack([_axis(i) for i in range(len(texts))])
+        return QUERY_EMBEDDINGS[texts]
+
+
+@pytest.fixture
+def ai_api_config(monkeypatch):
+    fake_memory = SimpleNamespace(embedding_model=_FakeEmbeddingModel())
+    monkeypatch.setattr(fast_path, "get_vector_memory", lambda: fake_memory)
+    monkeypatch.setattr(fast_path, "_prototype_embeddings", None)
+    ai_api_config = fast_path.config.services.ai_api
+    monkeypatch.setattr(ai_api_config, "fast_path_enabled", True)
+    monkeypatch.setattr(ai_api_config, "fast_path_similarity_threshold", 0.75)
+    monkeypatch.setattr(ai_api_config, "fast_path_max_message_length", 120)
+    return ai_api_config
+
+
+def test_greetings_take_the_fast_path(ai_api_config) -> None:
+    decision = classify_message("oi!")
+    assert decision.route == ROUTE_FAST_PATH
+    assert decision.similarity == pytest.approx(1.0)
+
+
+def test_similarity_threshold_is_inclusive(ai_api_config) -> None:
+    assert classify_message("oi, tudo certo?").route == ROUTE_FAST_PATH
+
+    ai_api_config.fast_path_similarity_threshold = 0.85
+    decision = classify_message("oi, tudo certo?")
+    assert decision.route == ROUTE_AGENT
+    assert decision.similarity == pytest.approx(0.8)
+    assert decision.reason == "below threshold"
+
+
+def test_questions_go_to_the_agent(ai_api_config) -> None:
+    assert classify_message("como demarcar o território?").route == ROUTE_AGENT
+
+
+@pytest.mark.parametrize(
+    "message, has_attachments, enabled, reason",
+    [
+        ("oi!", True, True, "attachments present"),
+        ("oi! " + "x" * 200, False, True, "message too long"),
+        ("oi!", False, False, "fast path disabled"),
+    ],
+)
+def test_agent_is_used_without_embedding(
+    ai_api_config, monkeypatch, message, has_attachments, enabled, reason
+) -> None:
+    monkeypatch.setattr(ai_api_config, "fast_path_enabled", enabled)
+    monkeypatch.setattr(fast_path, "get_vector_memory", None)
+
+    assert classify_message(message, has_attachments) == RouteDecision(
+        ROUTE_AGENT, 0.0, reason
+    )
+
+
+@pytest.fixture
+def handler(monkeypatch):
+    """The message handler with every collaborator of the agent route faked"""
+    # The route module opens the vector memory on import
+    monkeypatch.setattr(MemoryManager, "_vector_memory", SimpleNamespace())
+    message_handler = importlib.import_module(
+        "eda_ai_api.api.routes.message_handler"
+    )
+
+    stored = []
+
+    async def add_message_to_history(**exchange):
+        stored.append(exchange)
+
+    async def build_enhanced_context(**kwargs):
+        return {"merged_history": []}
+
+    async def run_agent(agent, task, images=None):
+        return "agent answer"
+
+    monkeypatch.setattr(
+        message_handler,
+        "memory",
+        SimpleNamespace(add_message_to_history=add_message_to_history),
+    )
+    monkeypatch.setattr(
+        message_handler, "build_enhanced_context", build_enhanced_context
+    )
+    monkeypatch.setattr(
+        message_handler,
+        "classify_message",
+        lambda message, has_images: RouteDecision(
+            ROUTE_FAST_PATH, 0.9, "conversational"
+        ),
+    )
+    monkeypatch.setattr(
+        message_handler, "is_answer_cacheable_request", lambda *args: False
+    )
+    monkeypatch.setattr(
+        message_handler, "is_pre_retrieval_enabled", lambda platform: False
+    )
+    monkeypatch.setattr(
+        message_handler, "get_agent", lambda **kwargs: SimpleNamespace(tools=[])
+    )
+    monkeypatch.setattr(message_handler, "run_agent", run_agent)
+    return SimpleNamespace(module=message_handler, stored=stored)
+
+
+def _handle(handler, message: str = "oi!"):
+    request = handler.module.MessageRequest(message=message, platform="whatsapp")
+    return asyncio.run(handler.module._process_message(request, "user", []))
+
+
+def test_fast_path_answers_without_the_agent(handler, monkeypatch) -> None:
+    monkeypatch.setattr(handler.module, "run_fast_path", lambda *args: "Olá!")
+    monkeypatch.setattr(handler.module, "run_agent", None)
+
+    assert _handle(handler).result == "Olá!"
+    assert handler.stored[0]["assistant_response"] == "Olá!"
+
+
+@pytest.mark.parametrize("failure", [RuntimeError("model down"), ""])
+def test_fast_path_failures_fall_back_to_the_agent(
+    handler, monkeypatch, failure
+) -> None:
+    def run_fast_path(*args):
+        if isinstance(failure, Exception):
+            raise failure
+        return failure
+
+    monkeypatch.setattr(handler.module, "run_fast_path", run_fast_path)
+
+    assert _handle(handler).result == "agent answer"
+
+
+def test_routing_errors_fall_back_to_the_agent(handler, monkeypatch) -> None:
+    def classify_message(message, has_images):
+        raise RuntimeError("embedding model not loaded")
+
+    monkeypatch.setattr(handler.module, "classify_message", classify_message)
+
+    assert _handle(handler).result == "agent answer"
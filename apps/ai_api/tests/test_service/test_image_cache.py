@@ -0,0 +1,29 @@
+import io
+
+from PIL import Image, ImageDraw
+
+from eda_ai_api.utils.image_cache import image_content_hash
+
+
+def _flyer(text: str) -> Image.Image:
+    image = Image.new("RGB", (800, 600), "white")
+    draw = ImageDraw.Draw(image)
+    draw.rectangle((50, 50, 400, 300), fill="green")
+    draw.ellipse((450, 200, 750, 550), fill="navy")
+    draw.text((60, 400), text, fill="black")
+    return image
+
+
+def test_identical_copies_hash_the_same() -> None:
+    buffer = io.BytesIO()
+    _flyer("Assembleia 12/05").save(buffer, format="PNG")
+    copy = Image.open(io.BytesIO(buffer.getvalue()))
+
+    assert image_content_hash(copy) == image_content_hash(_flyer("Assembleia 12/05"))
+
+
+def test_flyers_differing_only_in_text_hash_apart() -> None:
+    # A perceptual hash cannot tell these apart
+    assert image_content_hash(_flyer("Assembleia 12/05")) != image_content_hash(
+        _flyer("Assembleia 19/05")
+    )
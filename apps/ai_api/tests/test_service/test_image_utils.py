@@ -0,0 +1,39 @@
+import io
+
+import pytest
+from PIL import Image
+
+from eda_ai_api.utils.exceptions import FileProcessingError
+from eda_ai_api.utils.image_utils import config, preprocess_image
+
+
+def _jpeg(size, exif=None) -> bytes:
+    buffer = io.BytesIO()
+    Image.new("RGB", size, (10, 120, 200)).save(
+        buffer, format="JPEG", exif=exif or Image.Exif()
+    )
+    return buffer.getvalue()
+
+
+def test_image_is_downscaled_rotated_and_stripped() -> None:
+    exif = Image.Exif()
+    exif[0x0112] = 6  # Orientation: rotate 90 degrees
+    exif[0x010F] = "Camera"
+
+    image = preprocess_image(_jpeg((4000, 3000), exif), "photo.jpg")
+
+    max_side = config.services.ai_api.image_max_side
+    assert max(image.size) == max_side
+    assert image.height > image.width
+    assert image.mode == "RGB"
+    assert len(image.getexif()) == 0
+
+
+def test_oversized_image_is_rejected_before_decoding() -> None:
+    max_pixels = config.services.ai_api.image_max_pixels
+    side = int(max_pixels**0.5) + 1
+    buffer = io.BytesIO()
+    Image.new("1", (side, side)).save(buffer, format="PNG")
+
+    with pytest.raises(FileProcessingError):
+        preprocess_image(buffer.getvalue(), "bomb.png")
@@ -0,0 +1,62 @@
+import asyncio
+from typing import List
+
+from eda_ai_api.utils.message_coalescer import MessageCoalescer, config
+
+
+def test_quick_messages_are_merged_into_one_run(monkeypatch) -> None:
+    ai_api_config = config.services.ai_api
+    monkeypatch.setattr(ai_api_config, "message_coalescing_window_seconds", 0.2)
+    monkeypatch.setattr(ai_api_config, "message_coalescing_max_wait_seconds", 1.0)
+    coalescer = MessageCoalescer()
+    runs: List[str] = []
+
+    async def process(message, images):
+        runs.append(message)
+        await asyncio.sleep(0.3)
+        return message
+
+    async def send(message: str, delay: float):
+        await asyncio.sleep(delay)
+        return await coalescer.submit("user", message, [], process)
+
+    async def main():
+        return await asyncio.gather(
+            send("a", 0),
+            send("b", 0.05),
+            send("c", 0.1),
+            # Arrive while the first batch is running, so they queue behind it
+            send("d", 0.45),
+            send("e", 0.5),
+        )
+
+    results = asyncio.run(main())
+
+    assert runs == ["a\nb\nc", "d\ne"]
+    assert [r.message_count for r in results] == [3, 3, 3, 2, 2]
+    assert [r.is_primary for r in results] == [False, False, True, False, True]
+    assert coalescer._users == {}
+
+
+def test_runs_do_not_overlap_across_workers() -> None:
+    # Two coalescers stand in for two uvicorn workers, which share no memory
+    workers = [MessageCoalescer(), MessageCoalescer()]
+    running: List[int] = []
+    overlaps: List[int] = []
+
+    async def run(coalescer: MessageCoalescer, index: int):
+        async with coalescer.serialized("user"):
+            if running:
+                overlaps.append(index)
+            running.append(index)
+            await asyncio.sleep(0.1)
+            running.remove(index)
+
+    async def main():
+        await asyncio.gather(
+            *(run(workers[index % 2], index) for index in range(4))
+        )
+
+    asyncio.run(main())
+
+    assert overlaps == []
@@ -0,0 +1,28 @@
+from eda_ai_api.utils.metrics import MetricsRegistry
+
+
+def test_counters_and_ratio() -> None:
+    metrics = MetricsRegistry()
+    metrics.increment("answer_cache_lookups", 4)
+    metrics.increment("answer_cache_hits")
+
+    assert metrics.counter("answer_cache_lookups") == 4
+    assert metrics.ratio("answer_cache_hits", "answer_cache_lookups") == 0.25
+    assert metrics.ratio("answer_cache_hits", "missing") == 0.0
+
+
+def test_histogram_percentiles_per_label() -> None:
+    metrics = MetricsRegistry(histogram_window=100)
+    for value in range(1, 101):
+        metrics.observe("llm_latency_seconds", value, model="groq")
+
+    assert metrics.percentile("llm_latency_seconds", 50, model="groq") == 51
+    assert metrics.percentile("llm_latency_seconds", 50, model="gemini") is None
+    assert (
+        metrics.percentile("llm_latency_seconds", 50, min_count=200, model="groq")
+        is None
+    )
+
+    summary = metrics.snapshot()["histograms"]["llm_latency_seconds{model=groq}"]
+    assert summary["count"] == 100
+    assert summary["max"] == 100
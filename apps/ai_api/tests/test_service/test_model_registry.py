@@ -0,0 +1,112 @@
+import threading
+from types import SimpleNamespace
+
+import litellm
+import pytest
+from smolagents.models import ChatMessage
+
+from eda_ai_api.agents import models
+from eda_ai_api.agents.models import ModelRegistry, ModelSlot, ResilientModel
+
+
+class _FakeModel:
+    """Stands in for a LiteLLM model, failing with the given errors first"""
+
+    def __init__(self, model_id: str, errors=(), answer: str = "ok"):
+        self.model_id = model_id
+        self.errors = list(errors)
+        self.answer = answer
+        self.calls = 0
+
+    def generate(self, messages, **kwargs):
+        self.calls += 1
+        if self.errors:
+            raise self.errors.pop(0)
+        return ChatMessage(role="assistant", content=self.answer)
+
+
+def _slot(model: _FakeModel, limit: int = 1) -> ModelSlot:
+    return ModelSlot(
+        tier=model.model_id,
+        model=model,
+        semaphore=threading.BoundedSemaphore(limit),
+        limit=limit,
+    )
+
+
+def _rate_limited() -> litellm.RateLimitError:
+    return litellm.RateLimitError("slow down", llm_provider="groq", model="x")
+
+
+@pytest.fixture(autouse=True)
+def no_delays(monkeypatch):
+    ai_api_config = models.config.services.ai_api
+    monkeypatch.setattr(ai_api_config, "max_retries", 2)
+    monkeypatch.setattr(ai_api_config, "retry_delay_seconds", 0)
+    monkeypatch.setattr(ai_api_config, "llm_hedge_enabled", False)
+    monkeypatch.setattr(ai_api_config, "llm_queue_timeout_seconds", 0.05)
+
+
+def test_transient_errors_are_retried_then_fall_back() -> None:
+    primary = _FakeModel("groq/a", errors=[_rate_limited() for _ in range(3)])
+    fallback = _FakeModel("gemini/b", answer="from fallback")
+    model = ResilientModel([_slot(primary), _slot(fallback)])
+
+    message = model.generate([{"role": "user", "content": "hi"}])
+
+    assert message.content == "from fallback"
+    # One call plus max_retries retries on the primary
+    assert primary.calls == 3
+    assert fallback.calls == 1
+
+
+def test_transient_error_recovers_on_retry() -> None:
+    primary = _FakeModel("groq/a", errors=[_rate_limited()], answer="second try")
+    fallback = _FakeModel("gemini/b")
+    model = ResilientModel([_slot(primary), _slot(fallback)])
+
+    assert model.generate([]).content == "second try"
+    assert fallback.calls == 0
+
+
+def test_non_retryable_errors_fall_back_immediately() -> None:
+    primary = _FakeModel("groq/a", errors=[ValueError("bad request")])
+    fallback = _FakeModel("gemini/b", answer="from fallback")
+    model = ResilientModel([_slot(primary), _slot(fallback)])
+
+    assert model.generate([]).content == "from fallback"
+    assert primary.calls == 1
+
+
+def test_saturated_model_is_skipped_after_queue_timeout() -> None:
+    primary = _FakeModel("groq/a")
+    fallback = _FakeModel("gemini/b", answer="from fallback")
+    busy = _slot(primary)
+    busy.semaphore.acquire()
+    model = ResilientModel([busy, _slot(fallback)])
+
+    assert model.generate([]).content == "from fallback"
+    assert primary.calls == 0
+
+
+def test_last_error_is_raised_when_every_model_fails() -> None:
+    model = ResilientModel(
+        [
+            _slot(_FakeModel("groq/a", errors=[ValueError("first")])),
+            _slot(_FakeModel("gemini/b", errors=[ValueError("second")])),
+        ]
+    )
+
+    with pytest.raises(ValueError, match="second"):
+        model.generate([])
+
+
+def test_registry_rejects_providers_without_api_key(monkeypatch) -> None:
+    monkeypatch.setattr(
+        models.config,
+        "ai_models",
+        {"standard": SimpleNamespace(provider="anthropic", model="claude")},
+    )
+
+    with pytest.raises(ValueError, match="anthropic"):
+        ModelRegistry()
@@ -0,0 +1,204 @@
+import asyncio
+import time
+import uuid
+from types import SimpleNamespace
+
+import chromadb
+import numpy as np
+import pytest
+from smolagents.memory import ActionStep, ToolCall
+from smolagents.monitoring import Timing
+
+from eda_ai_api.utils import pre_retrieval, vector_memory
+from eda_ai_api.utils.pre_retrieval import (
+    SOURCE_DOCUMENTS,
+    SOURCE_GLOBAL_KNOWLEDGE,
+    SOURCE_MEMORY,
+    count_search_calls,
+    estimate_steps_saved,
+    format_pre_retrieval,
+    pre_retrieve,
+)
+from eda_ai_api.utils.vector_memory import VectorMemory
+
+
+class _FakeSearches:
+    """Search methods of VectorMemory returning canned results"""
+
+    def __init__(self, documents=(), conversations=(), knowledge=(), delay=0.0):
+        self.documents = list(documents)
+        self.conversations = list(conversations)
+        self.knowledge = knowledge
+        self.delay = delay
+
+    def search_documents(self, session_id, query, platform, limit):
+        time.sleep(self.delay)
+        return self.documents
+
+    def search_conversations(self, session_id, query, platform, limit):
+        time.sleep(self.delay)
+        return self.conversations
+
+    def search_global_knowledge(self, query, limit):
+        time.sleep(self.delay)
+        if isinstance(self.knowledge, Exception):
+            raise self.knowledge
+        return list(self.knowledge)
+
+
+@pytest.fixture
+def ai_api_config(monkeypatch):
+    ai_api_config = pre_retrieval.config.services.ai_api
+    monkeypatch.setattr(ai_api_config, "pre_retrieval_similarity_threshold", 0.5)
+    monkeypatch.setattr(ai_api_config, "pre_retrieval_timeout_seconds", 1.0)
+    return ai_api_config
+
+
+def _pre_retrieve(monkeypatch, searches):
+    monkeypatch.setattr(pre_retrieval, "get_vector_memory", lambda: searches)
+    return asyncio.run(pre_retrieve("user", "demarcation", "whatsapp"))
+
+
+def test_results_below_threshold_are_dropped(monkeypatch, ai_api_config) -> None:
+    searches = _FakeSearches(
+        documents=[
+            {"content": "relevant", "similarity": 0.8},
+            {"content": "noise", "similarity": 0.2},
+        ],
+        conversations=[{"text": "unrelated", "similarity": 0.1}],
+        knowledge=RuntimeError("collection missing"),
+    )
+
+    retrieved = _pre_retrieve(monkeypatch, searches)
+
+    # Empty and failed sources are left out entirely
+    assert retrieved == {
+        SOURCE_DOCUMENTS: [{"content": "relevant", "similarity": 0.8}]
+    }
+
+
+def test_slow_searches_degrade_to_nothing(monkeypatch, ai_api_config) -> None:
+    monkeypatch.setattr(ai_api_config, "pre_retrieval_timeout_seconds", 0.05)
+    searches = _FakeSearches(
+        documents=[{"content": "late", "similarity": 0.9}], delay=0.3
+    )
+
+    assert _pre_retrieve(monkeypatch, searches) == {}
+
+
+def test_format_lists_each_source() -> None:
+    prompt = format_pre_retrieval(
+        {
+            SOURCE_DOCUMENTS: [
+                {"content": "Map of the\nterritory", "metadata": {"source": "a.pdf"}}
+            ],
+            SOURCE_GLOBAL_KNOWLEDGE: [
+                {"content": "x" * 600, "metadata": {"source": "guide.pdf"}}
+            ],
+        }
+    )
+
+    assert "- [a.pdf, page ?] Map of the territory" in prompt
+    assert "Past conversations" not in prompt
+    assert f"- [guide.pdf] {'x' * 500}..." in prompt
+    assert format_pre_retrieval({}) == ""
+
+
+def _agent_with_calls(*codes: str):
+    steps = [
+        ActionStep(
+            step_number=number,
+            timing=Timing(start_time=0.0),
+            tool_calls=[ToolCall("python_interpreter", code, f"call_{number}")],
+        )
+        for number, code in enumerate(codes, 1)
+    ]
+    return SimpleNamespace(memory=SimpleNamespace(steps=steps))
+
+
+def test_search_calls_are_counted_per_source() -> None:
+    agent = _agent_with_calls(
+        'docs = document_search_agent(task="maps")',
+        'a = global_knowledge_search(query="x")\nb = global_knowledge_agent("y")',
+        'final_answer("done")',
+    )
+
+    assert count_search_calls(agent) == {
+        SOURCE_DOCUMENTS: 1,
+        SOURCE_MEMORY: 0,
+        SOURCE_GLOBAL_KNOWLEDGE: 2,
+    }
+
+
+def test_steps_saved_counts_sources_not_searched_again() -> None:
+    agent = _agent_with_calls('docs = document_search(query="maps")')
+    retrieved = {SOURCE_DOCUMENTS: [{}], SOURCE_MEMORY: [{}]}
+
+    assert estimate_steps_saved(retrieved, agent) == 1
+
+
+class _FakeEmbeddingModel:
+    def encode(self, text: str) -> np.ndarray:
+        return np.array([1.0, float(len(text))])
+
+
+def _bare_vector_memory() -> VectorMemory:
+    """A VectorMemory without PocketBase, SentenceTransformer or disk state"""
+    memory = object.__new__(VectorMemory)
+    memory.embedding_model = _FakeEmbeddingModel()
+    memory._global_knowledge_version = None
+    memory._global_knowledge_version_at = 0.0
+    return memory
+
+
+def test_search_conversations_formats_results() -> None:
+    memory = _bare_vector_memory()
+    collection = chromadb.EphemeralClient().create_collection(
+        f"conversations_{uuid.uuid4().hex}", metadata={"hnsw:space": "cosine"}
+    )
+    collection.add(
+        ids=["c1"],
+        embeddings=[[1.0, 5.0]],
+        documents=["User: hi"],
+        metadatas=[{"type": "conversation", "user_message": "hi"}],
+    )
+    memory._get_user_collections = lambda session_id, platform: (collection, None)
+
+    results = memory.search_conversations("user", "hello")
+
+    assert [r["id"] for r in results] == ["c1"]
+    assert results[0]["metadata"]["user_message"] == "hi"
+    assert results[0]["similarity"] == pytest.approx(1.0, abs=1e-3)
+
+
+def test_search_conversations_returns_nothing_on_errors() -> None:
+    memory = _bare_vector_memory()
+
+    def broken(session_id, platform):
+        raise RuntimeError("chroma is down")
+
+    memory._get_user_collections = broken
+    assert memory.search_conversations("user", "hello") == []
+
+
+def test_global_knowledge_version_is_cached_for_its_ttl(monkeypatch) -> None:
+    clock = [1000.0]
+    monkeypatch.setattr(
+        vector_memory, "time", SimpleNamespace(monotonic=lambda: clock[0])
+    )
+    collection = chromadb.EphemeralClient().create_collection(
+        f"knowledge_{uuid.uuid4().hex}"
+    )
+    memory = _bare_vector_memory()
+    memory.global_knowledge_collection = collection
+    collection.add(ids=["chunk_1"], embeddings=[[1.0, 2.0]], documents=["a"])
+
+    version = memory.get_global_knowledge_version()
+    # Another worker adds a chunk
+    collection.add(ids=["chunk_2"], embeddings=[[2.0, 1.0]], documents=["b"])
+
+    clock[0] += vector_memory.GLOBAL_KNOWLEDGE_VERSION_TTL_SECONDS - 1
+    assert memory.get_global_knowledge_version() == version
+
+    clock[0] += 2
+    assert memory.get_global_knowledge_version() != version
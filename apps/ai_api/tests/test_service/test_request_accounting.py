@@ -0,0 +1,48 @@
+from eda_ai_api.utils.request_accounting import (
+    BUDGET_TOOL_CALLS,
+    LLMCallRecord,
+    RequestAccounting,
+    ToolCallRecord,
+)
+
+
+class StubAgent:
+    interrupted = False
+
+    def interrupt(self) -> None:
+        self.interrupted = True
+
+
+def test_summary_aggregates_per_agent_and_tool() -> None:
+    accounting = RequestAccounting(session_id="test")
+    accounting.max_tokens = 0
+    accounting.max_tool_calls = 0
+    accounting.record_llm_call(LLMCallRecord("manager", "gemini/x", 1.5, 100, 20))
+    accounting.record_llm_call(
+        LLMCallRecord("document_search_agent", "gemini/x", 0.5, 50, 10)
+    )
+    accounting.record_tool_call(
+        ToolCallRecord("document_search_agent", "document_search", 0.2, 300)
+    )
+
+    summary = accounting.summary()
+    assert summary["llm_calls"] == 2
+    assert summary["input_tokens"] == 150
+    assert summary["output_tokens"] == 30
+    assert summary["llm_by_agent"]["manager"]["calls"] == 1
+    assert summary["tools"]["document_search"]["output_chars"] == 300
+    assert summary["budget_exceeded"] is None
+
+
+def test_tool_call_budget_interrupts_agents() -> None:
+    accounting = RequestAccounting(session_id="test")
+    accounting.max_tool_calls = 2
+    agent = StubAgent()
+    accounting._agents.append(agent)
+
+    accounting.record_tool_call(ToolCallRecord("manager", "document_search", 0.1, 10))
+    assert not agent.interrupted
+    accounting.record_tool_call(ToolCallRecord("manager", "document_search", 0.1, 10))
+
+    assert agent.interrupted
+    assert accounting.budget_exceeded == BUDGET_TOOL_CALLS
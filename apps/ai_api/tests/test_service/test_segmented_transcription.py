@@ -0,0 +1,120 @@
+import asyncio
+import shutil
+import subprocess
+
+import pytest
+
+from eda_ai_api.utils import segmented_transcription
+from eda_ai_api.utils.segmented_transcription import (
+    plan_segments,
+    transcribe_segmented,
+)
+
+
+def test_short_audio_is_one_segment() -> None:
+    assert plan_segments([(3.0, 4.0)], 30.0, max_seconds=60, min_seconds=10) == [
+        (0.0, 30.0)
+    ]
+
+
+def test_cuts_at_the_last_pause_within_bounds() -> None:
+    silences = [(5.0, 6.0), (40.0, 42.0), (55.0, 57.0), (100.0, 101.0)]
+    segments = plan_segments(silences, 120.0, max_seconds=60, min_seconds=10)
+
+    # 5.5 is too early, 56 is the last pause before 60s
+    assert segments[0] == (0.0, 56.0)
+    assert segments[-1][1] == 120.0
+    assert all(end - start <= 60 for start, end in segments)
+
+
+def test_cuts_hard_without_pauses() -> None:
+    segments = plan_segments([], 130.0, max_seconds=60, min_seconds=10)
+    assert segments == [(0.0, 60.0), (60.0, 120.0), (120.0, 130.0)]
+
+
+def test_silent_segments_are_skipped() -> None:
+    segments = plan_segments(
+        [(50.0, 200.0)], 200.0, max_seconds=60, min_seconds=10
+    )
+    assert segments == [(0.0, 60.0)]
+
+
+def test_semaphore_works_across_event_loops(monkeypatch) -> None:
+    monkeypatch.setattr(
+        segmented_transcription.config.services.ai_api,
+        "transcription_segment_max_concurrency",
+        1,
+    )
+
+    async def hold():
+        async with segmented_transcription._get_semaphore():
+            await asyncio.sleep(0.01)
+
+    async def main():
+        await asyncio.gather(*(hold() for _ in range(4)))
+
+    # Contended twice, under the separate loops of two asyncio.run calls
+    asyncio.run(main())
+    asyncio.run(main())
+
+
+def _tones_with_pauses(count: int, seconds: float, pause: float) -> bytes:
+    """Generate OGG Opus audio of distinct tones separated by silence"""
+    inputs = []
+    for index in range(count):
+        tone = f"sine=frequency={300 + index * 200}:duration={seconds}"
+        silence = f"anullsrc=r=48000:cl=mono:d={pause}"
+        inputs += ["-f", "lavfi", "-i", tone, "-f", "lavfi", "-i", silence]
+    return subprocess.run(
+        [
+            "ffmpeg",
+            "-loglevel",
+            "error",
+            *inputs,
+            "-filter_complex",
+            f"concat=n={count * 2}:v=0:a=1",
+            "-ac",
+            "1",
+            "-c:a",
+            "libopus",
+            "-f",
+            "ogg",
+            "pipe:1",
+        ],
+        check=True,
+        capture_output=True,
+    ).stdout
+
+
+@pytest.mark.skipif(shutil.which("ffmpeg") is None, reason="ffmpeg is not installed")
+def test_segments_are_transcribed_concurrently_and_stitched_in_order(
+    monkeypatch,
+) -> None:
+    ai_api_config = segmented_transcription.config.services.ai_api
+    monkeypatch.setattr(ai_api_config, "transcription_segment_max_seconds", 3.0)
+    monkeypatch.setattr(ai_api_config, "transcription_segment_min_seconds", 1.0)
+
+    calls = []
+
+    async def fake_transcribe(audio, language, filename):
+        index = int(filename.split("_")[1].split(".")[0])
+        calls.append(index)
+        assert audio[:4] == b"OggS"
+        return f"part {index}"
+
+    monkeypatch.setattr(
+        segmented_transcription, "transcribe_audio", fake_transcribe
+    )
+
+    partial = []
+    text = asyncio.run(
+        transcribe_segmented(
+            _tones_with_pauses(3, 2.0, 1.0), "pt", on_segment=partial.append
+        )
+    )
+
+    # Each tone is cut at the pause that follows it, trailing silence dropped
+    assert text == "part 0 part 1 part 2"
+    assert sorted(calls) == [0, 1, 2]
+    assert sorted(segment.index for segment in partial) == [0, 1, 2]
+    assert all(segment.total == 3 for segment in partial)
@@ -0,0 +1,67 @@
+import asyncio
+
+import pytest
+
+from eda_ai_api.utils import transcriber
+from eda_ai_api.utils.metrics import get_metrics
+from eda_ai_api.utils.transcriber import (
+    BACKEND_GROQ,
+    BACKEND_LOCAL,
+    LocalWhisperTranscriber,
+    Transcriber,
+    get_transcriber,
+    transcribe_audio,
+)
+
+
+@pytest.fixture()
+def backend(monkeypatch):
+    def select(name: str) -> None:
+        monkeypatch.setattr(
+            transcriber.config.services.ai_api, "transcription_backend", name
+        )
+        monkeypatch.setattr(transcriber, "_transcriber", None)
+
+    return select
+
+
+def test_backend_is_selected_from_config(backend) -> None:
+    backend(BACKEND_LOCAL)
+    # The model itself is only loaded on the first transcription
+    assert isinstance(get_transcriber(), LocalWhisperTranscriber)
+
+
+def test_unknown_backend_is_rejected(backend) -> None:
+    backend("carrier-pigeon")
+    with pytest.raises(ValueError):
+        get_transcriber()
+
+
+def test_groq_client_is_kept_with_timeout_and_retries(backend) -> None:
+    backend(BACKEND_GROQ)
+    groq = get_transcriber()
+
+    # One client per process, its connections are reused
+    assert get_transcriber() is groq
+    ai_api_config = transcriber.config.services.ai_api
+    assert groq._client.timeout == ai_api_config.transcription_timeout_seconds
+    assert groq._client.max_retries == ai_api_config.transcription_max_retries
+
+
+class FailingTranscriber(Transcriber):
+    name = "failing"
+
+    async def transcribe(self, audio: bytes, language: str, filename: str) -> str:
+        raise ConnectionError("connection reset")
+
+
+def test_failures_are_counted_and_wrapped(monkeypatch) -> None:
+    monkeypatch.setattr(transcriber, "_transcriber", FailingTranscriber())
+    backend = transcriber.config.services.ai_api.transcription_backend
+    errors = get_metrics().counter("transcription_errors", backend=backend)
+
+    with pytest.raises(RuntimeError, match="connection reset"):
+        asyncio.run(transcribe_audio(b"audio"))
+    assert (
+        get_metrics().counter("transcription_errors", backend=backend) == errors + 1
+    )
@@ -0,0 +1,43 @@
+from eda_ai_api.utils.transcription_cache import (
+    TranscriptionCache,
+    transcription_cache_key,
+)
+
+
+def make_cache(tmp_path, memory_entries=2, disk_entries=3) -> TranscriptionCache:
+    return TranscriptionCache(
+        str(tmp_path / "transcriptions.db"), memory_entries, disk_entries
+    )
+
+
+def test_key_depends_on_content_and_language() -> None:
+    key = transcription_cache_key(b"voice note", "pt")
+    assert key == transcription_cache_key(b"voice note", "pt")
+    assert key != transcription_cache_key(b"voice note", "en")
+    assert key != transcription_cache_key(b"other note", "pt")
+
+
+def test_miss_then_hit(tmp_path) -> None:
+    cache = make_cache(tmp_path)
+    assert cache.get("a") is None
+    cache.put("a", "olá")
+    assert cache.get("a") == "olá"
+
+
+def test_disk_tier_is_shared_between_instances(tmp_path) -> None:
+    make_cache(tmp_path).put("a", "olá")
+    # A fresh instance has an empty memory tier, like another worker
+    assert make_cache(tmp_path).get("a") == "olá"
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path) -> None:
+    cache = make_cache(tmp_path, memory_entries=1, disk_entries=2)
+    cache.put("a", "first")
+    cache.put("b", "second")
+    assert cache.get("a") == "first"
+    cache.put("c", "third")
+
+    fresh = make_cache(tmp_path)
+    assert fresh.get("a") == "first"
+    assert fresh.get("b") is None
+    assert fresh.get("c") == "third"
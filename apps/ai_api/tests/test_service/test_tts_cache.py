@@ -0,0 +1,37 @@
+import os
+
+from eda_ai_api.utils.tts_cache import TTSCache, tts_cache_key
+
+VOICE = ("pt-BR", "pt-BR-Wavenet-A", "OGG_OPUS", 0.0, 1.0, ["handset-class-device"])
+
+
+def test_key_covers_every_voice_parameter() -> None:
+    key = tts_cache_key("Olá", *VOICE)
+    assert key == tts_cache_key("Olá", *VOICE)
+    assert key != tts_cache_key("Oi", *VOICE)
+    for index, value in enumerate(["en-US", "other", "MP3", 1.0, 1.2, []]):
+        changed = list(VOICE)
+        changed[index] = value
+        assert key != tts_cache_key("Olá", *changed)
+
+
+def test_miss_then_hit(tmp_path) -> None:
+    cache = TTSCache(str(tmp_path), max_bytes=1000)
+    assert cache.get("a") is None
+    cache.put("a", b"audio")
+    assert cache.get("a") == b"audio"
+
+
+def test_least_recently_used_audio_is_evicted_past_the_size_cap(tmp_path) -> None:
+    cache = TTSCache(str(tmp_path), max_bytes=250)
+    for age, key in enumerate(["a", "b"]):
+        cache.put(key, b"x" * 100)
+        os.utime(cache._path(key), (age, age))
+
+    # Reading "a" makes "b" the least recently used
+    assert cache.get("a") is not None
+    cache.put("c", b"x" * 100)
+
+    assert cache.get("a") is not None
+    assert cache.get("b") is None
+    assert cache.get("c") is not None
@@ -0,0 +1,81 @@
+import asyncio
+import io
+import shutil
+import subprocess
+import wave
+
+import pytest
+
+from eda_ai_api.utils.tts_chunking import join_audio, join_wav, split_text
+
+
+def test_chunks_keep_whole_sentences_under_the_limit() -> None:
+    text = "Primeira frase. Segunda frase! Terceira frase? Quarta frase."
+    chunks = split_text(text, max_chars=32)
+
+    assert chunks == ["Primeira frase. Segunda frase!", "Terceira frase? Quarta frase."]
+    assert " ".join(chunks) == text
+
+
+def test_first_chunk_is_short() -> None:
+    text = "Olá. " + "Esta é uma frase mais longa. " * 5
+    chunks = split_text(text, max_chars=100, first_chunk_max_chars=10)
+
+    assert chunks[0] == "Olá."
+    assert all(len(chunk) <= 100 for chunk in chunks)
+
+
+def test_long_sentences_are_split_at_words() -> None:
+    chunks = split_text("palavra " * 40, max_chars=50)
+
+    assert all(len(chunk) <= 50 for chunk in chunks)
+    assert " ".join(chunks).split() == ["palavra"] * 40
+
+
+def _wav(frames: int) -> bytes:
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(24000)
+        wav.writeframes(b"\x01\x00" * frames)
+    return buffer.getvalue()
+
+
+def test_wav_parts_are_joined_into_one_file() -> None:
+    joined = join_wav([_wav(100), _wav(250)])
+
+    with wave.open(io.BytesIO(joined)) as wav:
+        assert wav.getframerate() == 24000
+        assert wav.getnframes() == 350
+
+
+@pytest.mark.skipif(shutil.which("ffmpeg") is None, reason="ffmpeg is not installed")
+def test_ogg_opus_parts_become_a_single_stream() -> None:
+    parts = [
+        subprocess.run(
+            [
+                "ffmpeg",
+                "-loglevel",
+                "error",
+                "-f",
+                "lavfi",
+                "-i",
+                f"sine=frequency={frequency}:duration=1",
+                "-c:a",
+                "libopus",
+                "-f",
+                "ogg",
+                "pipe:1",
+            ],
+            check=True,
+            capture_output=True,
+        ).stdout
+        for frequency in (440, 660)
+    ]
+
+    joined = asyncio.run(join_audio(parts, "OGG_OPUS"))
+
+    # Chained files would carry one Opus header per part
+    assert joined[:4] == b"OggS"
+    assert joined.count(b"OpusHead") == 1
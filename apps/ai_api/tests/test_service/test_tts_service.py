@@ -0,0 +1,149 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from google.api_core.exceptions import ServiceUnavailable
+
+from eda_ai_api.utils import tts_service
+from eda_ai_api.utils.tts_service import TTSService, get_tts_service
+
+
+class FakeClient:
+    def __init__(self, fail: bool = False):
+        self.fail = fail
+        self.transport = SimpleNamespace(closed=False)
+
+        async def close():
+            self.transport.closed = True
+
+        self.transport.close = close
+
+    async def list_voices(self, language_code=None, timeout=None):
+        if self.fail:
+            raise ServiceUnavailable("socket closed")
+        voice = SimpleNamespace(
+            name="pt-BR-Wavenet-A", ssml_gender=SimpleNamespace(name="FEMALE")
+        )
+        return SimpleNamespace(voices=[voice])
+
+
+@pytest.fixture()
+def service(monkeypatch):
+    monkeypatch.setattr(tts_service.config.services.whatsapp, "enable_tts", True)
+    service = TTSService()
+    clients = []
+
+    def get_client():
+        # Mirrors the lazy client: a new one only after a reset
+        if service.client is None:
+            service.client = clients.pop(0)
+        return service.client
+
+    monkeypatch.setattr(service, "_get_client", get_client)
+    return service, clients
+
+
+def test_service_is_process_wide() -> None:
+    assert get_tts_service() is get_tts_service()
+
+
+def test_failed_channel_is_rebuilt(service) -> None:
+    service, clients = service
+    broken, fresh = FakeClient(fail=True), FakeClient()
+    clients.extend([broken, fresh])
+
+    voices = asyncio.run(service.get_available_voices("pt-BR"))
+
+    assert voices == [("pt-BR-Wavenet-A", "FEMALE")]
+    assert broken.transport.closed
+    assert service.client is fresh
+
+
+class CountingClient(FakeClient):
+    def __init__(self, fail: bool = False):
+        super().__init__(fail)
+        self.probes = 0
+
+    async def list_voices(self, language_code=None, timeout=None):
+        self.probes += 1
+        return await super().list_voices(language_code, timeout)
+
+
+def test_health_probe_reports_failures_without_closing_the_channel(service) -> None:
+    service, clients = service
+    client = FakeClient(fail=True)
+    clients.append(client)
+
+    health = asyncio.run(service.check_health())
+
+    assert health["enabled"] and not health["healthy"]
+    assert "socket closed" in health["error"]
+    # Requests in flight keep their channel, _call reconnects if needed
+    assert service.client is client
+    assert not client.transport.closed
+
+
+def test_health_probe_result_is_reused_briefly(service, monkeypatch) -> None:
+    service, clients = service
+    client = CountingClient()
+    clients.append(client)
+
+    first = asyncio.run(service.check_health())
+    second = asyncio.run(service.check_health())
+
+    assert first["healthy"] and second is first
+    assert client.probes == 1
+
+    monkeypatch.setattr(tts_service, "HEALTH_CACHE_SECONDS", 0)
+    asyncio.run(service.check_health())
+    assert client.probes == 2
+
+
+def test_chunks_are_yielded_in_order(service, monkeypatch) -> None:
+    service, _ = service
+    monkeypatch.setattr(tts_service.config.services.ai_api, "tts_chunk_max_chars", 20)
+
+    async def fake_synthesize(text, **params):
+        # Later chunks finish first
+        await asyncio.sleep(0.05 if text.startswith("Um") else 0)
+        return text.encode(), ".mp3"
+
+    monkeypatch.setattr(service, "synthesize", fake_synthesize)
+
+    async def collect():
+        return [
+            chunk
+            async for chunk in service.synthesize_chunks(
+                "Um dois três. Quatro cinco. Seis sete oito."
+            )
+        ]
+
+    chunks = asyncio.run(collect())
+
+    assert [chunk.index for chunk in chunks] == [0, 1, 2]
+    assert chunks[0].audio == b"Um dois tr\xc3\xaas."
+    assert all(chunk.total == 3 for chunk in chunks)
+
+
+def test_chunk_limit_works_across_event_loops(service, monkeypatch) -> None:
+    service, _ = service
+    monkeypatch.setattr(tts_service.config.services.ai_api, "tts_chunk_max_chars", 20)
+    monkeypatch.setattr(tts_service.config.services.ai_api, "tts_chunk_max_concurrency", 1)
+
+    async def fake_synthesize(text, **params):
+        await asyncio.sleep(0.01)
+        return text.encode(), ".mp3"
+
+    monkeypatch.setattr(service, "synthesize", fake_synthesize)
+
+    async def collect():
+        return [
+            chunk
+            async for chunk in service.synthesize_chunks(
+                "Um dois três. Quatro cinco. Seis sete oito."
+            )
+        ]
+
+    # Chunks queue on the limit under the separate loops of two asyncio.run
+    assert len(asyncio.run(collect())) == 3
+    assert len(asyncio.run(collect())) == 3
@@ -139,6 +139,16 @@ export async function handleMessage(message: WAMessage) {
       throw new Error("No result from API");
     }
 
+    // Messages sent in quick succession are answered once, on the latest one
+    if (data.is_primary === false) {
+      logger.info(
+        `Message from ${platformUserId} merged into a later reply (${data.coalesced_messages} messages)`,
+      );
+      await sock.sendMessage(chatId, { delete: streamingReply.key });
+      await react(message, "done");
+      return;
+    }
+
     logger.info(
       `AI API response received for user: ${platformUserId}, response length: ${data.result.length}`,
     );
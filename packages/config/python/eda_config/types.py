@@ -268,12 +268,24 @@ class AIApiConfig(BaseModel):
     allow_external: bool = (
         False  # Allow external connections (production setting)
     )
+    # Uvicorn workers when debug is off, debug runs a single one
+    workers: int = 4
     conversation_history_limit: Optional[int] = 5
     relevant_history_limit: Optional[int] = 3
+    # Token budget for the history pasted into the prompt, and per exchange
+    context_max_tokens: int = 3000
+    context_max_exchange_tokens: int = 800
+    # Time budget for fetching history, relevant history is dropped past it
+    context_timeout_seconds: float = 3.0
 
     # File Processing Constants
     max_file_size_mb: int = 50
     allowed_image_types: List[str] = ["image/jpeg", "image/png", "image/webp"]
+    # Larger images are rejected before decoding (decompression bombs)
+    image_max_pixels: int = 50_000_000
+    # Longest side of images sent to the vision model
+    image_max_side: int = 1536
+    image_jpeg_quality: int = 85
     allowed_audio_types: List[str] = [
         "audio/mpeg",
         "audio/mp4",
@@ -291,8 +303,53 @@ class AIApiConfig(BaseModel):
 
     # Audio Processing Constants
     audio_timeout_seconds: int = 300
-    transcription_timeout_seconds: int = 60
+    transcription_timeout_seconds: int = 60  # Per attempt
+    transcription_max_retries: int = 2  # Transient errors only
+    tts_timeout_seconds: float = 30.0
+    # Long text is split at sentences and the chunks synthesized in parallel
+    tts_chunk_max_chars: int = 1000  # Well under the 5000 byte request limit
+    tts_first_chunk_max_chars: int = 200  # Short first chunk, faster first audio
+    tts_chunk_max_concurrency: int = 4
+    tts_long_form_max_chars: int = 50_000
     audio_chunk_size: int = 8192
+    audio_conversion_timeout_seconds: float = 60.0
+    # ffmpeg processes running at once, further conversions wait
+    audio_conversion_max_concurrency: int = 4
+    # Containers sent to Whisper as they are, others become 16 kHz mono Opus
+    transcription_passthrough_formats: List[str] = [
+        "flac",
+        "mp3",
+        "mp4",
+        "mpeg",
+        "mpga",
+        "m4a",
+        "ogg",
+        "opus",
+        "wav",
+        "webm",
+    ]
+    transcription_opus_bitrate: str = "24k"
+    # "groq" (hosted Whisper) or "local" (faster-whisper on the CPU)
+    transcription_backend: str = "groq"
+    transcription_groq_model: str = "whisper-large-v3-turbo"
+    # faster-whisper model size or path, e.g. "base", "small", "large-v3-turbo"
+    transcription_local_model: str = "small"
+    transcription_local_compute_type: str = "int8"
+    transcription_local_cpu_threads: int = 0  # 0 lets CTranslate2 decide
+    transcription_local_beam_size: int = 1
+    # Forwarded voice notes are transcribed once, keyed by content hash
+    transcription_cache_enabled: bool = True
+    transcription_cache_path: str = "./transcription_cache.db"
+    transcription_cache_memory_entries: int = 256
+    transcription_cache_disk_entries: int = 5000
+    # Long audio is cut at pauses and its segments transcribed in parallel
+    transcription_segmentation_enabled: bool = True
+    transcription_segment_threshold_bytes: int = 1_000_000
+    transcription_segment_max_seconds: float = 90.0
+    transcription_segment_min_seconds: float = 20.0
+    transcription_segment_max_concurrency: int = 4
+    transcription_silence_noise_db: float = -35.0
+    transcription_silence_min_seconds: float = 0.5
 
     # Memory and Storage Constants
     default_ttl_days: int = 30
@@ -303,9 +360,86 @@ class AIApiConfig(BaseModel):
 
     # Agent Constants
     max_agent_steps: int = 10
+    # Lower below whatsapp.api_timeout_seconds for the bridge to receive
+    # partial and fallback answers instead of timing out itself
     agent_timeout_seconds: int = 600
+    # Agent runs at once across all workers, each worker takes its share
+    agent_max_concurrency: int = 8
+    agent_final_answer_grace_seconds: int = 20
+    # Per-request budgets across the manager and its sub-agents (0 disables)
+    agent_max_tokens_per_request: int = 200000
+    agent_max_tool_calls_per_request: int = 25
     max_retries: int = 3
     retry_delay_seconds: int = 1
+    # "managed_agents" wraps each search tool in its own sub-agent,
+    # "direct_tools" gives the search tools to the manager directly
+    agent_tool_mode: str = "managed_agents"
+
+    # LLM Resilience Constants
+    llm_timeout_seconds: float = 60.0
+    # Keys of ai_models tried in order after the agent's own model
+    llm_fallback_models: List[str] = ["standard", "premium"]
+    llm_hedge_enabled: bool = False
+    llm_hedge_percentile: float = 95.0
+    llm_hedge_min_samples: int = 20
+
+    # Model Registry Constants
+    # ai_models tier used by each agent, unlisted agents use "standard"
+    agent_model_tiers: Dict[str, str] = {
+        "manager": "standard",
+        "fast_path": "standard",
+        "document_search_agent": "standard",
+        "memory_search_agent": "standard",
+        "global_knowledge_agent": "standard",
+        "conversation_summary_agent": "standard",
+        "image_description": "standard",
+    }
+    # Concurrent calls per ai_models tier, set to match provider rate limits
+    llm_concurrency_limits: Dict[str, int] = {}
+    llm_default_concurrency: int = 8
+    llm_queue_timeout_seconds: float = 30.0
+    llm_http_pool_size: int = 20
+
+    # Message Coalescing Constants
+    # Messages from one user within the window are merged into one agent run
+    message_coalescing_window_seconds: float = 1.5
+    message_coalescing_max_wait_seconds: float = 5.0
+
+    # Admission Control Constants
+    # Requests waiting for one of the agent_max_concurrency slots, more get a
+    # 429. Split between workers like agent_max_concurrency
+    admission_max_queue_size: int = 32
+    admission_queue_timeout_seconds: float = 30.0
+
+    # Routing Constants
+    fast_path_enabled: bool = True
+    fast_path_similarity_threshold: float = 0.75
+    fast_path_max_message_length: int = 120
+
+    # Pre-retrieval Constants
+    pre_retrieval_platforms: List[str] = ["whatsapp", "telegram", "website", "api"]
+    pre_retrieval_similarity_threshold: float = 0.5
+    pre_retrieval_limit: int = 3
+    pre_retrieval_timeout_seconds: float = 5.0
+
+    # Answer Cache Constants
+    answer_cache_enabled: bool = False
+    answer_cache_similarity_threshold: float = 0.92
+    answer_cache_ttl_hours: int = 168
+
+    # Image Cache Constants
+    # Describe new images once in the background, then give the agent text
+    # for identical copies of them
+    image_cache_enabled: bool = False
+    image_cache_ttl_hours: int = 168
+
+    # TTS Cache Constants
+    # Synthesized audio keyed by text and voice parameters, evicted least
+    # recently used past max_bytes; the WhatsApp messages are pre-warmed
+    tts_cache_enabled: bool = True
+    tts_cache_dir: str = "./tts_cache"
+    tts_cache_max_bytes: int = 100_000_000
+    tts_cache_prewarm: bool = True
 
     # Security Constants
     max_filename_length: int = 255
@@ -322,8 +456,11 @@ class AIApiConfig(BaseModel):
 
     # API Constants
     max_request_size: int = 100 * 1024 * 1024  # 100MB
+    # Requests per user and window, enforced as a token bucket (0 disables)
     rate_limit_requests: int = 100
     rate_limit_window_seconds: int = 3600  # 1 hour
+    # SQLite file holding the buckets, shared by all workers
+    rate_limit_path: str = "./rate_limits.db"
 
     # Platform Constants
     supported_platforms: List[str] = ["whatsapp", "telegram", "website", "api"]
@@ -239,14 +239,21 @@ const AIModelConfigSchema = z.object({
 const AIApiConfigSchema = z.object({
   debug: z.boolean(),
   allow_external: z.boolean().default(false), // Allow external connections (production setting)
+  workers: z.number().default(4), // Uvicorn workers when debug is off
   conversation_history_limit: z.number().default(5),
   relevant_history_limit: z.number().default(3),
+  context_max_tokens: z.number().default(3000),
+  context_max_exchange_tokens: z.number().default(800),
+  context_timeout_seconds: z.number().default(3),
 
   // File Processing Constants
   max_file_size_mb: z.number().default(50),
   allowed_image_types: z
     .array(z.string())
     .default(["image/jpeg", "image/png", "image/webp"]),
+  image_max_pixels: z.number().default(50_000_000),
+  image_max_side: z.number().default(1536),
+  image_jpeg_quality: z.number().default(85),
   allowed_audio_types: z
     .array(z.string())
     .default([
@@ -265,7 +272,47 @@ const AIApiConfigSchema = z.object({
   // Audio Processing Constants
   audio_timeout_seconds: z.number().default(300),
   transcription_timeout_seconds: z.number().default(60),
+  transcription_max_retries: z.number().default(2),
+  tts_timeout_seconds: z.number().default(30),
+  tts_chunk_max_chars: z.number().default(1000),
+  tts_first_chunk_max_chars: z.number().default(200),
+  tts_chunk_max_concurrency: z.number().default(4),
+  tts_long_form_max_chars: z.number().default(50_000),
   audio_chunk_size: z.number().default(8192),
+  audio_conversion_timeout_seconds: z.number().default(60),
+  audio_conversion_max_concurrency: z.number().default(4),
+  transcription_passthrough_formats: z
+    .array(z.string())
+    .default([
+      "flac",
+      "mp3",
+      "mp4",
+      "mpeg",
+      "mpga",
+      "m4a",
+      "ogg",
+      "opus",
+      "wav",
+      "webm",
+    ]),
+  transcription_opus_bitrate: z.string().default("24k"),
+  transcription_backend: z.enum(["groq", "local"]).default("groq"),
+  transcription_groq_model: z.string().default("whisper-large-v3-turbo"),
+  transcription_local_model: z.string().default("small"),
+  transcription_local_compute_type: z.string().default("int8"),
+  transcription_local_cpu_threads: z.number().default(0),
+  transcription_local_beam_size: z.number().default(1),
+  transcription_cache_enabled: z.boolean().default(true),
+  transcription_cache_path: z.string().default("./transcription_cache.db"),
+  transcription_cache_memory_entries: z.number().default(256),
+  transcription_cache_disk_entries: z.number().default(5000),
+  transcription_segmentation_enabled: z.boolean().default(true),
+  transcription_segment_threshold_bytes: z.number().default(1_000_000),
+  transcription_segment_max_seconds: z.number().default(90),
+  transcription_segment_min_seconds: z.number().default(20),
+  transcription_segment_max_concurrency: z.number().default(4),
+  transcription_silence_noise_db: z.number().default(-35),
+  transcription_silence_min_seconds: z.number().default(0.5),
 
   // Memory and Storage Constants
   default_ttl_days: z.number().default(30),
@@ -277,8 +324,73 @@ const AIApiConfigSchema = z.object({
   // Agent Constants
   max_agent_steps: z.number().default(10),
   agent_timeout_seconds: z.number().default(600),
+  agent_max_concurrency: z.number().default(8),
+  agent_final_answer_grace_seconds: z.number().default(20),
+  agent_max_tokens_per_request: z.number().default(200000),
+  agent_max_tool_calls_per_request: z.number().default(25),
   max_retries: z.number().default(3),
   retry_delay_seconds: z.number().default(1),
+  agent_tool_mode: z
+    .enum(["managed_agents", "direct_tools"])
+    .default("managed_agents"),
+
+  // LLM Resilience Constants
+  llm_timeout_seconds: z.number().default(60),
+  llm_fallback_models: z.array(z.string()).default(["standard", "premium"]),
+  llm_hedge_enabled: z.boolean().default(false),
+  llm_hedge_percentile: z.number().default(95),
+  llm_hedge_min_samples: z.number().default(20),
+
+  // Model Registry Constants
+  agent_model_tiers: z.record(z.string(), z.string()).default({
+    manager: "standard",
+    fast_path: "standard",
+    document_search_agent: "standard",
+    memory_search_agent: "standard",
+    global_knowledge_agent: "standard",
+    conversation_summary_agent: "standard",
+    image_description: "standard",
+  }),
+  llm_concurrency_limits: z.record(z.string(), z.number()).default({}),
+  llm_default_concurrency: z.number().default(8),
+  llm_queue_timeout_seconds: z.number().default(30),
+  llm_http_pool_size: z.number().default(20),
+
+  // Message Coalescing Constants
+  message_coalescing_window_seconds: z.number().default(1.5),
+  message_coalescing_max_wait_seconds: z.number().default(5),
+
+  // Admission Control Constants
+  admission_max_queue_size: z.number().default(32),
+  admission_queue_timeout_seconds: z.number().default(30),
+
+  // Routing Constants
+  fast_path_enabled: z.boolean().default(true),
+  fast_path_similarity_threshold: z.number().default(0.75),
+  fast_path_max_message_length: z.number().default(120),
+
+  // Pre-retrieval Constants
+  pre_retrieval_platforms: z
+    .array(z.string())
+    .default(["whatsapp", "telegram", "website", "api"]),
+  pre_retrieval_similarity_threshold: z.number().default(0.5),
+  pre_retrieval_limit: z.number().default(3),
+  pre_retrieval_timeout_seconds: z.number().default(5),
+
+  // Answer Cache Constants
+  answer_cache_enabled: z.boolean().default(false),
+  answer_cache_similarity_threshold: z.number().default(0.92),
+  answer_cache_ttl_hours: z.number().default(168),
+
+  // Image Cache Constants
+  image_cache_enabled: z.boolean().default(false),
+  image_cache_ttl_hours: z.number().default(168),
+
+  // TTS Cache Constants
+  tts_cache_enabled: z.boolean().default(true),
+  tts_cache_dir: z.string().default("./tts_cache"),
+  tts_cache_max_bytes: z.number().default(100_000_000),
+  tts_cache_prewarm: z.boolean().default(true),
 
   // Security Constants
   max_filename_length: z.number().default(255),
@@ -291,6 +403,7 @@ const AIApiConfigSchema = z.object({
   max_request_size: z.number().default(100 * 1024 * 1024), // 100MB
   rate_limit_requests: z.number().default(100),
   rate_limit_window_seconds: z.number().default(3600), // 1 hour
+  rate_limit_path: z.string().default("./rate_limits.db"),
 
   // Platform Constants
   supported_platforms: z